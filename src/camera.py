@@ -0,0 +1,59 @@
+# ===========================================================
+#          CÂMERA / TREMOR DE TELA (APLICADO NA COMPOSIÇÃO)
+# ===========================================================
+"""
+A cena é desenhada sempre em repouso; o tremor é aplicado uma única vez,
+antes do flip, deslocando o frame inteiro com Surface.scroll e preenchendo
+as bordas descobertas. Assim as camadas estáticas cacheadas continuam
+válidas e nenhum blit precisa somar shake_x/shake_y.
+"""
+
+import random
+
+
+class ScreenShake:
+    """Tremor com decaimento fixo por frame (mesmo ritmo dos loops antigos)."""
+
+    def __init__(self, decay=0.5, edge_color=(0, 0, 0)):
+        self.decay = decay
+        self.edge_color = edge_color
+        self.amount = 0
+        self.offset = (0, 0)
+
+    def shake(self, amount):
+        """Inicia (ou reforça) um tremor de até `amount` pixels."""
+        self.amount = max(self.amount, amount)
+
+    def stop(self):
+        self.amount = 0
+        self.offset = (0, 0)
+
+    @property
+    def active(self):
+        return self.offset != (0, 0)
+
+    def update(self):
+        """Avança um frame: reduz a intensidade e sorteia o deslocamento."""
+        if self.amount > 0:
+            self.amount = max(0, self.amount - self.decay)
+            a = int(self.amount)
+            self.offset = (random.randint(-a, a), random.randint(-a, a))
+        else:
+            self.offset = (0, 0)
+        return self.offset
+
+    def apply(self, screen):
+        """Desloca o frame já composto e preenche as bordas descobertas."""
+        dx, dy = self.offset
+        if not dx and not dy:
+            return
+        w, h = screen.get_size()
+        screen.scroll(dx, dy)
+        if dx > 0:
+            screen.fill(self.edge_color, (0, 0, dx, h))
+        elif dx < 0:
+            screen.fill(self.edge_color, (w + dx, 0, -dx, h))
+        if dy > 0:
+            screen.fill(self.edge_color, (0, 0, w, dy))
+        elif dy < 0:
+            screen.fill(self.edge_color, (0, h + dy, w, -dy))
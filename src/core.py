@@ -13,7 +13,11 @@ import platform
 
 # Imports do jogo
 from src.game_loop import start_game_loop
-from src.utils import load_font
+from src.utils import load_font, fade_out
+from src.particles import ParticleEmitter, circle_sprites
+from src.performance import particle_budget
+from src.render_cache import pulse_strip, blit_overlay, ButtonSkin, tween_scales
+from src.scene_cache import scene_cache
 from src.cutscene_intro import run_cutscene_intro
 from src.settings_menu import run_settings_menu
 from src.audio_manager import audio_manager
@@ -43,34 +47,13 @@ def load_settings():
 # --------------------------------------------------
 # Menu particle (OTIMIZADA PARA WEB)
 # --------------------------------------------------
-class MenuParticle:
-    __slots__ = ("w", "x", "y", "r", "speed", "dir", "image") 
-    
-    def __init__(self, w, h):
-        self.w = max(1, w)
-        self.r = random.uniform(2, 4)
-        alpha = random.randint(40, 130)
-        
-        self.image = pygame.Surface((int(self.r*2), int(self.r*2)), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 255, 255, alpha), (int(self.r), int(self.r)), int(self.r))
-        
-        self.reset(h)
-
-    def reset(self, h):
-        self.x = random.uniform(0, self.w)
-        self.y = random.uniform(0, h)
-        self.speed = random.uniform(0.3, 0.9)
-        self.dir = random.choice([-1, 1])
-
-    def update(self, dt, w, h):
-        self.y -= self.speed * dt * 0.05
-        self.x += math.sin(self.y * 0.01) * 0.4 * self.dir
-        if self.y < -10:
-            self.reset(h)
-            self.y = h + random.uniform(20, 80)
-
-    def draw(self, surf):
-        surf.blit(self.image, (int(self.x), int(self.y)))
+def make_menu_particles(w, h):
+    """Bolinhas brancas subindo com leve balanço (emissor vetorizado)."""
+    return ParticleEmitter(
+        w, h, 32, circle_sprites((2, 3), [(255, 255, 255)], (40, 70, 100, 130)),
+        vy=(-0.9 * 0.05, -0.3 * 0.05), flow="up", respawn=(20, 80),
+        wobble=0.4, wobble_freq=0.01,
+    )
 
 
 # --------------------------------------------------
@@ -112,6 +95,23 @@ class Button:
         self.height = th + 40
         self.rect = pygame.Rect(0,0,self.width,self.height)
         self.rect.center = (int(self.center[0]), int(self.center[1]))
+        # Idle/hover em todos os passos do tween: o draw vira um único blit
+        self.skin = ButtonSkin(
+            (self.width, self.height),
+            {"idle": (self.base_color, (255,255,255), 3),
+             "hover": (self.hover_color, (255,255,255), 3)},
+            radius=22, shadow=((0,0,0), (6, 6)),
+            content=self._draw_content, scales=tween_scales(1.06))
+
+    def _draw_content(self, surf, r, state):
+        if self.icon:
+            icon_rect = self.icon.get_rect(center=(r.left + 38, r.centery))
+            surf.blit(self.icon, icon_rect)
+            text_rect = self.text_surf.get_rect(midleft=(icon_rect.right + 12, r.centery))
+        else:
+            text_rect = self.text_surf.get_rect(center=r.center)
+
+        surf.blit(self.text_surf, text_rect)
 
     def update_layout(self, target_center, font):
         self.target_center = target_center
@@ -130,26 +130,7 @@ class Button:
         self.target_scale = 1.06 if hover else 1.0
         self.scale += (self.target_scale - self.scale) * 0.18
 
-        cur_w = int(self.width * self.scale)
-        cur_h = int(self.height * self.scale)
-        r = pygame.Rect(0,0,cur_w,cur_h)
-        r.center = (int(cx), int(cy))
-
-        sombra = r.copy()
-        sombra.move_ip(6, 6)
-        pygame.draw.rect(screen, (0,0,0), sombra, border_radius=22)
-
-        pygame.draw.rect(screen, self.hover_color if hover else self.base_color, r, border_radius=22)
-        pygame.draw.rect(screen, (255,255,255), r, 3, border_radius=22)
-
-        if self.icon:
-            icon_rect = self.icon.get_rect(center=(r.left + 38, r.centery))
-            screen.blit(self.icon, icon_rect)
-            text_rect = self.text_surf.get_rect(midleft=(icon_rect.right + 12, r.centery))
-        else:
-            text_rect = self.text_surf.get_rect(center=r.center)
-
-        screen.blit(self.text_surf, text_rect)
+        self.skin.blit(screen, (int(cx), int(cy)), "hover" if hover else "idle", self.scale)
 
     # --- ATUALIZADO: Recebe a posição corrigida do mouse ---
     def try_click(self, event, corrected_mouse_pos):
@@ -165,6 +146,15 @@ class Button:
 # Asset loader
 # --------------------------------------------------
 def load_assets(screen, background_path, logo_path):
+    # Memo por tamanho de janela: voltar ao menu ou alternar F11 não relê
+    # nem reescala o fundo (o PNG original é enorme)
+    def build(layout, size):
+        layout['assets'] = _build_assets(screen, background_path, logo_path)
+
+    return scene_cache.layout(("main_menu", background_path, logo_path), screen.get_size(), build)['assets']
+
+
+def _build_assets(screen, background_path, logo_path):
     W, H = screen.get_size()
     font_size = max(22, int(H * 0.048))
     try:
@@ -173,7 +163,7 @@ def load_assets(screen, background_path, logo_path):
         font = pygame.font.Font(None, font_size)
 
     try:
-        bg = pygame.image.load(background_path).convert()
+        bg = scene_cache.image(background_path)
         bg = pygame.transform.smoothscale(bg, (W, H))
     except Exception:
         bg = pygame.Surface((W,H))
@@ -181,7 +171,7 @@ def load_assets(screen, background_path, logo_path):
 
     logo = None
     try:
-        logo_img = pygame.image.load(logo_path).convert_alpha()
+        logo_img = scene_cache.image(logo_path, alpha=True)
         lw = int(W * 0.35)
         ratio = logo_img.get_height() / logo_img.get_width()
         lh = int(lw * ratio)
@@ -196,6 +186,7 @@ def load_assets(screen, background_path, logo_path):
 # --------------------------------------------------
 # Main menu (ASYNC / WEB VERSION)
 # --------------------------------------------------
+@particle_budget.scene
 async def main_menu(screen):
     # 'screen' aqui é a superfície virtual (1280x720) vinda do main.py
     
@@ -211,7 +202,11 @@ async def main_menu(screen):
     font, background, logo = load_assets(screen, background_path, logo_path)
     W, H = screen.get_size()
 
-    particles = [MenuParticle(W, H) for _ in range(32)]
+    particles = make_menu_particles(W, H)
+
+    # Pulso do logo: 1 período (2π / 0.002 ms) pré-renderizado
+    LOGO_PULSE_MS = 2 * math.pi / 0.002
+    logo_strip = pulse_strip(logo, 0.03, LOGO_PULSE_MS)
 
     base_y = int(H * 0.58)
     spacing = int(H * 0.15)
@@ -234,7 +229,8 @@ async def main_menu(screen):
     needs_recalc = False
     clock = pygame.time.Clock()
     fading = True
-    fade_alpha = 255
+    fade_start = pygame.time.get_ticks()
+    FADE_IN_MS = 420
 
     while True:
         dt = clock.tick(60)
@@ -253,33 +249,29 @@ async def main_menu(screen):
             spacing = int(H * 0.15)
             for i, b in enumerate(buttons):
                 b.update_layout((cx, base_y + i * spacing), font)
-            particles = [MenuParticle(W, H) for _ in range(32)]
+            particles.resize(W, H)
+            logo_strip = pulse_strip(logo, 0.03, LOGO_PULSE_MS)
             needs_recalc = False
 
         # --- DRAW ---
         screen.blit(background, (0,0))
 
-        for p in particles:
-            p.update(dt, W, H)
-            p.draw(screen)
+        particles.update(dt)
+        particles.draw(screen)
 
-        logo_pulse = 1.0 + 0.03 * math.sin(pygame.time.get_ticks() * 0.002)
-        logo_s = pygame.transform.rotozoom(logo, 0, logo_pulse)
-        logo_rect = logo_s.get_rect(center=(W//2, int(H*0.28)))
-        screen.blit(logo_s, logo_rect)
+        logo_strip.blit_centered(screen, (W//2, int(H*0.28)), pygame.time.get_ticks())
 
         for b in buttons:
             b.draw(screen, mouse_pos, dt)
 
         # Fade-in inicial
         if fading:
-            f = pygame.Surface((W,H))
-            f.fill((0,0,0))
-            f.set_alpha(fade_alpha)
-            screen.blit(f, (0,0))
-            fade_alpha = max(0, fade_alpha - 10)
-            if fade_alpha == 0:
+            # Fade-in por tempo (mesma duração a 30 ou 60 FPS)
+            fade_alpha = 255 - 255 * (pygame.time.get_ticks() - fade_start) // FADE_IN_MS
+            if fade_alpha <= 0:
                 fading = False
+            else:
+                blit_overlay(screen, (0, 0, 0), fade_alpha)
 
         # --- EVENTS ---
         for ev in pygame.event.get():
@@ -311,12 +303,7 @@ async def main_menu(screen):
                     # --- INICIAR JOGO ---
                     if b.text == "Iniciar Jogo":
                         # Efeito visual de transição
-                        f = pygame.Surface((W,H)); f.fill((0,0,0))
-                        for a in range(0, 255, 20):
-                            f.set_alpha(a)
-                            screen.blit(f,(0,0))
-                            display_manager.update() # Importante usar o manager
-                            await asyncio.sleep(0.01)
+                        await fade_out(screen, 400, present=display_manager.update) # Importante usar o manager
 
                         audio_manager.fade_to_music("cutscene_intro", fade_ms=700)
                         
@@ -11,10 +11,12 @@ from math import sin
 import asyncio  # <--- IMPORTANTE PARA WEB
 
 from src.utils import (
-    load_font, draw_text, draw_text_wrapped, draw_modern_container, 
+    load_font, draw_text, draw_modern_container, TypewriterText,
     fade_in, fade_out
 )
 from src.audio_manager import audio_manager
+from src.particles import ParticleEmitter, circle_sprites
+from src.performance import particle_budget
 import src.difficulty_manager as dm
 
 
@@ -29,49 +31,51 @@ def _blur_surface(surface, amount=10):
     small = pygame.transform.smoothscale(surface, (max(1, w//amount), max(1, h//amount)))
     return pygame.transform.smoothscale(small, (w, h))
 
-class StarParticle:
-    """Partículas sutis para o fundo (Poeira Estelar)"""
-    def __init__(self, w, h):
-        self.w, self.h = w, h
-        self.reset(first_time=True)
-
-    def reset(self, first_time=False):
-        self.x = random.randint(0, self.w)
-        if first_time: self.y = random.randint(0, self.h)
-        else: self.y = self.h + 10
-        self.speed = random.uniform(0.3, 0.9) # Velocidade lenta e calma
-        self.size = random.randint(1, 2)      # Pequenas
-        self.alpha = random.randint(80, 180)  # Transparência média
-    
-    def update(self):
-        self.y -= self.speed
-        if self.y < -10: self.reset()
-
-    def draw(self, surface):
-        s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 255, 255, int(self.alpha)), (self.size, self.size), self.size)
-        surface.blit(s, (int(self.x), int(self.y)))
-
-def draw_glowing_text(screen, text, font, center_pos, time_val):
-    """Texto com efeito neon pulsante para o Game Over"""
-    glow_intensity = 100 + int(50 * sin(time_val * 0.005))
-    glow_color = (200, 220, 255, max(0, min(255, glow_intensity)))
-    
-    # Glow (blur simulado)
-    txt_surf = font.render(text, True, glow_color)
-    rect = txt_surf.get_rect(center=center_pos)
-    for off in [2, -2]:
-        screen.blit(txt_surf, (rect.x + off, rect.y))
-        screen.blit(txt_surf, (rect.x, rect.y + off))
-        
-    # Texto Sólido
-    main_surf = font.render(text, True, (255, 255, 255))
-    screen.blit(main_surf, rect)
+def make_star_particles(w, h, count=25):
+    """Partículas sutis para o fundo (Poeira Estelar), num emissor vetorizado."""
+    return ParticleEmitter(
+        w, h, count, circle_sprites((1, 2), [(255, 255, 255)], (80, 130, 180)),
+        vy=(-0.9, -0.3), flow="up", respawn=(10, 10), margin=10,
+    )
+
+def caption_layer(size, captions):
+    """
+    Legendas estáticas de um ato (text, font, color, center, shadow) numa
+    surface transparente, recortada ao conteúdo. Retorna (surface, pos).
+    """
+    layer = pygame.Surface(size, pygame.SRCALPHA)
+    for text, font, color, center, shadow in captions:
+        draw_text(layer, text, font, color, center, shadow=shadow)
+    box = layer.get_bounding_rect()
+    return layer.subsurface(box).copy(), box.topleft
+
+class GlowingText:
+    """Texto com efeito neon pulsante para o Game Over (camadas prontas, o pulso é só alpha)"""
+    def __init__(self, text, font, center_pos):
+        # Glow (blur simulado): as 4 cópias deslocadas já somadas numa surface
+        txt_surf = font.render(text, True, (200, 220, 255))
+        self.rect = txt_surf.get_rect(center=center_pos)
+        w, h = txt_surf.get_size()
+        self.glow = pygame.Surface((w + 4, h + 4), pygame.SRCALPHA)
+        for off in [2, -2]:
+            self.glow.blit(txt_surf, (2 + off, 2))
+            self.glow.blit(txt_surf, (2, 2 + off))
+        self.glow_pos = (self.rect.x - 2, self.rect.y - 2)
+
+        # Texto Sólido
+        self.main_surf = font.render(text, True, (255, 255, 255))
+
+    def draw(self, screen, time_val):
+        glow_intensity = 100 + int(50 * sin(time_val * 0.005))
+        self.glow.set_alpha(max(0, min(255, glow_intensity)))
+        screen.blit(self.glow, self.glow_pos)
+        screen.blit(self.main_surf, self.rect)
 
 
 # ===========================================================
 #             FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
+@particle_budget.scene
 async def run_cutscene_final(screen, final_score):
     clock = pygame.time.Clock()
     
@@ -118,34 +122,34 @@ async def run_cutscene_final(screen, final_score):
         p_title = "Extraordinário!"
         p_body = "Sua gestão foi impecável! Os processos estão alinhados e o valor foi entregue. Você é um verdadeiro Mestre da Governança!"
 
+    # Typewriter incremental (~1 letra por frame a 60 FPS)
+    d_rect = pygame.Rect((screen.get_width() * 0.1), H * 0.65, screen.get_width() * 0.8, H * 0.3)
+    typewriter = TypewriterText(font_body, (255,255,255), d_rect.inflate(-40, -80), char_speed=16)
+    typewriter.set_text(p_body)
+    
+    # Composição estática do ato montada uma vez: fundo borrado, Pascal
+    # redimensionado na pose, caixa de texto e título. Por frame, só o typewriter.
+    act1_frame = bg.copy()
+    h_target = int(H * 0.85)
+    if pascal:
+        ratio = pascal.get_width() / pascal.get_height()
+        pas_scaled = pygame.transform.smoothscale(pascal, (int(h_target*ratio), h_target))
+        act1_frame.blit(pas_scaled, (int(screen.get_width() * 0.05), H - h_target))
+    draw_modern_container(act1_frame, d_rect)
+    draw_text(act1_frame, p_title, font_title, (255, 215, 0), (d_rect.centerx, d_rect.y + 30))
+
     # Loop Ato 1
     # CORRIGIDO: Adicionado await
-    await fade_in(screen)
+    await fade_in(screen, frame=act1_frame)
     running_act1 = True
-    char_idx = 0
-    full_text = p_body
-    
+
     while running_act1:
         clock.tick(60)
-        screen.blit(bg, (0,0))
-        
-        # Pascal
-        if pascal:
-            h_target = int(H * 0.85)
-            ratio = pascal.get_width() / pascal.get_height()
-            pas_scaled = pygame.transform.smoothscale(pascal, (int(h_target*ratio), h_target))
-            screen.blit(pas_scaled, (int(screen.get_width() * 0.05), H - h_target))
-
-        # Caixa de Texto
-        d_rect = pygame.Rect((screen.get_width() * 0.1), H * 0.65, screen.get_width() * 0.8, H * 0.3)
-        draw_modern_container(screen, d_rect)
-        
-        # Título Pascal
-        draw_text(screen, p_title, font_title, (255, 215, 0), (d_rect.centerx, d_rect.y + 30))
+        screen.blit(act1_frame, (0,0))
         
         # Typewriter
-        if char_idx < len(full_text): char_idx += 1
-        draw_text_wrapped(screen, full_text[:char_idx], font_body, (255,255,255), d_rect.inflate(-40, -80))
+        typewriter.update()
+        typewriter.draw(screen)
 
         # Input
         for ev in pygame.event.get():
@@ -176,7 +180,18 @@ async def run_cutscene_final(screen, final_score):
     motivacao = frases.get(diff, "Governança é o caminho.")
 
     # Partículas do Ato 2 (Poucas: ~25)
-    particles_act2 = [StarParticle(screen.get_width(), screen.get_height()) for _ in range(25)]
+    particles_act2 = make_star_particles(screen.get_width(), screen.get_height())
+
+    # Legendas fixas (ficam por cima das partículas) e aviso pré-renderizados
+    cx, cy = screen.get_width()//2, screen.get_height()//2
+    act2_text, act2_pos = caption_layer(screen.get_size(), [
+        ("PONTUAÇÃO FINAL DO JOGADOR", font_title, (200, 200, 200), (cx, cy - 120), False),
+        (str(final_score), font_huge, (255, 215, 0), (cx, cy), True),
+        (f"Dificuldade: {diff.upper()}", font_body, (100, 200, 255), (cx, cy + 80), False),
+        (f'"{motivacao}"', font_body, (150, 150, 150), (cx, cy + 140), False),
+    ])
+    btn_txt = font_small.render("Toque para continuar", True, (255, 255, 255))
+    btn_pos = btn_txt.get_rect(center=(cx, H - 50))
 
     # Loop Ato 2
     # CORRIGIDO: Adicionado await
@@ -187,27 +202,16 @@ async def run_cutscene_final(screen, final_score):
         screen.fill((10, 15, 25)) # Fundo sóbrio
 
         # Atualiza e desenha partículas AO FUNDO
-        for p in particles_act2:
-            p.update()
-            p.draw(screen)
+        particles_act2.update()
+        particles_act2.draw(screen)
 
-        cx, cy = screen.get_width()//2, screen.get_height()//2
-
-        # Títulos
-        draw_text(screen, "PONTUAÇÃO FINAL DO JOGADOR", font_title, (200, 200, 200), (cx, cy - 120))
-        
-        # Score Gigante
-        draw_text(screen, str(final_score), font_huge, (255, 215, 0), (cx, cy), shadow=True)
-
-        # Detalhes
-        draw_text(screen, f"Dificuldade: {diff.upper()}", font_body, (100, 200, 255), (cx, cy + 80))
-        draw_text(screen, f'"{motivacao}"', font_body, (150, 150, 150), (cx, cy + 140))
+        # Títulos, score e detalhes
+        screen.blit(act2_text, act2_pos)
 
         # Aviso
         blink = abs(sin(pygame.time.get_ticks() * 0.005)) * 255
-        btn_txt = font_small.render("Toque para continuar", True, (255, 255, 255))
         btn_txt.set_alpha(int(blink))
-        screen.blit(btn_txt, btn_txt.get_rect(center=(cx, H - 50)))
+        screen.blit(btn_txt, btn_pos)
 
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
@@ -252,33 +256,36 @@ async def run_cutscene_final(screen, final_score):
     running_act3 = True
     
     # Partículas do Ato 3 (Poucas: ~25, reaproveitando ou criando novas)
-    particles_act3 = [StarParticle(screen.get_width(), screen.get_height()) for _ in range(25)]
+    particles_act2.close()  # O ato anterior devolve sua fatia do orçamento
+    particles_act3 = make_star_particles(screen.get_width(), screen.get_height())
+
+    # Cada linha renderizada uma vez: (surface ou None, avanço vertical)
+    estilos = {
+        "header": (font_big, (255, 215, 0), 90),
+        "role": (font_body, (150, 150, 150), 40),
+        "name": (font_title, (255, 255, 255), 60),
+    }
+    linhas = []
+    for linha, tipo in creditos:
+        f, c, off = estilos.get(tipo, (font_body, (0,0,0), 40))
+        linhas.append((f.render(linha, True, c) if linha else None, off))
+    credit_cx = screen.get_width()//2
 
     while running_act3:
         dt = clock.tick(60)
         screen.fill((0, 0, 0)) # Fundo Preto
 
         # Partículas no fundo dos créditos
-        for p in particles_act3:
-            p.update()
-            p.draw(screen)
+        particles_act3.update()
+        particles_act3.draw(screen)
 
         # Renderiza texto subindo
         curr_y = scroll_y
         all_passed = True
         
-        for linha, tipo in creditos:
-            if tipo == "header":
-                f, c, off = font_big, (255, 215, 0), 90
-            elif tipo == "role":
-                f, c, off = font_body, (150, 150, 150), 40
-            elif tipo == "name":
-                f, c, off = font_title, (255, 255, 255), 60
-            else:
-                f, c, off = font_body, (0,0,0), 40
-
-            if -100 < curr_y < H + 100:
-                draw_text(screen, linha, f, c, (screen.get_width()//2, curr_y))
+        for surf, off in linhas:
+            if surf and -100 < curr_y < H + 100:
+                screen.blit(surf, surf.get_rect(center=(credit_cx, int(curr_y))))
             
             if curr_y > -50: all_passed = False
             curr_y += off
@@ -306,7 +313,11 @@ async def run_cutscene_final(screen, final_score):
     # ATO 4: GAME OVER (LOOP FINAL)
     # ------------------------------------------------------------------
     # Mais partículas aqui para o final dramático (~40)
-    particles_act4 = [StarParticle(screen.get_width(), H) for _ in range(40)]
+    particles_act3.close()
+    particles_act4 = make_star_particles(screen.get_width(), H, 40)
+    game_over = GlowingText("GAME OVER", font_huge, (screen.get_width()//2, H//2 - 20))
+    back_surf = font_small.render("- Clique para voltar ao Menu -", True, (120, 120, 120))
+    back_pos = back_surf.get_rect(center=(screen.get_width()//2, H - 60))
     t = 0
     running_act4 = True
     
@@ -316,19 +327,17 @@ async def run_cutscene_final(screen, final_score):
         screen.fill((0, 0, 0))
 
         # Partículas
-        for p in particles_act4:
-            p.update()
-            p.draw(screen)
+        particles_act4.update()
+        particles_act4.draw(screen)
 
         # Game Over Neon
-        draw_glowing_text(screen, "GAME OVER", font_huge, (screen.get_width()//2, H//2 - 20), t)
+        game_over.draw(screen, t)
 
         # Botão voltar
         if t > 1500: # Delay dramático
             blink = abs(sin(t * 0.003)) * 255
-            back_surf = font_small.render("- Clique para voltar ao Menu -", True, (120, 120, 120))
             back_surf.set_alpha(int(blink))
-            screen.blit(back_surf, back_surf.get_rect(center=(screen.get_width()//2, H - 60)))
+            screen.blit(back_surf, back_pos)
 
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
@@ -5,19 +5,20 @@
 import pygame
 import os
 import random
-from math import sin
+from math import sin, pi
 import asyncio  # <--- IMPORTANTE PARA WEB
 
 from src.utils import (
     load_font,
     draw_text,
-    draw_text_wrapped,
     draw_modern_container,
+    TypewriterText,
     fade_in,
     fade_out
 )
 
 from src.audio_manager import audio_manager
+from src.render_cache import pulse_strip, glow_fill
 
 
 # ============================================================
@@ -147,6 +148,9 @@ async def run_cutscene_intro(screen):
         except:
             pascal = None
 
+    # Respiração do Pascal: 1 período de sin(t * 0.005) pré-renderizado
+    pascal_strip = pulse_strip(pascal, 0.012, 2 * pi / 0.005) if pascal else None
+
     # Cache de partículas (Texto renderizado uma vez)
     particle_chars = ["✦", "✧", "•", "⋆"]
     particle_surfs = [font_particle.render(c, True, (255, 230, 170)) for c in particle_chars]
@@ -161,9 +165,6 @@ async def run_cutscene_intro(screen):
             "surf": random.choice(particle_surfs) # Usa surface pré-renderizada
         })
 
-    # Glow estático (transparente) para evitar criar surface todo frame
-    glow_surf = pygame.Surface((W, H), pygame.SRCALPHA)
-    
     # ==================================================================
     # SCRIPT
     # ==================================================================
@@ -197,18 +198,22 @@ async def run_cutscene_intro(screen):
     ]
 
     index = 0
-    body_text = script[0][1]
-    char_index = 0
     char_speed = 18
-    last_char = pygame.time.get_ticks()
+
+    # Caixa de diálogo (layout fixo) + máquina de escrever incremental
+    d_w = int(W * 0.88)
+    d_h = int(H * 0.28)
+    d_rect = pygame.Rect((W - d_w)//2, int(H * 0.66), d_w, d_h)
+    typewriter = TypewriterText(font_body, (240,240,240), d_rect.inflate(-40, -80), align="left", char_speed=char_speed)
 
     pas_x = -500
     pas_alpha = 0
     
     skip_btn = SkipButton(W, font_skip)
 
-    # Fade In suave
-    await fade_in(screen)
+    # Fade In suave (a partir do fundo da cena)
+    await fade_in(screen, frame=bg)
+    typewriter.set_text(script[0][1])
 
     running = True
     t = 0
@@ -224,11 +229,9 @@ async def run_cutscene_intro(screen):
         # 1. Background (Blit simples é rápido)
         screen.blit(bg, (0, 0))
 
-        # 2. Glow Pulsante Otimizado
-        # Em vez de fill a cada frame, ajustamos alpha geral se possível ou limitamos updates
+        # 2. Glow Pulsante (fill aditivo direto na tela, sem surface intermediária)
         glow_alpha = int(35 + 20 * sin(t * 0.004))
-        glow_surf.fill((60, 90, 180, glow_alpha)) # Ainda necessário, mas surface já existe
-        screen.blit(glow_surf, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        glow_fill(screen, (60, 90, 180), glow_alpha)
 
         # 3. Partículas Rápidas (Sem render de texto no loop)
         for p in particles:
@@ -252,11 +255,8 @@ async def run_cutscene_intro(screen):
             target_x = int(W * 0.03)
             pas_x += (target_x - pas_x) * 0.12
 
-            # Respiração leve (rotozoom é pesado, usar com moderação ou pré-cache se travar)
-            # Na Web, rotozoom constante pode ser pesado.
-            # Se ainda der lag, comente a linha 'rotozoom' abaixo.
-            scale = 1.0 + 0.012 * sin(t * 0.005)
-            pas_draw = pygame.transform.rotozoom(pascal, 0, scale)
+            # Respiração leve (quadros pré-renderizados, sem rotozoom no loop)
+            pas_draw = pascal_strip.get(t)
 
             # Fade do personagem
             pas_alpha = min(255, pas_alpha + 4)
@@ -280,21 +280,10 @@ async def run_cutscene_intro(screen):
             (d_rect.x + 30 + font_title.size(script[index][0])[0]/2, d_rect.y + 25)
         )
 
-        # Máquina de escrever
-        now = pygame.time.get_ticks()
-        if char_index < len(body_text) and now - last_char >= char_speed:
-            char_index += 1
-            last_char = now
-
-        ta = d_rect.inflate(-40, -80)
-        draw_text_wrapped(
-            screen,
-            body_text[:char_index],
-            font_body,
-            (240,240,240),
-            ta,
-            align="left" 
-        )
+        # Máquina de escrever (só rasteriza os glifos novos)
+        typewriter.set_rect(d_rect.inflate(-40, -80))
+        typewriter.update()
+        typewriter.draw(screen)
 
         # Hint
         if (t // 400) % 2 == 0:
@@ -321,17 +310,15 @@ async def run_cutscene_intro(screen):
 
                 # Clique para avançar texto
                 audio_manager.play_sfx_if_exists("click")
-                if char_index < len(body_text):
-                    char_index = len(body_text) # Completa texto instantâneo
+                if not typewriter.done:
+                    typewriter.reveal_all() # Completa texto instantâneo
                 else:
                     index += 1
                     if index >= len(script):
                         await fade_out(screen)
                         return
 
-                    body_text = script[index][1]
-                    char_index = 0
-                    last_char = pygame.time.get_ticks()
+                    typewriter.set_text(script[index][1])
 
         pygame.display.flip()
         
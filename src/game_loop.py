@@ -17,6 +17,10 @@ import traceback
 from math import sin
 
 from src.utils import show_pause_screen, load_font
+from src.render_cache import theme_sprite_bank
+from src.scene_cache import scene_cache
+from src.particles import ParticleEmitter
+from src.performance import particle_budget
 from src.score_manager import ScoreManager
 from src.audio_manager import AudioManager
 
@@ -38,12 +42,19 @@ bg_start_original = None
 bg_exit_original = None
 
 
-def resize_backgrounds(screen):
-    global bg_start, bg_exit, bg_start_original, bg_exit_original
+def _build_backgrounds(layout, size):
     if bg_start_original:
-        bg_start = pygame.transform.scale(bg_start_original, screen.get_size())
+        layout['bg_start'] = pygame.transform.scale(bg_start_original, size)
     if bg_exit_original:
-        bg_exit = pygame.transform.scale(bg_exit_original, screen.get_size())
+        layout['bg_exit'] = pygame.transform.scale(bg_exit_original, size)
+
+
+def resize_backgrounds(screen):
+    global bg_start, bg_exit
+    # Memo por tamanho de janela: entre fases e no F11 não reescala de novo
+    layout = scene_cache.layout("game_loop", screen.get_size(), _build_backgrounds)
+    bg_start = layout.get('bg_start', bg_start)
+    bg_exit = layout.get('bg_exit', bg_exit)
 
 
 async def show_intro_screen(screen, clock):
@@ -92,6 +103,7 @@ async def show_intro_screen(screen, clock):
         clock.tick(60)
 
 
+@particle_budget.scene
 async def show_stage_transition(screen, stage_num, stage_name):
     clock = pygame.time.Clock()
     font_big = load_font(80)
@@ -112,12 +124,15 @@ async def show_stage_transition(screen, stage_num, stage_name):
 
     style = styles.get(stage_name, styles["Show do Bilhão"])
 
-    particles = []
+    bank = theme_sprite_bank(style, font_particle)
     W, H = screen.get_size()
-    for _ in range(45):
-        p = {"x": random.randint(0, W), "y": random.randint(0, H), "r": random.randint(2, 6), "alpha": random.randint(130, 255), "speed": random.uniform(0.5, 2)}
-        if style["type"] == "char": p["char"] = random.choice(style["content"])
-        particles.append(p)
+    particles = ParticleEmitter(W, H, 45, bank.sprites.values(), vy=(-2, -0.5), flow="up",
+                                respawn=(0, 80), fade=2, alpha=(150, 255))
+
+    # Título fixo renderizado uma vez; a pontuação só re-renderiza quando muda
+    title = font_big.render(stage_name, True, style["accent"])
+    score_surf = None
+    score_shown = None
 
     running = True
     while running:
@@ -135,30 +150,18 @@ async def show_stage_transition(screen, stage_num, stage_name):
 
         screen.fill(style["bg"])
 
-        for p in particles:
-            p["y"] -= p["speed"]; p["alpha"] -= 2
-            if p["y"] < -10 or p["alpha"] <= 0:
-                p["x"] = random.randint(0, W); p["y"] = random.randint(H, H + 80); p["alpha"] = random.randint(150, 255)
-            
-            base = style["color"]
-            col = (base[0], base[1], base[2], int(p["alpha"]))
-
-            if style["type"] == "char":
-                surf = font_particle.render(p["char"], True, col); surf.set_alpha(col[3])
-                screen.blit(surf, (int(p["x"]), int(p["y"])))
-            else:
-                surf = pygame.Surface((p["r"]*2, p["r"]*2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, col, (p["r"], p["r"]), p["r"])
-                screen.blit(surf, (int(p["x"]), int(p["y"])))
+        particles.update()
+        particles.draw(screen)
 
         fade = int(255 * min(t * 1.5, 1))
-        title = font_big.render(stage_name, True, style["accent"])
         title.set_alpha(fade)
         screen.blit(title, title.get_rect(center=(W//2, H//2 - 50)))
 
         try: sc = ScoreManager.update_displayed_score()
         except: sc = ScoreManager.get_score()
-        score_surf = font_small.render(f"Pontuação total: {sc}", True, (240, 240, 240))
+        if sc != score_shown:
+            score_shown = sc
+            score_surf = font_small.render(f"Pontuação total: {sc}", True, (240, 240, 240))
         score_surf.set_alpha(fade)
         screen.blit(score_surf, score_surf.get_rect(center=(W//2, H//2 + 60)))
 
@@ -184,10 +187,8 @@ async def start_game_loop(screen):
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     bg_dir = os.path.join(base_dir, "assets", "background")
 
-    try: bg_start_original = pygame.image.load(os.path.join(bg_dir, "loop_start.png")).convert()
-    except: bg_start_original = None
-    try: bg_exit_original = pygame.image.load(os.path.join(bg_dir, "loop_exit.png")).convert()
-    except: bg_exit_original = None
+    bg_start_original = scene_cache.image(os.path.join(bg_dir, "loop_start.png"))
+    bg_exit_original = scene_cache.image(os.path.join(bg_dir, "loop_exit.png"))
 
     resize_backgrounds(screen)
     
@@ -11,6 +11,10 @@ import asyncio
 
 from src.audio_manager import audio_manager
 from src.utils import load_font
+from src.particles import ParticleEmitter, circle_sprites
+from src.performance import particle_budget
+from src.render_cache import ButtonSkin, tween_scales
+from src.scene_cache import scene_cache
 
 # ---------- Helper: Blur eficiente ----------
 def _blur_surface(surface, amount=10):
@@ -26,47 +30,14 @@ def _blur_surface(surface, amount=10):
     return pygame.transform.smoothscale(surf_small, (w, h))
 
 # ---------- Partículas (OTIMIZADAS) ----------
-class Particle:
-    # Slots economizam memória em objetos criados em massa
-    __slots__ = ("x", "y", "vx", "vy", "decay", "image", "rect")
-
-    def __init__(self, w, h):
-        self.reset(w, h, first_run=True)
-
-    def reset(self, w, h, first_run=False):
-        self.x = random.uniform(0, w)
-        self.y = random.uniform(0, h)
-        
-        # Tamanho e cor definidos na criação para gerar a Surface UMA VEZ
-        size = random.randint(3, 8)
-        color = random.choice([(255,215,0),(255,223,80),(255,191,0)])
-        alpha = random.randint(100, 200)
-
-        # --- OTIMIZAÇÃO CRÍTICA ---
-        # Criamos a imagem aqui. No draw() apenas fazemos o blit.
-        self.image = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (*color, alpha), (size, size), size)
-        self.rect = self.image.get_rect()
-        # --------------------------
-
-        self.vx = random.uniform(-0.3, 0.3)
-        self.vy = random.uniform(-0.6, -0.15)
-        self.decay = random.uniform(0.4, 1.6)
-
-    def update(self, dt, w, h):
-        # Movimento simples
-        mul = dt * 0.06
-        self.x += self.vx * mul
-        self.y += self.vy * mul
-        
-        # Reset se sair da tela (Reutiliza o objeto)
-        if self.y < -20 or self.x < -50 or self.x > w + 50:
-            self.reset(w, h)
-            self.y = h + 20
-
-    def draw(self, screen):
-        # Blit direto é muito mais rápido que desenhar circulos a cada frame
-        screen.blit(self.image, (int(self.x), int(self.y)))
+def make_particles(w, h):
+    """Brilhos dourados subindo (emissor vetorizado, sprites criados uma vez)."""
+    return ParticleEmitter(
+        w, h, 25,
+        circle_sprites((3, 5, 8), [(255, 215, 0), (255, 223, 80), (255, 191, 0)], (100, 150, 200)),
+        vx=(-0.3 * 0.06, 0.3 * 0.06), vy=(-0.6 * 0.06, -0.15 * 0.06),
+        flow="up", respawn=(20, 20), margin=20,
+    )
 
 
 # ---------- Botão Animado (OTIMIZADO) ----------
@@ -82,8 +53,8 @@ class AnimButton:
         self.fixed_size = fixed_size
         
         # Cache de surfaces
-        self.gloss_surf = None
         self.text_surf = None
+        self.skin = None
         self._render()
 
     def _render(self):
@@ -102,13 +73,25 @@ class AnimButton:
         self.rect.center = self.center
 
         # --- OTIMIZAÇÃO CRÍTICA ---
-        # Gera o brilho (gloss) uma vez só, não a cada frame
-        self.gloss_surf = pygame.Surface((self.width, self.height // 2), pygame.SRCALPHA)
-        self.gloss_surf.fill((255, 255, 255, 20))
+        # Sombra, base, gloss, borda e texto de cada estado/escala montados
+        # uma vez só; o draw é um único blit
+        self.skin = ButtonSkin(
+            (self.width, self.height),
+            {"idle": (self.base_color, (255, 255, 255), 2),
+             "hover": (self.hover_color, (255, 255, 255), 2)},
+            radius=12, shadow=((0, 0, 0, 80), (4, 4)),
+            content=self._draw_content, scales=tween_scales(1.05))
+
+    def _draw_content(self, surf, r, state):
+        # Gloss na metade de cima + texto
+        gloss = pygame.Surface((r.width, r.height // 2), pygame.SRCALPHA)
+        gloss.fill((255, 255, 255, 20))
+        surf.blit(gloss, r.topleft)
+        surf.blit(self.text_surf, self.text_surf.get_rect(center=r.center))
 
     def update_pos(self, center, fixed_size=None):
         self.center = center
-        if fixed_size:
+        if fixed_size and fixed_size != self.fixed_size:
             self.fixed_size = fixed_size
             self._render() # Recalcula apenas se mudar tamanho
         self.rect.center = center
@@ -122,35 +105,7 @@ class AnimButton:
         if abs(diff) > 0.001:
             self.scale += diff * 0.2
 
-        cur_w = int(self.width * self.scale)
-        cur_h = int(self.height * self.scale)
-        
-        # Centraliza
-        r = pygame.Rect(0, 0, cur_w, cur_h)
-        r.center = self.center
-
-        # Sombra
-        shadow = r.copy()
-        shadow.move_ip(4, 4)
-        pygame.draw.rect(screen, (0, 0, 0, 80), shadow, border_radius=12)
-
-        # Base Colorida
-        color = self.hover_color if hover else self.base_color
-        pygame.draw.rect(screen, color, r, border_radius=12)
-        
-        # Gloss (Apenas blit redimensionado se necessário, muito mais leve que criar surface)
-        if self.scale != 1.0:
-            gloss_scaled = pygame.transform.scale(self.gloss_surf, (cur_w, cur_h // 2))
-            screen.blit(gloss_scaled, (r.x, r.y))
-        else:
-            screen.blit(self.gloss_surf, (r.x, r.y))
-
-        # Borda
-        pygame.draw.rect(screen, (255, 255, 255), r, 2, border_radius=12)
-        
-        # Texto
-        text_rect = self.text_surf.get_rect(center=r.center)
-        screen.blit(self.text_surf, text_rect)
+        self.skin.blit(screen, self.center, "hover" if hover else "idle", self.scale)
 
     def clicked(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -171,12 +126,11 @@ class FreeModeUI:
         self.minigames = []
         self._load_imports() # Imports protegidos
         self._load_resources()
-        self._create_buttons()
 
     def _load_imports(self):
         try:
             from src.minigames.show_do_bilhao import run_show_do_bilhao
-            from src.minigames.batalha_naval import run_batalha_naval
+            from src.minigames.batalha_naval import run_batalha_naval, run_batalha_naval_turma
             from src.minigames.maleta_certa import run_maleta_certa
             from src.minigames.roleta_risco import roleta_risco
             from src.minigames.perseguicao import run_perseguicao
@@ -185,6 +139,7 @@ class FreeModeUI:
             self.minigames = [
                 ("Show do Bilhão", run_show_do_bilhao, "musica_show_do_bilhao"),
                 ("Batalha Naval", run_batalha_naval, "musica_batalha_naval"),
+                ("Batalha Naval: Turma", run_batalha_naval_turma, "musica_batalha_naval"),
                 ("Maleta Certa", run_maleta_certa, "musica_maleta_certa"),
                 ("Perseguição", run_perseguicao, "musica_perseguicao"),
                 ("STOP", run_stop, "musica_stop"),
@@ -194,70 +149,85 @@ class FreeModeUI:
 
     def _load_resources(self):
         self.w, self.h = self.screen.get_size()
-        
+        # Fundo borrado, fontes e título desta resolução ficam no cache de
+        # cenas: voltar ao modo livre não relê nem borra o PNG de novo
+        self.layout = scene_cache.layout("modo_livre", (self.w, self.h), self._build_layout)
+
+        self.bg = self.layout['bg']
+        self.font_title = self.layout['font_title']
+        self.font_btn = self.layout['font_btn']
+        self.title_surf = self.layout['title_surf']
+        self.title_shad = self.layout['title_shad']
+        self.game_buttons, self.btn_back_mode, self.btn_menu = self.layout['buttons']
+        if getattr(self, 'particles', None):
+            self.particles.close()  # Troca de resolução: o emissor antigo sai do orçamento
+        self.particles = make_particles(self.w, self.h)
+
+    def _build_layout(self, layout, size):
+        w, h = size
         # Background com cache de blur
-        try:
-            if os.path.exists(self.bg_path):
-                raw = pygame.image.load(self.bg_path).convert()
-                raw = pygame.transform.smoothscale(raw, (self.w, self.h))
-                self.bg = _blur_surface(raw, 8)
-            else:
-                raise FileNotFoundError
-        except:
-            self.bg = pygame.Surface((self.w, self.h))
-            self.bg.fill((20, 20, 35))
-
-        self.font_title = load_font(int(self.h * 0.08))
-        self.font_btn = load_font(int(self.h * 0.035))
-        self.particles = [Particle(self.w, self.h) for _ in range(25)]
+        raw = scene_cache.image(self.bg_path)
+        if raw:
+            raw = pygame.transform.smoothscale(raw, (w, h))
+            layout['bg'] = _blur_surface(raw, 8)
+        else:
+            layout['bg'] = pygame.Surface((w, h))
+            layout['bg'].fill((20, 20, 35))
+
+        layout['font_title'] = load_font(int(h * 0.08))
+        layout['font_btn'] = load_font(int(h * 0.035))
         
         # Cache do Título
-        self.title_surf = self.font_title.render("MODO LIVRE", True, (255, 215, 0))
-        self.title_shad = self.font_title.render("MODO LIVRE", True, (0, 0, 0))
+        layout['title_surf'] = layout['font_title'].render("MODO LIVRE", True, (255, 215, 0))
+        layout['title_shad'] = layout['font_title'].render("MODO LIVRE", True, (0, 0, 0))
 
-    def _create_buttons(self):
-        cx = self.w // 2
-        btn_width = min(int(self.w * 0.5), 500)
-        btn_height = int(self.h * 0.08)
+        # Botões (com todos os estados pré-renderizados) também ficam no layout
+        layout['buttons'] = self._create_buttons(layout['font_btn'], w, h)
+
+    def _create_buttons(self, font_btn, w, h):
+        cx = w // 2
+        btn_width = min(int(w * 0.5), 500)
+        btn_height = int(h * 0.08)
         fixed_size = (btn_width, btn_height)
         
         num_games = len(self.minigames)
         spacing = 15
         total_block_height = (num_games * btn_height) + ((num_games - 1) * spacing)
         
-        area_top = int(self.h * 0.15)
-        area_bottom = int(self.h * 0.85)
+        area_top = int(h * 0.15)
+        area_bottom = int(h * 0.85)
         area_center = (area_top + area_bottom) // 2
         start_y = area_center - (total_block_height // 2) + (btn_height // 2)
         
-        self.game_buttons = []
+        game_buttons = []
         for i, (name, func, music) in enumerate(self.minigames):
             y_pos = start_y + i * (btn_height + spacing)
-            btn = AnimButton(name, (cx, y_pos), self.font_btn, (60, 60, 100), (100, 100, 180), fixed_size=fixed_size)
+            btn = AnimButton(name, (cx, y_pos), font_btn, (60, 60, 100), (100, 100, 180), fixed_size=fixed_size)
             btn.action = func
             btn.music_key = music
-            self.game_buttons.append(btn)
+            game_buttons.append(btn)
             
-        nav_y = self.h - int(self.h * 0.08)
+        nav_y = h - int(h * 0.08)
         nav_w = int(btn_width * 0.45)
         nav_h = int(btn_height * 0.9)
         nav_size = (nav_w, nav_h)
         nav_spacing = int(nav_w * 1.2)
         
-        self.btn_back_mode = AnimButton("VOLTAR", (cx - nav_spacing//2, nav_y), self.font_btn, (180, 50, 50), (220, 80, 80), fixed_size=nav_size)
-        self.btn_menu = AnimButton("MENU PRINCIPAL", (cx + nav_spacing//2, nav_y), self.font_btn, (80, 80, 80), (120, 120, 120), fixed_size=nav_size)
+        btn_back_mode = AnimButton("VOLTAR", (cx - nav_spacing//2, nav_y), font_btn, (180, 50, 50), (220, 80, 80), fixed_size=nav_size)
+        btn_menu = AnimButton("MENU PRINCIPAL", (cx + nav_spacing//2, nav_y), font_btn, (80, 80, 80), (120, 120, 120), fixed_size=nav_size)
+        return game_buttons, btn_back_mode, btn_menu
 
     def resize(self, screen):
         self.screen = screen
+        if screen.get_size() == (self.w, self.h):
+            return  # Mesmo tamanho (ex.: voltou de um minigame): nada a refazer
         self._load_resources()
-        self._create_buttons()
 
     def draw(self, dt, mouse_pos):
         self.screen.blit(self.bg, (0, 0))
         
-        for p in self.particles:
-            p.update(dt, self.w, self.h)
-            p.draw(self.screen)
+        self.particles.update(dt)
+        self.particles.draw(self.screen)
             
         # Título Cached
         tr = self.title_surf.get_rect(center=(self.w // 2, int(self.h * 0.08)))
@@ -271,6 +241,7 @@ class FreeModeUI:
 
 
 # ---------- Função Pública: run_minigame_selector (ASYNC) ----------
+@particle_budget.scene
 async def run_minigame_selector(screen):
     ui = FreeModeUI(screen)
     clock = pygame.time.Clock()
@@ -335,32 +306,46 @@ async def run_minigame_selector(screen):
 # ---------- UI da Seleção de Modo (ASYNC) ----------
 async def escolher_modo(screen):
     clock = pygame.time.Clock()
-    w, h = screen.get_size()
-    
-    font_title = load_font(int(h * 0.08))
-    font_btn = load_font(int(h * 0.05))
     
     base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    try:
-        bg_path = os.path.join(base, "assets", "background", "game_modo.png")
-        raw = pygame.image.load(bg_path).convert()
-        bg_raw = pygame.transform.smoothscale(raw, (w, h))
-        bg = _blur_surface(bg_raw, 10)
-    except:
-        bg = pygame.Surface((w, h))
-        bg.fill((20, 20, 40))
-
-    cx = w // 2
-    cy = h // 2
-    main_btn_size = (int(w * 0.4), int(h * 0.12))
-
-    btn_campanha = AnimButton("Modo Campanha", (cx, cy - 60), font_btn, (200, 60, 60), (240, 100, 100), fixed_size=main_btn_size)
-    btn_livre = AnimButton("Modo Livre", (cx, cy + 60), font_btn, (60, 100, 200), (100, 140, 240), fixed_size=main_btn_size)
-    btn_voltar = AnimButton("RETORNAR AO MENU", (cx, h - 80), font_btn, (80, 80, 80), (120, 120, 120), fixed_size=(int(w * 0.3), int(h * 0.08)))
-
-    # Cache do texto de título
-    title_surf = font_title.render("ESCOLHA O MODO DE JOGO", True, (255, 255, 255))
-    title_rect = title_surf.get_rect(center=(cx, int(h * 0.15)))
+    bg_path = os.path.join(base, "assets", "background", "game_modo.png")
+
+    def build_layout(layout, size):
+        """Fundo borrado, título e botões da resolução (memo por tamanho de janela)."""
+        w, h = size
+
+        font_title = load_font(int(h * 0.08))
+        font_btn = load_font(int(h * 0.05))
+
+        raw = scene_cache.image(bg_path)
+        if raw:
+            bg_raw = pygame.transform.smoothscale(raw, (w, h))
+            layout['bg'] = _blur_surface(bg_raw, 10)
+        else:
+            layout['bg'] = pygame.Surface((w, h))
+            layout['bg'].fill((20, 20, 40))
+
+        cx = w // 2
+        cy = h // 2
+        main_btn_size = (int(w * 0.4), int(h * 0.12))
+
+        layout['buttons'] = (
+            AnimButton("Modo Campanha", (cx, cy - 60), font_btn, (200, 60, 60), (240, 100, 100), fixed_size=main_btn_size),
+            AnimButton("Modo Livre", (cx, cy + 60), font_btn, (60, 100, 200), (100, 140, 240), fixed_size=main_btn_size),
+            AnimButton("RETORNAR AO MENU", (cx, h - 80), font_btn, (80, 80, 80), (120, 120, 120), fixed_size=(int(w * 0.3), int(h * 0.08))),
+        )
+
+        # Cache do texto de título
+        title_surf = font_title.render("ESCOLHA O MODO DE JOGO", True, (255, 255, 255))
+        layout['title'] = (title_surf, title_surf.get_rect(center=(cx, int(h * 0.15))))
+
+    def load_layout(size):
+        return scene_cache.layout("escolher_modo", size, build_layout)
+
+    layout = load_layout(screen.get_size())
+    bg = layout['bg']
+    title_surf, title_rect = layout['title']
+    btn_campanha, btn_livre, btn_voltar = layout['buttons']
 
     running = True
     while running:
@@ -386,18 +371,11 @@ async def escolher_modo(screen):
             if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
                 pygame.display.toggle_fullscreen()
                 screen = pygame.display.get_surface()
-                w, h = screen.get_size()
-                # Recalcula bg
-                try:
-                    bg_raw = pygame.transform.smoothscale(raw, (w, h))
-                    bg = _blur_surface(bg_raw, 10)
-                except: pass
-                cx, cy = w // 2, h // 2
-                main_btn_size = (int(w * 0.4), int(h * 0.12))
-                btn_campanha.update_pos((cx, cy - 60), fixed_size=main_btn_size)
-                btn_livre.update_pos((cx, cy + 60), fixed_size=main_btn_size)
-                btn_voltar.update_pos((cx, h - 80), fixed_size=(int(w * 0.3), int(h * 0.08)))
-                title_rect = title_surf.get_rect(center=(cx, int(h * 0.15)))
+                # Layout da nova resolução (instantâneo se já foi vista)
+                layout = load_layout(screen.get_size())
+                bg = layout['bg']
+                title_surf, title_rect = layout['title']
+                btn_campanha, btn_livre, btn_voltar = layout['buttons']
 
             if btn_campanha.clicked(event):
                 await asyncio.sleep(0.1)
@@ -13,51 +13,161 @@ from src.score_manager import ScoreManager
 # CORREÇÃO 1: Importamos a instância minúscula para padronizar
 from src.audio_manager import audio_manager 
 import src.difficulty_manager as dm
+from src.particles import ParticleEmitter, BurstEmitter, circle_sprites
+from src.performance import particle_budget
+from src.render_cache import blit_overlay
+from src.scene_cache import scene_cache
 
 # === SISTEMA DE PARTÍCULAS OTIMIZADO ===
-class WaterParticle:
-    # __slots__ economiza memória na Web
-    __slots__ = ('screen_w', 'screen_h', 'x', 'y', 'radius', 'speed', 'dir_x', 'dir_y', 'osc', 'image', 'rect')
-
-    def __init__(self, screen_w, screen_h):
-        self.screen_w = screen_w
-        self.screen_h = screen_h
-        self.reset(first_run=True)
-        
-        # OTIMIZAÇÃO: Cria a superfície UMA VEZ
-        self.radius = random.randint(2, 5)
-        self.image = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        # Cor fixa da água com alpha base
-        pygame.draw.circle(self.image, (160, 200, 255, random.randint(30, 110)), (self.radius, self.radius), self.radius)
-        self.rect = self.image.get_rect()
-
-    def reset(self, first_run=False):
-        self.x = random.uniform(0, self.screen_w)
-        self.y = random.uniform(0, self.screen_h)
-        self.speed = random.uniform(0.15, 0.7)
-        self.dir_x = random.uniform(-0.25, 0.25)
-        self.dir_y = random.uniform(-0.05, 0.2)
-        self.osc = random.uniform(0, 6.28)
-
-    def update(self):
-        self.x += self.dir_x + math.sin(self.osc) * 0.12
-        self.y += self.dir_y
-        self.osc += 0.04
-        
-        # Boundary Check
-        if self.x < -10: self.x = self.screen_w + 10
-        elif self.x > self.screen_w + 10: self.x = -10
-        
-        if self.y < -10: self.y = self.screen_h + 10
-        elif self.y > self.screen_h + 10: self.y = -10
-
-    def draw(self, surface):
-        # Blit é muito mais rápido que draw.circle repetido
-        surface.blit(self.image, (int(self.x), int(self.y)))
+def make_water_particles(w, h):
+    """Bolhas de água flutuando e dando a volta na tela (emissor vetorizado)."""
+    return ParticleEmitter(
+        w, h, 40, circle_sprites((2, 3, 4, 5), [(160, 200, 255)], (30, 70, 110)),
+        vx=(-0.25, 0.25), vy=(-0.05, 0.2), flow="wrap", margin=10,
+        wobble=0.12, wobble_speed=0.04,
+    )
+
+def make_splash_pools():
+    """Splash do acerto: gotas com gravidade + onda de choque (pools pré-alocados)."""
+    drops = BurstEmitter(48, color=(200, 230, 255), radius=(2, 4.99), vx=(-3, 3), vy=(-4, -1),
+                         gravity=0.1, life=(25, 25))
+    rings = BurstEmitter(6, color=(255, 255, 255), radius=(5, 5), ring=2, grow=1.5,
+                         vx=(0, 0), vy=(0, 0), life=(20, 20))
+    return drops, rings
 
 GRID_SIZE = 5
 MARGIN = 10
 
+# Cores das células por estado
+TILE_COLORS = {
+    "agua": (40, 80, 160),    # Azul (Água)
+    "hover": (80, 120, 200),
+    "navio": (200, 60, 60),   # Vermelho (Navio)
+    "erro": (80, 80, 100),    # Cinza (Erro)
+}
+
+# ===========================================================
+#        TABULEIRO CACHEADO (REDESENHA SÓ CÉLULAS ALTERADAS)
+# ===========================================================
+# Tabuleiro grande: usa a janela toda abaixo do título, sem descer do
+# tamanho mínimo de célula clicável (alvo visível num projetor)
+CELULA_MIN = 12
+MARGEM_GRANDE = 2
+BORDA_GRANDE = 10
+GRID_TURMA_MAX = 64
+
+
+def board_area(w, h):
+    """(largura, altura, topo) livres para o tabuleiro grande, abaixo do título."""
+    top = max(110, int(h * 0.16))
+    return w - 2 * BORDA_GRANDE, h - top - BORDA_GRANDE, top
+
+
+def max_grid_size(w, h):
+    """Maior tabuleiro que cabe na janela com células de CELULA_MIN."""
+    aw, ah, _ = board_area(w, h)
+    return max(GRID_SIZE, (min(aw, ah) + MARGEM_GRANDE) // (CELULA_MIN + MARGEM_GRANDE))
+
+
+def board_metrics(grid_size, w, h):
+    """
+    (célula, margem) para um tabuleiro grid_size x grid_size. Até 5x5 ocupa
+    o mesmo espaço do tabuleiro original; tabuleiros grandes são medidos
+    pela área livre da janela, nunca abaixo de CELULA_MIN.
+    """
+    if grid_size <= GRID_SIZE:
+        span = GRID_SIZE * (min(w, h) // (GRID_SIZE + 3)) + (GRID_SIZE - 1) * MARGIN
+        return max(2, (span - (grid_size - 1) * MARGIN) // grid_size), MARGIN
+    aw, ah, _ = board_area(w, h)
+    cell = (min(aw, ah) - (grid_size - 1) * MARGEM_GRANDE) // grid_size
+    return max(CELULA_MIN, cell), MARGEM_GRANDE
+
+
+def board_origin(grid_size, total, w, h):
+    """Canto superior esquerdo do tabuleiro (`total` = lado em pixels)."""
+    if grid_size <= GRID_SIZE:
+        return (w - total) // 2, (h - total) // 2 + 40
+    _, ah, top = board_area(w, h)
+    return (w - total) // 2, top + max(0, (ah - total) // 2)
+
+
+class BoardCache:
+    """Tabuleiro pré-renderizado a partir de tiles por estado."""
+
+    def __init__(self, grid_size, cell, margin):
+        self.n = grid_size
+        self.cell = cell
+        self.step = cell + margin
+        # Sombra, borda e cantos acompanham o tamanho da célula (32x32, 64x64...)
+        self.shadow = min(4, margin, max(1, cell // 8))
+        self.radius = min(6, cell // 4)
+        self.border = 2 if cell >= 16 else 1
+        size = grid_size * cell + (grid_size - 1) * margin + self.shadow
+        self.surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        self.tiles = {state: self._tile(color) for state, color in TILE_COLORS.items()}
+        # Hover é desenhado por cima da célula já cacheada (sem repetir a sombra)
+        self.hover_tile = self._tile(TILE_COLORS["hover"], shadow=False)
+        self.states = [["agua"] * grid_size for _ in range(grid_size)]
+        self.dirty = set()
+        self._fill_water()
+
+    def _tile(self, color, shadow=True):
+        c, s = self.cell, self.shadow
+        tile = pygame.Surface((c + s, c + s), pygame.SRCALPHA)
+        if shadow:
+            # Sombra leve (alpha real, pois o tile tem canal alpha)
+            pygame.draw.rect(tile, (0, 0, 0, 80), (s, s, c, c), border_radius=self.radius)
+        rect = pygame.Rect(0, 0, c, c)
+        pygame.draw.rect(tile, color, rect, border_radius=self.radius)
+        pygame.draw.rect(tile, (255, 255, 255), rect, self.border, border_radius=self.radius)
+        return tile
+
+    def _fill_water(self):
+        # Monta uma faixa (1 linha de água) e copia a faixa por linha:
+        # 2n blits em vez de n² no tabuleiro inicial
+        tile = self.tiles["agua"]
+        strip = pygame.Surface((self.surface.get_width(), tile.get_height()), pygame.SRCALPHA)
+        for col in range(self.n):
+            strip.blit(tile, (col * self.step, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        for row in range(self.n):
+            self.surface.blit(strip, (0, row * self.step), special_flags=pygame.BLEND_RGBA_MAX)
+
+    def set_state(self, row, col, state):
+        if self.states[row][col] != state:
+            self.states[row][col] = state
+            self.dirty.add((row, col))
+
+    def cell_at(self, pos, origin):
+        """(linha, coluna) sob `pos` em O(1), ou None (fora ou no espaço entre células)."""
+        dx = int(pos[0]) - origin[0]
+        dy = int(pos[1]) - origin[1]
+        if dx < 0 or dy < 0:
+            return None
+        col, rx = divmod(dx, self.step)
+        row, ry = divmod(dy, self.step)
+        if col >= self.n or row >= self.n or rx >= self.cell or ry >= self.cell:
+            return None
+        return row, col
+
+    def cell_pos(self, row, col, origin):
+        """Canto superior esquerdo da célula na tela."""
+        return origin[0] + col * self.step, origin[1] + row * self.step
+
+    def draw(self, dest, origin, hover=None):
+        if self.dirty:
+            size = self.cell + self.shadow
+            for row, col in self.dirty:
+                x, y = col * self.step, row * self.step
+                self.surface.fill((0, 0, 0, 0), (x, y, size, size))
+                # MAX sobre área zerada = cópia exata do tile (sem blend duplo)
+                self.surface.blit(self.tiles[self.states[row][col]], (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            self.dirty.clear()
+        dest.blit(self.surface, origin)
+
+        if hover is not None and self.states[hover[0]][hover[1]] == "agua":
+            dest.blit(self.hover_tile, self.cell_pos(hover[0], hover[1], origin))
+
+
 # === BANCO DE AMEAÇAS ===
 BANCO_AMEACAS = [
     ("Malware", "Antivírus Corporativo"),
@@ -82,10 +192,41 @@ BANCO_AMEACAS = [
     ("Bypass Auth", "Pentest Regular")
 ]
 
+# Setores usados para ampliar o banco em tabuleiros grandes
+SETORES = ["Financeiro", "RH", "TI", "Jurídico", "Comercial", "Logística", "Diretoria", "Suporte"]
+
+
+def sortear_ameacas(qtd):
+    """
+    `qtd` pares (ameaça, controle) distintos. Até 20 vêm direto do banco;
+    acima disso o banco é ampliado com o setor afetado (e uma numeração,
+    se ainda faltar), o que permite centenas de ameaças no tabuleiro grande.
+    """
+    if qtd <= len(BANCO_AMEACAS):
+        return random.sample(BANCO_AMEACAS, qtd)
+
+    ampliado = [(f"{a} ({s})", c) for s in SETORES for a, c in BANCO_AMEACAS]
+    random.shuffle(ampliado)
+    escolhidas = ampliado[:qtd]
+    rodada = 2
+    while len(escolhidas) < qtd:
+        escolhidas += [(f"{a} #{rodada}", c) for a, c in ampliado[:qtd - len(escolhidas)]]
+        rodada += 1
+    return escolhidas
+
 # ===========================================================
 #               FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
-async def run_batalha_naval(screen):
+@particle_budget.scene
+async def run_batalha_naval(screen, grid_size=GRID_SIZE, threats=None):
+    """
+    grid_size > 5 monta rodadas de "tabuleiro grande" (ex.: 32 ou 64 para a
+    turma inteira), limitadas ao que cabe na janela com células clicáveis.
+    Sem `threats`, a quantidade da dificuldade é escalada para manter a mesma
+    densidade de ameaças do 5x5.
+    """
+    if grid_size > GRID_SIZE:
+        grid_size = min(grid_size, max_grid_size(*screen.get_size()))
     pygame.display.set_caption("⚓ Batalha Naval - Controles e Ameaças ⚓")
     clock = pygame.time.Clock()
 
@@ -95,18 +236,14 @@ async def run_batalha_naval(screen):
     bg_path = os.path.join(assets_dir, "background", "background_batalha_naval.png")
     icon_path = os.path.join(assets_dir, "icons", "naval.png")
     
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
-    
-    icon_original = None
-    if os.path.exists(icon_path):
-        icon_original = pygame.image.load(icon_path).convert_alpha()
+    # Lidas do disco só na primeira partida (cache de cenas)
+    bg_original = scene_cache.image(bg_path)
+    icon_original = scene_cache.image(icon_path, alpha=True)
 
     layout = {}
 
-    def resize_assets(surface):
-        w, h = surface.get_size()
+    def build_layout(layout, size):
+        w, h = size
         
         if bg_original:
             layout['bg'] = pygame.transform.scale(bg_original, (w, h))
@@ -120,11 +257,10 @@ async def run_batalha_naval(screen):
         else:
             layout['icon'] = None
             
-        layout['CELL_SIZE'] = min(w, h) // (GRID_SIZE + 3)
-        total_width = GRID_SIZE * layout['CELL_SIZE'] + (GRID_SIZE - 1) * MARGIN
-        total_height = GRID_SIZE * layout['CELL_SIZE'] + (GRID_SIZE - 1) * MARGIN
-        layout['offset_x'] = (w - total_width) // 2
-        layout['offset_y'] = (h - total_height) // 2 + 40
+        layout['CELL_SIZE'], layout['MARGIN'] = board_metrics(grid_size, w, h)
+        total_width = grid_size * layout['CELL_SIZE'] + (grid_size - 1) * layout['MARGIN']
+        total_height = total_width
+        layout['offset_x'], layout['offset_y'] = board_origin(grid_size, total_width, w, h)
         layout['total_height'] = total_height
         
         # Cache Fontes
@@ -137,26 +273,44 @@ async def run_batalha_naval(screen):
         layout['title_surf'] = layout['font_title'].render(t_txt, True, (255, 255, 255))
         layout['title_shadow'] = layout['font_title'].render(t_txt, True, (0, 0, 0))
 
+    def resize_assets(surface):
+        nonlocal layout
+        layout = scene_cache.layout(("batalha_naval", grid_size), surface.get_size(), build_layout)
+
     resize_assets(screen)
     
-    water_particles = [WaterParticle(screen.get_width(), screen.get_height()) for _ in range(40)]
-    splashes = [] 
+    water_particles = make_water_particles(screen.get_width(), screen.get_height())
+    splash_drops, splash_rings = make_splash_pools()
 
     # Configuração de Jogo
-    qtd_navios_solicitada = dm.get_batalha_naval_threats()
-    max_possible = min(GRID_SIZE * GRID_SIZE, len(BANCO_AMEACAS))
-    qtd_navios = min(qtd_navios_solicitada, max_possible)
+    total_celulas = grid_size * grid_size
+    qtd_navios_solicitada = threats
+    if qtd_navios_solicitada is None:
+        qtd_navios_solicitada = round(dm.get_batalha_naval_threats() * total_celulas / (GRID_SIZE * GRID_SIZE))
+    qtd_navios = max(1, min(qtd_navios_solicitada, total_celulas))
     
-    grid = [[" " for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-    indices = random.sample(range(GRID_SIZE * GRID_SIZE), qtd_navios)
-    ameacas_escolhidas = random.sample(BANCO_AMEACAS, qtd_navios)
+    grid = [[" " for _ in range(grid_size)] for _ in range(grid_size)]
+    indices = random.sample(range(total_celulas), qtd_navios)
+    ameacas_escolhidas = sortear_ameacas(qtd_navios)
     navios_pos = {idx: ameacas_escolhidas[i] for i, idx in enumerate(indices)}
 
     reveladas = set()
     efeitos = []
     jogo_ativo = True
     frame = 0
-    HOVER_COLOR = (80, 120, 200)
+
+    def build_board():
+        """(Re)cria o tabuleiro cacheado no tamanho atual, preservando o estado."""
+        board = BoardCache(grid_size, layout['CELL_SIZE'], layout['MARGIN'])
+        for row, col in reveladas:
+            board.set_state(row, col, "navio")
+        for row in range(grid_size):
+            for col in range(grid_size):
+                if grid[row][col] == "X":
+                    board.set_state(row, col, "erro")
+        return board
+
+    board = build_board()
 
     # ========================= LOOP PRINCIPAL ================================
     while jogo_ativo:
@@ -173,9 +327,8 @@ async def run_batalha_naval(screen):
         screen.blit(layout['bg'], (0, 0))
 
         # 2. Partículas Água
-        for p in water_particles:
-            p.update()
-            p.draw(screen)
+        water_particles.update()
+        water_particles.draw(screen)
 
         # 3. Título Animado (Com Alpha Otimizado)
         # Em vez de renderizar texto, aplicamos alpha no blit se necessário, ou movemos apenas
@@ -194,75 +347,33 @@ async def run_batalha_naval(screen):
             screen.blit(layout['icon'], (tr.left - layout['icon'].get_width() - 15, tr.top))
             screen.blit(layout['icon'], (tr.right + 15, tr.top))
 
-        # 4. Tabuleiro
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                x = ox + col * (CELL_SIZE + MARGIN)
-                y = oy + row * (CELL_SIZE + MARGIN)
-                rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-
-                is_revelada = (row, col) in reveladas
-                is_erro = grid[row][col] == "X"
-                
-                # Cor Base
-                color = (40, 80, 160) # Azul (Água)
-                
-                if is_revelada:
-                    color = (200, 60, 60) # Vermelho (Navio)
-                elif is_erro:
-                    color = (80, 80, 100) # Cinza (Erro)
-                elif rect.collidepoint(mouse_pos) and jogo_ativo:
-                    color = HOVER_COLOR
-
-                # Desenho do Quadrado
-                # Sombra leve
-                pygame.draw.rect(screen, (0, 0, 0, 80), (x+4, y+4, CELL_SIZE, CELL_SIZE), border_radius=6)
-                # Corpo
-                pygame.draw.rect(screen, color, rect, border_radius=6)
-                # Borda
-                pygame.draw.rect(screen, (255, 255, 255), rect, 2, border_radius=6)
+        # 4. Tabuleiro (surface cacheada + hover por cima)
+        hover = board.cell_at(mouse_pos, (ox, oy)) if jogo_ativo else None
+        board.draw(screen, (ox, oy), hover)
 
         # 5. Efeitos Visuais (Flash)
-        for efeito in efeitos[:]:
+        ativos = []
+        for efeito in efeitos:
             efeito["tempo"] += 1
             progress = efeito["tempo"] / efeito["max_tempo"]
             
             if progress >= 1:
-                efeitos.remove(efeito)
                 continue
+            ativos.append(efeito)
                 
             alpha_fx = int(255 * (1 - progress))
             (erow, ecol) = efeito["pos"]
-            x = ox + ecol * (CELL_SIZE + MARGIN)
-            y = oy + erow * (CELL_SIZE + MARGIN)
+            x, y = board.cell_pos(erow, ecol, (ox, oy))
             
             cor = (255, 200, 60, alpha_fx) if efeito["tipo"] == "acerto" else (60, 120, 255, alpha_fx)
             
-            flash_surf = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-            flash_surf.fill(cor)
-            screen.blit(flash_surf, (x, y))
+            blit_overlay(screen, cor, rect=(x, y, CELL_SIZE, CELL_SIZE))
+        efeitos = ativos
 
         # 6. Splashes (Explosões)
-        new_splashes = []
-        for s in splashes:
-            s["life"] += 1
-            if s["life"] >= s["max_life"]: continue
-            
-            new_splashes.append(s)
-            
-            # Update física simples
-            if "dx" in s: # Partícula
-                s["x"] += s["dx"]
-                s["y"] += s["dy"]
-                s["dy"] += 0.1 # gravidade
-                s["alpha"] = max(0, s["alpha"] - 10)
-                
-                pygame.draw.circle(screen, (200, 230, 255, int(s["alpha"])), (int(s["x"]), int(s["y"])), int(s["r"]))
-            else: # Onda de choque
-                s["r"] += 1.5
-                s["alpha"] = max(0, s["alpha"] - 8)
-                pygame.draw.circle(screen, (255, 255, 255, int(s["alpha"])), (int(s["x"]), int(s["y"])), int(s["r"]), 2)
-        splashes = new_splashes
+        for pool in (splash_drops, splash_rings):
+            pool.update()
+            pool.draw(screen)
 
         draw_score_display(screen, ScoreManager.get_score(), layout['font_small'], position="topright")
 
@@ -280,34 +391,27 @@ async def run_batalha_naval(screen):
                     pygame.display.toggle_fullscreen()
                     screen = pygame.display.get_surface()
                     resize_assets(screen)
+                    board = build_board()
                 elif event.key == pygame.K_ESCAPE:
                     return ScoreManager.get_score()
             
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = pygame.mouse.get_pos()
-                
-                # Detecta clique no grid
-                clicked_cell = None
-                for row in range(GRID_SIZE):
-                    for col in range(GRID_SIZE):
-                        x = ox + col * (CELL_SIZE + MARGIN)
-                        y = oy + row * (CELL_SIZE + MARGIN)
-                        if pygame.Rect(x, y, CELL_SIZE, CELL_SIZE).collidepoint(mx, my):
-                            clicked_cell = (row, col)
-                            break
-                    if clicked_cell: break
+                # Detecta clique no grid (aritmética, sem varrer células)
+                clicked_cell = board.cell_at(event.pos, (ox, oy))
                 
                 # Lógica do Clique
                 if clicked_cell:
                     r, c = clicked_cell
                     if (r, c) not in reveladas and grid[r][c] != "X":
-                        cx = ox + c * (CELL_SIZE + MARGIN) + CELL_SIZE//2
-                        cy = oy + r * (CELL_SIZE + MARGIN) + CELL_SIZE//2
-                        pos_idx = r * GRID_SIZE + c
+                        cx, cy = board.cell_pos(r, c, (ox, oy))
+                        cx += CELL_SIZE // 2
+                        cy += CELL_SIZE // 2
+                        pos_idx = r * grid_size + c
                         
                         if pos_idx in navios_pos:
                             # --- ACERTO ---
                             reveladas.add((r, c))
+                            board.set_state(r, c, "navio")
                             ameaca, controle = navios_pos[pos_idx]
                             
                             ScoreManager.add_points(10)
@@ -316,13 +420,8 @@ async def run_batalha_naval(screen):
                             efeitos.append({"tipo": "acerto", "pos": (r, c), "tempo": 0, "max_tempo": 20})
                             
                             # Cria Splash
-                            splashes.append({"x": cx, "y": cy, "r": 5, "alpha": 255, "life": 0, "max_life": 20})
-                            for _ in range(8):
-                                splashes.append({
-                                    "x": cx, "y": cy, "r": random.randint(2,4), "alpha": 255,
-                                    "dx": random.uniform(-3, 3), "dy": random.uniform(-4, -1),
-                                    "life": 0, "max_life": 25
-                                })
+                            splash_rings.emit(cx, cy, 1)
+                            splash_drops.emit(cx, cy, particle_budget.burst("batalha_splash", 8))
 
                             # --- FIX DELAY ---
                             # Força o desenho da explosão AGORA
@@ -334,6 +433,7 @@ async def run_batalha_naval(screen):
                         else:
                             # --- ERRO ---
                             grid[r][c] = "X"
+                            board.set_state(r, c, "erro")
                             ScoreManager.add_points(-5)
                             audio_manager.play_sfx_if_exists("errado")
                             efeitos.append({"tipo": "erro", "pos": (r, c), "tempo": 0, "max_tempo": 20})
@@ -356,4 +456,9 @@ async def run_batalha_naval(screen):
         # OBRIGATÓRIO NA WEB
         await asyncio.sleep(0)
 
-    return ScoreManager.get_score()
\ No newline at end of file
+    return ScoreManager.get_score()
+
+
+async def run_batalha_naval_turma(screen):
+    """Rodada de tabuleiro grande para a turma: o maior que a tela comporta (até 64x64)."""
+    return await run_batalha_naval(screen, grid_size=GRID_TURMA_MAX)
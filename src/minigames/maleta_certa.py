@@ -15,6 +15,10 @@ try:
     from src.score_manager import ScoreManager
     from src.audio_manager import audio_manager 
     import src.difficulty_manager as dm
+    from src.performance import UIPrefetcher, particle_budget
+    from src.particles import ParticleEmitter
+    from src.render_cache import blit_overlay
+    from src.scene_cache import scene_cache
 except ImportError as e:
     print(f"Erro crítico de importação: {e}")
 
@@ -51,45 +55,17 @@ ALL_CHALLENGES = {
 # ===========================================================
 #              SISTEMA DE PARTÍCULAS (SAFE)
 # ===========================================================
-class MalaParticle:
-    __slots__ = ('screen_w', 'screen_h', 'image', 'x', 'y', 'speed', 'alpha')
-
-    def __init__(self, screen_w, screen_h, icon_surf):
-        self.screen_w = screen_w
-        self.screen_h = screen_h
-        
-        size = random.randint(20, 36)
-        
-        # SEGURANÇA: Se a imagem não veio (None), cria um quadrado amarelo
-        if icon_surf is None:
-            self.image = pygame.Surface((size, size))
-            self.image.fill((220, 200, 50)) 
-        else:
-            try:
-                # Usa SCALE simples, smoothscale pode travar web
-                self.image = pygame.transform.scale(icon_surf, (size, size))
-            except:
-                self.image = pygame.Surface((size, size))
-                self.image.fill((220, 200, 50))
-
-        self.image.set_alpha(random.randint(80, 150))
-        self.reset(first_run=True)
-
-    def reset(self, first_run=False):
-        self.x = random.randint(0, self.screen_w)
-        if first_run:
-            self.y = random.randint(0, self.screen_h)
-        else:
-            self.y = random.randint(-200, -50)
-        self.speed = random.uniform(0.7, 1.7)
-
-    def update(self, dt):
-        self.y += self.speed * dt
-        if self.y > self.screen_h + 10:
-            self.reset()
-
-    def draw(self, screen):
-        screen.blit(self.image, (int(self.x), int(self.y)))
+def make_mala_particles(w, h, icon_surf):
+    """Maletas caindo no fundo (emissor vetorizado, escalas criadas uma vez)."""
+    sprites = []
+    for size in (20, 26, 32, 36):
+        # Usa SCALE simples, smoothscale pode travar web
+        img = pygame.transform.scale(icon_surf, (size, size))
+        for alpha in (80, 115, 150):
+            s = img.copy()
+            s.set_alpha(alpha)
+            sprites.append(s)
+    return ParticleEmitter(w, h, 12, sprites, vy=(0.7, 1.7), flow="down", respawn=(50, 200), margin=10)
 
 
 # ===========================================================
@@ -103,13 +79,20 @@ class MaletaButton:
         self.current_rect = base_rect.copy()
         
         # Gera superfícies
+        # (sombra já embutida: o draw é um único blit)
         self.surf_normal = self._create_surface((20, 30, 60, 160), (0, 180, 255), (80, 120, 200), False)
         self.surf_hover = self._create_surface((40, 60, 120, 210), (150, 220, 255), (150, 220, 255), True)
 
     def _create_surface(self, body_color, border_color, handle_color, is_hover):
         w, h = self.base_rect.width, self.base_rect.height
-        surf = pygame.Surface((w, h + 40), pygame.SRCALPHA)
         body_y = 30
+
+        # Sombra
+        surf = pygame.Surface((w + 5, h + 40), pygame.SRCALPHA)
+        pygame.draw.rect(surf, (0, 0, 0, 100 if is_hover else 80), (5, body_y + 8, w, h), border_radius=15)
+
+        # Maleta numa camada própria (mistura com a sombra por baixo)
+        layer = pygame.Surface((w, h + 40), pygame.SRCALPHA)
         
         # Alça
         handle_w = int(w * 0.3)
@@ -117,22 +100,23 @@ class MaletaButton:
         handle_x = (w - handle_w) // 2
         handle_rect = pygame.Rect(handle_x, body_y - 15, handle_w, handle_h)
         
-        pygame.draw.rect(surf, (*body_color[:3], 100), handle_rect, border_radius=10)
-        pygame.draw.rect(surf, handle_color, handle_rect, 3, border_radius=10)
+        pygame.draw.rect(layer, (*body_color[:3], 100), handle_rect, border_radius=10)
+        pygame.draw.rect(layer, handle_color, handle_rect, 3, border_radius=10)
 
         # Corpo
         body_rect = pygame.Rect(0, body_y, w, h)
-        pygame.draw.rect(surf, body_color, body_rect, border_radius=15)
-        pygame.draw.rect(surf, border_color, body_rect, 2 if not is_hover else 3, border_radius=15)
+        pygame.draw.rect(layer, body_color, body_rect, border_radius=15)
+        pygame.draw.rect(layer, border_color, body_rect, 2 if not is_hover else 3, border_radius=15)
 
         # Texto
         text_rect = body_rect.inflate(-20, -20)
         try:
-            draw_text_wrapped(surf, self.text, self.font, (255, 255, 255), text_rect)
+            draw_text_wrapped(layer, self.text, self.font, (255, 255, 255), text_rect)
         except:
             # Fallback se draw_text_wrapped falhar
             pass
         
+        surf.blit(layer, (0, 0))
         return surf
 
     def draw(self, screen, anim_offset, is_hovered):
@@ -140,9 +124,6 @@ class MaletaButton:
         current_y = self.base_rect.y + anim_offset + lift
         self.current_rect.y = current_y
         
-        shadow_rect = pygame.Rect(self.base_rect.x + 5, current_y + 8, self.base_rect.width, self.base_rect.height)
-        pygame.draw.rect(screen, (0, 0, 0, 100 if is_hovered else 80), shadow_rect, border_radius=15)
-        
         img = self.surf_hover if is_hovered else self.surf_normal
         screen.blit(img, (self.base_rect.x, current_y - 30))
 
@@ -153,6 +134,7 @@ class MaletaButton:
 # ===========================================================
 #             FUNÇÃO PRINCIPAL
 # ===========================================================
+@particle_budget.scene
 async def run_maleta_certa(screen):
     pygame.display.set_caption("Qual é a Maleta Certa?")
     clock = pygame.time.Clock()
@@ -165,30 +147,16 @@ async def run_maleta_certa(screen):
     icon_path = "assets/icons/mala.png"
 
     # --- CARREGAMENTO SEGURO ---
-    bg_original = None
-    try:
-        bg_original = pygame.image.load(bg_path).convert()
-    except Exception:
-        # Tenta caminho absoluto como fallback (para rodar local no python normal)
-        try:
-            base = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            bg_original = pygame.image.load(os.path.join(base, bg_path)).convert()
-        except:
-            pass
-
-    mala_icon_original = None
-    try:
-        mala_icon_original = pygame.image.load(icon_path).convert_alpha()
-    except Exception:
-        try:
-            base = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            mala_icon_original = pygame.image.load(os.path.join(base, icon_path)).convert_alpha()
-        except:
-            pass
+    # (cache de cenas: o disco só é lido na primeira partida)
+    # Tenta caminho absoluto como fallback (para rodar local no python normal)
+    base = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    bg_original = scene_cache.image(bg_path) or scene_cache.image(os.path.join(base, bg_path))
+    mala_icon_original = (scene_cache.image(icon_path, alpha=True)
+                          or scene_cache.image(os.path.join(base, icon_path), alpha=True))
 
     # === RESIZE & CACHE ===
-    def resize_assets(surface):
-        w, h = surface.get_size()
+    def build_layout(layout, size):
+        w, h = size
         
         # Background Safe
         if bg_original:
@@ -237,12 +205,16 @@ async def run_maleta_certa(screen):
         except:
             pass
 
+    def resize_assets(surface):
+        nonlocal layout
+        layout = scene_cache.layout("maleta_certa", surface.get_size(), build_layout)
+
     resize_assets(screen)
 
     # Partículas
-    particles = []
+    particles = None
     if layout.get('mala_icon'):
-        particles = [MalaParticle(screen.get_width(), screen.get_height(), layout['mala_icon']) for _ in range(12)]
+        particles = make_mala_particles(screen.get_width(), screen.get_height(), layout['mala_icon'])
 
     diff_rules = dm.get_rules()
     q_type = dm.get_question_set_type()
@@ -262,8 +234,11 @@ async def run_maleta_certa(screen):
     current_question_surf = None
     current_question_rect = None
     
-    def setup_ui(idx):
-        nonlocal current_buttons, current_question_surf, current_question_rect
+    # Pré-construção do próximo desafio enquanto o jogador pensa
+    prefetcher = UIPrefetcher()
+
+    def build_ui(idx):
+        """Gera a UI do desafio em etapas (cada yield devolve o controle ao frame)."""
         w, h = screen.get_size()
         desafio = desafios[idx]
         
@@ -275,7 +250,6 @@ async def run_maleta_certa(screen):
         c_h = int(h * 0.22)
         c_w = w - 160
         c_rect = pygame.Rect(80, int(h * 0.22), c_w, c_h)
-        current_question_rect = c_rect
         
         s = pygame.Surface((c_w, c_h + 30), pygame.SRCALPHA)
         body_rect = pygame.Rect(0, 15, c_w, c_h)
@@ -296,7 +270,7 @@ async def run_maleta_certa(screen):
         except:
             pass # Evita crash no render de texto
         
-        current_question_surf = s
+        yield
         
         # Botões
         largura = int(w * 0.27)
@@ -306,11 +280,17 @@ async def run_maleta_certa(screen):
         start_x = (w - total) // 2
         base_y = int(h * 0.58)
         
-        current_buttons = []
+        buttons = []
         for i, txt in enumerate(opcoes):
             r = pygame.Rect(start_x + i * (largura + esp), base_y, largura, altura)
-            btn = MaletaButton(r, txt, layout['font_small'])
-            current_buttons.append(btn)
+            buttons.append(MaletaButton(r, txt, layout['font_small']))
+            yield
+
+        return s, c_rect, buttons
+
+    def setup_ui(idx):
+        nonlocal current_buttons, current_question_surf, current_question_rect
+        current_question_surf, current_question_rect, current_buttons = prefetcher.take(idx, lambda: build_ui(idx))
 
     if indice < len(desafios):
         setup_ui(indice)
@@ -328,9 +308,9 @@ async def run_maleta_certa(screen):
 
         screen.blit(layout['background'], (0, 0))
         
-        for p in particles:
-            p.update(dt)
-            p.draw(screen)
+        if particles:
+            particles.update(dt)
+            particles.draw(screen)
 
         # Título
         try:
@@ -364,14 +344,18 @@ async def run_maleta_certa(screen):
             alpha = int(255 * (1 - e["tempo"] / e["max_tempo"]))
             c = (0, 255, 0, alpha) if e["tipo"] == "acerto" else (255, 50, 50, alpha)
             
-            glow = pygame.Surface((e["rect"].width, e["rect"].height), pygame.SRCALPHA)
-            glow.fill(c)
-            screen.blit(glow, (e["rect"].x, e["rect"].y)) 
+            blit_overlay(screen, c, rect=e["rect"])
             if e["tempo"] >= e["max_tempo"]:
                 efeitos.remove(e)
 
         draw_score_display(screen, ScoreManager.get_score(), layout['font_small'], "topright")
         pygame.display.flip()
+
+        # Folga do frame: adianta o próximo desafio
+        if indice + 1 < len(desafios):
+            next_idx = indice + 1
+            prefetcher.request(next_idx, lambda: build_ui(next_idx))
+            prefetcher.step()
         
         # PONTO VITAL PARA NÃO TRAVAR O NAVEGADOR
         await asyncio.sleep(0)
@@ -386,6 +370,7 @@ async def run_maleta_certa(screen):
                     pygame.display.toggle_fullscreen()
                     screen = pygame.display.get_surface()
                     resize_assets(screen)
+                    prefetcher.clear()
                     if indice < len(desafios): setup_ui(indice)
                 elif event.key == pygame.K_ESCAPE:
                     return ScoreManager.get_score()
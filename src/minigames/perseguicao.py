@@ -15,6 +15,9 @@ from src.score_manager import ScoreManager
 # Correção do Import
 from src.audio_manager import audio_manager 
 import src.difficulty_manager as dm
+from src.performance import UIPrefetcher
+from src.camera import ScreenShake
+from src.scene_cache import scene_cache
 
 # ===========================================================
 #            BANCO DE INCIDENTES (MANTIDO)
@@ -47,31 +50,41 @@ ALL_INCIDENTS = {
 }
 
 # ===========================================================
-#            CLASSE: Estrada (Otimizada)
+#            CLASSE: Estrada (Textura Rolante)
 # ===========================================================
-class RoadLine:
-    __slots__ = ('w', 'h', 'x', 'y', 'length', 'speed', 'width', 'color')
-    def __init__(self, screen_w, screen_h):
-        self.w = screen_w
-        self.h = screen_h
-        self.x = random.randint(0, screen_w)
-        self.y = random.randint(-screen_h, 0)
-        self.length = random.randint(20, 60)
-        self.speed = random.uniform(10, 25)
-        self.width = random.randint(2, 4)
-        self.color = (40, 40, 60)
-
-    def update(self):
-        self.y += self.speed
-        if self.y > self.h:
-            self.y = -self.length
-            self.x = random.randint(0, self.w)
-
-    def draw(self, surface, offset_x, offset_y):
-        # Desenha direto na tela com offset
-        start = (self.x + offset_x, self.y + offset_y)
-        end = (self.x + offset_x, self.y + self.length + offset_y)
-        pygame.draw.line(surface, self.color, start, end, self.width)
+class RoadTexture:
+    """
+    Linhas da estrada pré-renderizadas em texturas tileáveis na vertical,
+    uma por camada de velocidade (paralaxe). O frame só rola o offset pelo
+    tempo: 2 blits por camada, sem objetos nem random no loop.
+    """
+    LAYERS = ((700, 12), (1300, 13))  # (px/s, linhas) ~ 10 a 25 px por frame a 60 FPS
+    COLOR = (40, 40, 60)
+    KEY = (255, 0, 255)
+
+    def __init__(self, w, h):
+        self.h = h
+        self.layers = []
+        for speed, count in self.LAYERS:
+            tex = pygame.Surface((w, h))
+            tex.fill(self.KEY)
+            for _ in range(count):
+                x = random.randint(0, w)
+                y = random.randint(0, h - 1)
+                length = random.randint(20, 60)
+                width = random.randint(2, 4)
+                # Desenha também deslocada de -h: a linha que sai embaixo volta em cima
+                for dy in (0, -h):
+                    pygame.draw.line(tex, self.COLOR, (x, y + dy), (x, y + length + dy), width)
+            # Colorkey RLE: o blit pula as áreas vazias
+            tex.set_colorkey(self.KEY, pygame.RLEACCEL)
+            self.layers.append((tex, speed))
+
+    def draw(self, surface, ms):
+        for tex, speed in self.layers:
+            off = int(ms * speed / 1000) % self.h
+            surface.blit(tex, (0, off))
+            surface.blit(tex, (0, off - self.h))
 
 
 # ===========================================================
@@ -90,18 +103,16 @@ async def run_perseguicao(screen):
     hacker_path = os.path.join(assets_dir, "icons", "hacker.png")
     lock_path = os.path.join(assets_dir, "icons", "cadeado.png") 
     
-    # Loads
-    bg_original = pygame.image.load(bg_path).convert() if os.path.exists(bg_path) else None
-    img_hacker = pygame.image.load(hacker_path).convert_alpha() if os.path.exists(hacker_path) else None
-    img_lock = pygame.image.load(lock_path).convert_alpha() if os.path.exists(lock_path) else None
+    # Loads (cache de cenas: o disco só é lido na primeira partida)
+    bg_original = scene_cache.image(bg_path)
+    img_hacker = scene_cache.image(hacker_path, alpha=True)
+    img_lock = scene_cache.image(lock_path, alpha=True)
 
     # === CACHE DE ASSETS ===
-    sirene_top = None
-    sirene_bottom = None
+    SIRENE_CORES = ((255, 0, 0), (0, 0, 255))
 
-    def resize_assets(surface):
-        nonlocal sirene_top, sirene_bottom
-        w, h = surface.get_size()
+    def build_layout(layout, size):
+        w, h = size
         
         if bg_original:
             layout['background'] = pygame.transform.scale(bg_original, (w, h))
@@ -133,14 +144,23 @@ async def run_perseguicao(screen):
         layout['title_surf'] = layout['font_title'].render(title_text, True, (255, 215, 0))
         layout['title_shadow'] = layout['font_title'].render(title_text, True, (0, 0, 0))
         
-        # Vignette Cache (Cria uma vez, muda alpha no loop)
-        sirene_top = pygame.Surface((w, 30))
-        sirene_bottom = pygame.Surface((w, 30))
+        # Vignette: uma faixa já colorida por cor (o loop só muda o alpha)
+        layout['sirene'] = {}
+        for cor in SIRENE_CORES:
+            faixa = pygame.Surface((w, 30))
+            faixa.fill(cor)
+            layout['sirene'][cor] = faixa
+
+        # Estrada pré-renderizada
+        layout['road'] = RoadTexture(w, h)
+
+    def resize_assets(surface):
+        nonlocal layout
+        layout = scene_cache.layout("perseguicao", surface.get_size(), build_layout)
 
     resize_assets(screen)
 
-    road_lines = [RoadLine(screen.get_width(), screen.get_height()) for _ in range(25)]
-    shake_amount = 0
+    camera = ScreenShake(edge_color=(10, 10, 20))
 
     # Lógica
     diff_rules = dm.get_rules()
@@ -166,10 +186,11 @@ async def run_perseguicao(screen):
     current_incident_surf = None
     current_buttons = [] # Lista de (rect, texto_original, surface_texto)
     
-    def cache_incident_ui(idx):
-        nonlocal current_incident_surf, current_buttons
-        if idx >= len(incidentes): return
-        
+    # Pré-construção do próximo incidente durante a transição
+    prefetcher = UIPrefetcher()
+
+    def build_incident_ui(idx):
+        """Gera a UI do incidente em etapas (cada yield devolve o controle ao frame)."""
         inc = incidentes[idx]
         w, h = screen.get_size()
         
@@ -193,8 +214,7 @@ async def run_perseguicao(screen):
         # Texto Descrição
         text_rect = pygame.Rect(text_margin, 60, container_w - text_margin*2, temp_h - 70)
         draw_text_wrapped(s, inc["descricao"], layout['font_text'], (200, 255, 200), text_rect)
-        
-        current_incident_surf = s
+        yield
         
         # 2. Prepara Botões (Embaralha e cacheia texto)
         if 'shuffled_opcoes' not in inc:
@@ -203,7 +223,7 @@ async def run_perseguicao(screen):
             # Tenta garantir que a correta não fique sempre no mesmo lugar (simples)
             inc['shuffled_opcoes'] = opts
             
-        current_buttons = []
+        buttons = []
         largura_botao = int(w * 0.40)
         altura_botao = int(h * 0.16)
         espaco = 60
@@ -221,7 +241,15 @@ async def run_perseguicao(screen):
             
             # Rect base (será atualizado na animação)
             r = pygame.Rect(start_x + i * (largura_botao + espaco), y_base, largura_botao, altura_botao)
-            current_buttons.append({"rect": r, "text": txt, "surf": txt_surf})
+            buttons.append({"rect": r, "text": txt, "surf": txt_surf})
+            yield
+
+        return s, buttons
+
+    def cache_incident_ui(idx):
+        nonlocal current_incident_surf, current_buttons
+        if idx >= len(incidentes): return
+        current_incident_surf, current_buttons = prefetcher.take(idx, lambda: build_incident_ui(idx))
 
     # Cache inicial
     if indice < len(incidentes):
@@ -242,6 +270,11 @@ async def run_perseguicao(screen):
 
         # Transição
         if transitioning:
+            # Folga da transição: adianta o próximo incidente
+            if indice + 1 < len(incidentes):
+                next_idx = indice + 1
+                prefetcher.request(next_idx, lambda: build_incident_ui(next_idx))
+                prefetcher.step()
             if time.time() - transition_start_time > 0.6: # 0.6s transição
                 transitioning = False
                 feedback = None
@@ -250,58 +283,49 @@ async def run_perseguicao(screen):
                     cache_incident_ui(indice)
                 start_time = time.time()
         
-        # Shake
-        if shake_amount > 0:
-            shake_amount -= 0.5
-            if shake_amount < 0: shake_amount = 0
-        shake_x = random.randint(-int(shake_amount), int(shake_amount))
-        shake_y = random.randint(-int(shake_amount), int(shake_amount))
+        # Shake (aplicado uma vez no frame composto, antes do flip)
+        camera.update()
         
         # 1. Background
         screen.blit(layout['background'], (0, 0))
         
-        # 2. Road Lines (Direto na tela)
-        for line in road_lines:
-            line.update()
-            line.draw(screen, shake_x, shake_y)
-
-        # 3. Sirene (Vignette) - Ajuste de cor sem criar surface
-        is_red = (frame // 30) % 2 == 0
-        color = (255, 0, 0) if is_red else (0, 0, 255)
-        alpha = int(abs(math.sin(frame * 0.15)) * 120)
-        
-        if sirene_top:
-            sirene_top.fill(color); sirene_top.set_alpha(alpha)
-            sirene_bottom.fill(color); sirene_bottom.set_alpha(alpha)
-            screen.blit(sirene_top, (0,0))
-            screen.blit(sirene_bottom, (0, h-30))
-
-        # 4. Título & Ícones (Com shake)
+        # 2. Estrada (textura rolada pelo tempo)
+        ticks = pygame.time.get_ticks()
+        layout['road'].draw(screen, ticks)
+
+        # 3. Sirene (Vignette) - faixa pré-colorida, só o alpha muda
+        sirene_f = ticks * 0.06  # frames equivalentes a 60 FPS
+        color = SIRENE_CORES[int(sirene_f // 30) % 2]
+        faixa = layout['sirene'][color]
+        faixa.set_alpha(int(abs(math.sin(sirene_f * 0.15)) * 120))
+        screen.blit(faixa, (0, 0))
+        screen.blit(faixa, (0, h - 30))
+
+        # 4. Título & Ícones
         float_y = int(math.sin(frame * 0.05) * 5)
         cx, cy = w // 2, int(h * 0.10) + float_y
         
         # Sombra e Texto
         t_surf = layout['title_surf']
         t_rect = t_surf.get_rect(center=(cx, cy))
-        screen.blit(layout['title_shadow'], (t_rect.x + 3 + shake_x, t_rect.y + 3 + shake_y))
-        screen.blit(t_surf, (t_rect.x + shake_x, t_rect.y + shake_y))
+        screen.blit(layout['title_shadow'], (t_rect.x + 3, t_rect.y + 3))
+        screen.blit(t_surf, t_rect)
 
         # Ícones Cadeado
         if layout['icon_title']:
             ico = layout['icon_title']
             # Brilho simples (blend add do proprio icone)
-            screen.blit(ico, (t_rect.left - ico.get_width() - 20 + shake_x, t_rect.centery - ico.get_height()//2 + shake_y))
-            screen.blit(ico, (t_rect.right + 20 + shake_x, t_rect.centery - ico.get_height()//2 + shake_y))
+            screen.blit(ico, (t_rect.left - ico.get_width() - 20, t_rect.centery - ico.get_height()//2))
+            screen.blit(ico, (t_rect.right + 20, t_rect.centery - ico.get_height()//2))
 
         # 5. UI do Incidente (Cacheada)
         if current_incident_surf:
-            cont_x = 100 + shake_x
-            cont_y = int(h * 0.22) + float_y + shake_y
+            cont_x = 100
+            cont_y = int(h * 0.22) + float_y
             screen.blit(current_incident_surf, (cont_x, cont_y))
             
             # Botões
             mouse_pos = pygame.mouse.get_pos()
-            adj_mouse = (mouse_pos[0] - shake_x, mouse_pos[1] - shake_y)
             
             # Base Y dos botões (recalculada para alinhar com container flutuante)
             # Assumimos que o cache criou botões baseados em um Y fixo, 
@@ -317,8 +341,8 @@ async def run_perseguicao(screen):
                 
                 # Rect real na tela
                 rect = btn_data["rect"].copy()
-                rect.x += offset_anim + shake_x
-                rect.y = btn_base_y + shake_y # Override Y to follow float
+                rect.x += offset_anim
+                rect.y = btn_base_y # Override Y to follow float
                 
                 hover = rect.collidepoint(mouse_pos)
                 
@@ -354,7 +378,7 @@ async def run_perseguicao(screen):
         ratio = t_rest / tempo_base
         bar_w = int((w * 0.8) * ratio)
         bar_x = w * 0.1
-        bar_y = h - 80 + shake_y
+        bar_y = h - 80
         
         col = (0, 255, 0)
         if ratio < 0.5: col = (255, 255, 0)
@@ -366,11 +390,11 @@ async def run_perseguicao(screen):
             
         # Icone Hacker na barra
         h_icon = layout['icon_hacker']
-        screen.blit(h_icon, (bar_x + bar_w - h_icon.get_width()//2 + shake_x, bar_y + 8 - h_icon.get_height()//2 + shake_y))
+        screen.blit(h_icon, (bar_x + bar_w - h_icon.get_width()//2, bar_y + 8 - h_icon.get_height()//2))
         
         # Timer Text
         t_str = layout['font_timer'].render(f"{t_rest:.1f}s", True, (255, 255, 255))
-        screen.blit(t_str, (w//2 - t_str.get_width()//2 + shake_x, bar_y - 30 + shake_y))
+        screen.blit(t_str, (w//2 - t_str.get_width()//2, bar_y - 30))
 
         # Score
         draw_score_display(screen, ScoreManager.get_score(), layout['font_small'], "topright")
@@ -392,8 +416,9 @@ async def run_perseguicao(screen):
             ScoreManager.add_points(pontos_erro)
             feedback = ("TEMPO ESGOTADO", False)
             audio_manager.play_sfx_if_exists("errado")
-            shake_amount = 20
+            camera.shake(20)
 
+        camera.apply(screen)
         pygame.display.flip()
         await asyncio.sleep(0) # Vital
 
@@ -406,6 +431,7 @@ async def run_perseguicao(screen):
                     pygame.display.toggle_fullscreen()
                     screen = pygame.display.get_surface()
                     resize_assets(screen)
+                    prefetcher.clear()
                     cache_incident_ui(indice)
                 elif event.key == pygame.K_ESCAPE:
                     return ScoreManager.get_score()
@@ -413,7 +439,7 @@ async def run_perseguicao(screen):
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not transitioning:
                 # Recalcula rects atuais
                 if current_incident_surf:
-                    # Precisamos reconstruir os rects baseados na posição atual (com float/shake) para o collide
+                    # Precisamos reconstruir os rects baseados na posição atual (com float) para o collide
                     # Mas para simplificar o clique, usamos a posição base Y calculada
                     # Recalculo rápido:
                     cont_h = current_incident_surf.get_height()
@@ -424,8 +450,8 @@ async def run_perseguicao(screen):
                         offset_anim = max(0, (20 - (time.time() - start_time)*40)) * (-1 if i==0 else 1)
                         # Rect temporário para teste de colisão
                         r_test = btn_data["rect"].copy()
-                        r_test.x += offset_anim + shake_x
-                        r_test.y = btn_y_base + shake_y
+                        r_test.x += offset_anim
+                        r_test.y = btn_y_base
                         
                         if r_test.collidepoint(mouse_pos):
                             transitioning = True
@@ -436,12 +462,12 @@ async def run_perseguicao(screen):
                                 ScoreManager.add_points(pontos_acerto)
                                 feedback = ("AMEAÇA BLOQUEADA", True)
                                 audio_manager.play_sfx_if_exists("correto")
-                                shake_amount = 0
+                                camera.stop()
                             else:
                                 ScoreManager.add_points(pontos_erro)
                                 feedback = ("ERRO CRÍTICO", False)
                                 audio_manager.play_sfx_if_exists("errado")
-                                shake_amount = 20
+                                camera.shake(20)
                             break
 
     return ScoreManager.get_score()
\ No newline at end of file
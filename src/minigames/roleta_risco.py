@@ -14,94 +14,31 @@ from src.score_manager import ScoreManager
 # Correção do Import
 from src.audio_manager import audio_manager
 import src.difficulty_manager as dm
+from src.scene_cache import scene_cache
+from src.particles import OrbitEmitter, BurstEmitter, circle_sprites
+from src.performance import particle_budget
+from src.render_cache import blit_overlay, GlowLevels, LazyRotationCache
 
 # ===========================================================
 #        PARTÍCULAS OTIMIZADAS (CACHE)
 # ===========================================================
-class SparkParticle:
-    __slots__ = ('x', 'y', 'vx', 'vy', 'life', 'alpha', 'image', 'rect')
-    
-    def __init__(self, cx, cy):
-        self.x, self.y = cx, cy
-        ang = random.uniform(0, math.pi * 2)
-        vel = random.uniform(3.5, 8.5)
-        self.vx = math.cos(ang) * vel
-        self.vy = math.sin(ang) * vel
-        self.life = random.randint(380, 620)
-        self.alpha = 255
-        
-        # Cria surface uma vez
-        size = random.randint(3, 6)
-        self.image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 60, 60), (size, size), size)
-        self.rect = self.image.get_rect()
+def make_spark_pools():
+    """Faíscas do resultado: pools pré-alocados, sprites do banco de círculos"""
+    # Vermelhas: vida em segundos (update recebe dt em s), atrito por update
+    sparks = BurstEmitter(90, color=(255, 60, 60), radius=(3, 6.99), speed=(3.5, 8.5),
+                          drag=0.96, life=(0.38, 0.62), alpha=206)
+    # Douradas: vida em frames, sobem achatadas em Y
+    gold = BurstEmitter(60, color=(255, 215, 80), radius=(2, 5.99), speed=(1.5, 3.0),
+                        squash_y=0.75, jitter=6, life=(18, 28))
+    return sparks, gold
 
-    def update(self, dt_ms):
-        dt = dt_ms / 1000.0
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.vx *= 0.96
-        self.vy *= 0.96
-        self.life -= dt_ms
-        self.alpha = max(0, int(self.life / 3))
-
-    def draw(self, surf):
-        if self.alpha > 0:
-            self.image.set_alpha(self.alpha)
-            surf.blit(self.image, (int(self.x), int(self.y)))
-
-class SparkGold:
-    __slots__ = ('x', 'y', 'angle', 'speed', 'life', 'alpha', 'image')
-    
-    def __init__(self, x, y):
-        self.x = x + random.uniform(-6, 6)
-        self.y = y + random.uniform(-6, 6)
-        self.angle = random.uniform(0, 2 * math.pi)
-        self.speed = random.uniform(1.5, 3.0)
-        self.life = random.randint(18, 28)
-        self.alpha = 255
-        
-        size = random.randint(2, 5)
-        self.image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 215, 80), (size, size), size)
-
-    def update(self):
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed * 0.75
-        self.life -= 1
-        self.alpha = max(0, int(255 * (self.life / 28.0)))
-
-    def draw(self, screen):
-        if self.life > 0:
-            self.image.set_alpha(self.alpha)
-            screen.blit(self.image, (int(self.x), int(self.y)))
-
-class OrbitSpark:
-    """Fagulhas que orbitam suavemente ao redor da roleta"""
-    __slots__ = ('centro', 'base_raio', 'raio', 'ang', 'vel', 'alpha', 'image')
-    
-    def __init__(self, centro, raio):
-        self.centro = centro
-        self.base_raio = raio + 15
-        self.raio = self.base_raio + random.uniform(-5, 5)
-        self.ang = random.uniform(0, math.pi * 2)
-        self.vel = random.uniform(0.015, 0.025) * (1 if random.random() > 0.5 else -1)
-        self.alpha = random.randint(160, 230)
-        
-        size = random.randint(2, 4)
-        self.image = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 255, 160), (size, size), size)
+ORBITA_MARGEM = 15  # Distância das fagulhas até a borda da roleta
 
-    def update(self):
-        self.ang += self.vel
-        if self.ang > math.pi * 2: self.ang -= math.pi * 2
-        if self.ang < 0: self.ang += math.pi * 2
 
-    def draw(self, screen):
-        x = self.centro[0] + math.cos(self.ang) * self.raio
-        y = self.centro[1] + math.sin(self.ang) * self.raio
-        self.image.set_alpha(self.alpha)
-        screen.blit(self.image, (int(x), int(y)))
+def make_orbit_sparks(centro, raio):
+    """Fagulhas que orbitam suavemente ao redor da roleta (emissor vetorizado)"""
+    sprites = circle_sprites((2, 3, 4), [(255, 255, 160)], (160, 195, 230))
+    return OrbitEmitter(centro, raio + ORBITA_MARGEM, 16, sprites, vel=(0.015, 0.025), jitter=5)
 
 # ===========================================================
 #        VISUAL OTIMIZADO: BACKLIGHT CACHEADO
@@ -118,9 +55,100 @@ def create_glow_surface(radius, color):
     pygame.draw.circle(s, (*color, 200), center, int(radius * 1.1)) # Interno
     return s
 
+# ===========================================================
+#        ROLETA PRÉ-RENDERIZADA (FATIAS + TEXTOS)
+# ===========================================================
+def build_wheel_surface(eventos, raio):
+    """Desenha a roleta inteira (ângulo 0) uma única vez; o giro só rotaciona."""
+    size = int(raio * 2) + 4
+    s = pygame.Surface((size, size), pygame.SRCALPHA)
+    centro = (size / 2, size / 2)
+    angulo_por_setor = 360.0 / len(eventos)
+    pygame.draw.circle(s, (0, 0, 0), centro, raio)
+
+    for i, ev in enumerate(eventos):
+        a_i = math.radians(i * angulo_por_setor)
+        a_f = math.radians((i + 1) * angulo_por_setor)
+
+        p2 = (centro[0] + raio * math.cos(a_i), centro[1] + raio * math.sin(a_i))
+        p3 = (centro[0] + raio * math.cos(a_f), centro[1] + raio * math.sin(a_f))
+
+        pygame.draw.polygon(s, ev["cor"], [centro, p2, p3])
+        pygame.draw.polygon(s, (0, 0, 0), [centro, p2, p3], 2)
+
+        # Textos (palavras cacheadas no resize)
+        ang_txt = math.radians(i * angulo_por_setor + angulo_por_setor / 2)
+        dist_txt = raio * 0.68
+
+        words = ev["cached_words"]
+        shadows = ev["cached_shadows"]
+
+        for idx, word_surf in enumerate(words):
+            offset = (idx - len(words)/2) * 18
+            tx = centro[0] + math.cos(ang_txt) * (dist_txt - offset)
+            ty = centro[1] + math.sin(ang_txt) * (dist_txt - offset)
+
+            shad = shadows[idx]
+            s.blit(shad, (tx - shad.get_width()//2 + 1, ty - shad.get_height()//2 + 1))
+            s.blit(word_surf, (tx - word_surf.get_width()//2, ty - word_surf.get_height()//2))
+
+    # Centro
+    pygame.draw.circle(s, (30, 30, 30), centro, int(raio * 0.15))
+    pygame.draw.circle(s, (255, 215, 0), centro, int(raio * 0.15), 4)
+    return s
+
+# ===========================================================
+#        GIRO ANALÍTICO (INDEPENDENTE DO FPS)
+# ===========================================================
+class SpinSolver:
+    """
+    Reproduz o giro original (velocidade em graus por frame a 60 FPS,
+    multiplicada por FRICTION a cada frame até ficar abaixo de STOP_SPEED),
+    mas calculado no clique: ângulo final, setor sorteado e duração são
+    conhecidos de antemão e a animação segue o tempo decorrido.
+    """
+    FRICTION = 0.991
+    STOP_SPEED = 0.1
+    REF_FPS = 60
+    TENSION_MS = 1500
+
+    def __init__(self, start_angle, speed, num_setores):
+        self.start_angle = start_angle
+        self.speed = speed
+        f = self.FRICTION
+        # Frames até a velocidade cair abaixo do limite (mesma regra do loop antigo)
+        frames = max(1, math.ceil(math.log(self.STOP_SPEED / speed) / math.log(f)))
+        self.spin_ms = frames * 1000.0 / self.REF_FPS
+        self.total_ms = self.spin_ms + self.TENSION_MS
+        self._decay_end = 1.0 - f ** frames
+        self.travel = speed * self._decay_end / (1.0 - f)
+        self.final_angle = start_angle + self.travel
+        self.sector = int(((270 - self.final_angle) % 360) // (360.0 / num_setores))
+
+    def angle_at(self, ms):
+        """Ângulo no instante `ms` (desde o clique), pela curva de desaceleração."""
+        if ms >= self.spin_ms:
+            return self.final_angle
+        decay = 1.0 - self.FRICTION ** (max(0.0, ms) * self.REF_FPS / 1000.0)
+        return self.start_angle + self.travel * decay / self._decay_end
+
+    def speed_at(self, ms):
+        """Velocidade equivalente em graus por frame de 60 FPS."""
+        if ms >= self.spin_ms:
+            return 0.0
+        return self.speed * self.FRICTION ** (max(0.0, ms) * self.REF_FPS / 1000.0)
+
+    def spinning(self, ms):
+        return ms < self.spin_ms
+
+    def done(self, ms):
+        """Giro e fase de tensão concluídos."""
+        return ms >= self.total_ms
+
 # ===========================================================
 #        FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
+@particle_budget.scene
 async def roleta_risco(screen):
     pygame.display.set_caption("Roleta do Risco - Rodada Bônus")
     clock = pygame.time.Clock()
@@ -132,7 +160,7 @@ async def roleta_risco(screen):
     perigo_icon_path = os.path.join(assets_dir, "icons", "perigo.png")
     seta_path = os.path.join(assets_dir, "icons", "seta.png")
 
-    bg_original = pygame.image.load(bg_path).convert() if os.path.exists(bg_path) else None
+    bg_original = scene_cache.image(bg_path)
 
     # Configuração
     diff = dm.get_difficulty()
@@ -170,19 +198,31 @@ async def roleta_risco(screen):
     velocidade = 0.0
     girando = False
     is_tension_phase = False
-    tension_start_time = 0
+    spin = None
+    spin_start = 0
     resultado = None
     
     pontos_desta_fase = 0
-    sparks = []; gold_sparks = []
-    orbit_sparks = [] 
+    sparks, gold_sparks = make_spark_pools()
+    orbit_sparks = None
     result_fade_alpha = 0
     
     layout = {}
 
     # === RESIZE E PRE-RENDER ===
     def resize_layout(surface):
-        w, h = surface.get_size()
+        nonlocal layout, orbit_sparks
+        layout = scene_cache.layout("roleta_risco", surface.get_size(), build_layout)
+
+        # O emissor é por partida (conta no orçamento de partículas): no F11
+        # só muda de lugar, em vez de registrar outro a cada troca de tela
+        if orbit_sparks is None:
+            orbit_sparks = make_orbit_sparks(layout['centro'], layout['raio'])
+        else:
+            orbit_sparks.set_center(layout['centro'], layout['raio'] + ORBITA_MARGEM)
+
+    def build_layout(layout, size):
+        w, h = size
         
         if bg_original:
             layout['bg'] = pygame.transform.scale(bg_original, (w, h))
@@ -200,20 +240,16 @@ async def roleta_risco(screen):
         layout['centro'] = (w // 2, int(h * 0.55)) 
         layout['raio'] = min(w, h) // 3.2
 
-        # Partículas
-        nonlocal orbit_sparks
-        orbit_sparks = [OrbitSpark(layout['centro'], layout['raio']) for _ in range(16)]
-
         # Ícones
         icon_size = int(h * 0.11)
-        if os.path.exists(perigo_icon_path):
-            img = pygame.image.load(perigo_icon_path).convert_alpha()
+        img = scene_cache.image(perigo_icon_path, alpha=True)
+        if img:
             layout['icon_warning'] = pygame.transform.smoothscale(img, (icon_size, icon_size))
         else:
             layout['icon_warning'] = None
 
-        if os.path.exists(seta_path):
-            img = pygame.image.load(seta_path).convert_alpha()
+        img = scene_cache.image(seta_path, alpha=True)
+        if img:
             layout['seta_indicador'] = pygame.transform.smoothscale(img, (int(h*0.06), int(h*0.08)))
             layout['seta_rect'] = layout['seta_indicador'].get_rect(midbottom=(layout['centro'][0], layout['centro'][1] - layout['raio']))
         else:
@@ -227,9 +263,12 @@ async def roleta_risco(screen):
             ev["cached_words"] = [layout['font_roleta'].render(word, True, (255, 255, 255)) for word in words]
             ev["cached_shadows"] = [layout['font_roleta'].render(word, True, (0, 0, 0)) for word in words]
 
-        # Cache dos Glows de Fundo
-        layout['glow_rosa'] = create_glow_surface(layout['raio'], COLOR_ROSA)
-        layout['glow_azul'] = create_glow_surface(layout['raio'], COLOR_AZUL)
+        # Roleta completa em uma surface + rotações cacheadas
+        layout['wheel'] = LazyRotationCache(build_wheel_surface(eventos, layout['raio']))
+
+        # Cache dos Glows de Fundo (níveis de intensidade pré-calculados)
+        layout['glow_rosa'] = GlowLevels(create_glow_surface(layout['raio'], COLOR_ROSA))
+        layout['glow_azul'] = GlowLevels(create_glow_surface(layout['raio'], COLOR_AZUL))
 
         btn_w, btn_h = int(w * 0.3), int(h * 0.1)
         layout['btn_girar'] = pygame.Rect((w - btn_w)//2, int(h * 0.85), btn_w, btn_h)
@@ -249,6 +288,14 @@ async def roleta_risco(screen):
         W, H = screen.get_size()
         current_ticks = pygame.time.get_ticks()
 
+        # Estado do giro derivado do tempo desde o clique (não do número de frames)
+        if spin:
+            spin_ms = current_ticks - spin_start
+            angulo_atual = spin.angle_at(spin_ms)
+            velocidade = spin.speed_at(spin_ms)
+            girando = spin.spinning(spin_ms)
+            is_tension_phase = not girando and not spin.done(spin_ms)
+
         # 1. Background
         screen.blit(layout['bg'], (0, 0))
         
@@ -269,58 +316,32 @@ async def roleta_risco(screen):
 
         # 3. Backlight Neon (Otimizado)
         color_phase = (current_ticks // 600) % 2
-        glow_surf = layout['glow_rosa'] if color_phase == 0 else layout['glow_azul']
+        glow = layout['glow_rosa'] if color_phase == 0 else layout['glow_azul']
         
         pulse = (math.sin(current_ticks * 0.005) + 1) / 2
         alpha_glow = int(40 + pulse * 140)
         
-        # Blit com alpha variavel (mais rápido que redesenhar)
-        glow_surf.set_alpha(alpha_glow)
-        gx = layout['centro'][0] - glow_surf.get_width()//2
-        gy = layout['centro'][1] - glow_surf.get_height()//2
-        screen.blit(glow_surf, (gx, gy), special_flags=pygame.BLEND_RGBA_ADD)
+        # O pulso só escolhe o nível pré-calculado (blit opaco aditivo)
+        glow.blit_centered(screen, layout['centro'], alpha_glow)
 
-        # 4. Desenha Roleta
+        # 4. Desenha Roleta (1 blit: quadro rotacionado do cache)
         centro = layout['centro']; raio = layout['raio']
-        pygame.draw.circle(screen, (0,0,0), centro, raio)
-
-        # Desenho vetorial das fatias (polígonos são rápidos)
-        for i, ev in enumerate(eventos):
-            a_i = math.radians(i * angulo_por_setor + angulo_atual)
-            a_f = math.radians((i + 1) * angulo_por_setor + angulo_atual)
-            
-            p2 = (centro[0] + raio * math.cos(a_i), centro[1] + raio * math.sin(a_i))
-            p3 = (centro[0] + raio * math.cos(a_f), centro[1] + raio * math.sin(a_f))
-            
-            pygame.draw.polygon(screen, ev["cor"], [centro, p2, p3])
-            pygame.draw.polygon(screen, (0, 0, 0), [centro, p2, p3], 2)
-
-            # Texto (Usando Cache)
-            ang_txt = math.radians(i * angulo_por_setor + angulo_atual + angulo_por_setor / 2)
-            dist_txt = raio * 0.68
-            
-            words = ev["cached_words"]
-            shadows = ev["cached_shadows"]
-            
-            for idx, word_surf in enumerate(words):
-                offset = (idx - len(words)/2) * 18
-                tx = centro[0] + math.cos(ang_txt) * (dist_txt - offset)
-                ty = centro[1] + math.sin(ang_txt) * (dist_txt - offset)
-                
-                # Sombra
-                shad = shadows[idx]
-                screen.blit(shad, (tx - shad.get_width()//2 + 1, ty - shad.get_height()//2 + 1))
-                # Texto
-                screen.blit(word_surf, (tx - word_surf.get_width()//2, ty - word_surf.get_height()//2))
-
-        # Centro
-        pygame.draw.circle(screen, (30, 30, 30), centro, int(raio * 0.15))
-        pygame.draw.circle(screen, (255, 215, 0), centro, int(raio * 0.15), 4)
+        wheel = layout['wheel']
+        # pygame gira no sentido anti-horário; a roleta gira no horário da tela
+        if girando and abs(velocidade) >= wheel.step_deg:
+            wheel.blit_centered(screen, centro, -angulo_atual)
+        elif girando:
+            # Giro lento: passos de 1° (só gira de novo quando o grau muda)
+            wheel.blit_centered(screen, centro, -round(angulo_atual), exact=True)
+        else:
+            # Parada: ângulo exato; a folga adianta os quadros do próximo giro
+            wheel.blit_centered(screen, centro, -angulo_atual, exact=True)
+            if resultado is None and not is_tension_phase:
+                wheel.warm()
 
         # Orbit Sparks
-        for ospark in orbit_sparks:
-            ospark.update()
-            ospark.draw(screen)
+        orbit_sparks.update()
+        orbit_sparks.draw(screen)
 
         # Seta
         if layout['seta_indicador']:
@@ -329,21 +350,10 @@ async def roleta_risco(screen):
             pygame.draw.polygon(screen, (255, 255, 0), layout['indicador_poly'])
             pygame.draw.polygon(screen, (0, 0, 0), layout['indicador_poly'], 2)
 
-        # Lógica de Giro
-        if girando:
-            angulo_atual += velocidade
-            velocidade *= 0.991 
-            if abs(velocidade) < 0.1:
-                girando = False
-                is_tension_phase = True
-                tension_start_time = current_ticks
-
-        # Fase de Tensão
-        if is_tension_phase:
-            if current_ticks - tension_start_time > 1500:
-                is_tension_phase = False
-                
-                idx = int(((270 - angulo_atual) % 360) // angulo_por_setor)
+        # Fim do giro + tensão: o setor já foi calculado no clique
+        if spin and resultado is None:
+            if spin.done(spin_ms):
+                idx = spin.sector
                 resultado = eventos[idx]
                 pontos_desta_fase = resultado["efeito"]
                 ScoreManager.add_points(pontos_desta_fase)
@@ -357,10 +367,10 @@ async def roleta_risco(screen):
                 
                 if resultado["efeito"] < 0:
                     audio_manager.play_sfx_if_exists("errado")
-                    for _ in range(30): sparks.append(SparkParticle(sx, sy))
+                    sparks.emit(sx, sy, particle_budget.burst("roleta_sparks", 30))
                 else:
                     audio_manager.play_sfx_if_exists("correto")
-                    for _ in range(20): gold_sparks.append(SparkGold(sx, sy))
+                    gold_sparks.emit(sx, sy, particle_budget.burst("roleta_gold", 20))
                 
                 # --- GERA A SURFACE DO RESULTADO AGORA ---
                 # Isso evita lag durante a animação de fade
@@ -387,12 +397,10 @@ async def roleta_risco(screen):
                 result_surface_cache = res_surf
 
         # Partículas Resultado
-        if sparks:
-            for s in sparks[:]: s.update(dt_ms); s.draw(screen); 
-            if s.life <= 0: sparks.remove(s)
-        if gold_sparks:
-            for g in gold_sparks[:]: g.update(); g.draw(screen); 
-            if g.life <= 0: gold_sparks.remove(g)
+        sparks.update(dt)
+        sparks.draw(screen)
+        gold_sparks.update()
+        gold_sparks.draw(screen)
 
         # Botão Girar
         if not girando and not is_tension_phase and resultado is None:
@@ -409,9 +417,7 @@ async def roleta_risco(screen):
             result_fade_alpha = min(255, result_fade_alpha + 15)
             
             # Overlay escuro
-            overlay = pygame.Surface((W, H), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, int(result_fade_alpha * 0.7)))
-            screen.blit(overlay, (0,0))
+            blit_overlay(screen, (0, 0, 0), result_fade_alpha * 0.7)
             
             # Blit do Resultado Cacheado
             cx = (W - result_surface_cache.get_width()) // 2
@@ -452,7 +458,8 @@ async def roleta_risco(screen):
                         # Verifica clique no botão
                         if layout['btn_girar'].collidepoint(e.pos):
                             audio_manager.play_sfx_if_exists("roleta") 
-                            velocidade = random.uniform(22.0, 28.0)
+                            spin = SpinSolver(angulo_atual, random.uniform(22.0, 28.0), num_setores)
+                            spin_start = pygame.time.get_ticks()
                             girando = True
 
         pygame.display.flip()
@@ -15,6 +15,11 @@ from src.utils import draw_text_wrapped, draw_score_display, load_font, show_pau
 from src.score_manager import ScoreManager
 from src.audio_manager import audio_manager
 import src.difficulty_manager as dm
+from src.performance import UIPrefetcher, particle_budget
+from src.particles import ParticleEmitter, BurstEmitter, scaled_sprites, alpha_sprites
+from src.render_cache import blit_overlay, ButtonSkin
+from src.scene_cache import scene_cache
+from src.camera import ScreenShake
 
 # ===========================================================
 #            BANCO DE PERGUNTAS (MANTIDO)
@@ -139,91 +144,22 @@ ALL_QUESTIONS = {
 # ===========================================================
 #        SISTEMA DE PARTÍCULAS OTIMIZADO (CACHE)
 # ===========================================================
-class MoneyParticle:
-    """Partículas financeiras que flutuam no fundo"""
-    __slots__ = ('x', 'y', 'speed', 'rotation', 'rot_speed', 'image', 'rect', 'w', 'h')
-
-    def __init__(self, w, h, font):
-        self.w, self.h = w, h
-        # OTIMIZAÇÃO: Cria a surface UMA VEZ
-        color = random.choice([
-            (255, 215, 0), (0, 255, 0), (0, 255, 255), (180, 180, 180)
-        ])
-        base_surf = font.render("$", True, color)
-        
-        # Escala aleatória fixa na criação
-        scale = random.uniform(0.5, 1.2)
-        nw = int(base_surf.get_width() * scale)
-        nh = int(base_surf.get_height() * scale)
-        if nw > 0 and nh > 0:
-            self.image = pygame.transform.smoothscale(base_surf, (nw, nh))
-        else:
-            self.image = base_surf
-            
-        # Define alpha base
-        self.image.set_alpha(random.randint(50, 150))
-        
-        self.reset(first_time=True)
-
-    def reset(self, first_time=False):
-        self.x = random.randint(20, self.w - 20)
-        if first_time:
-            self.y = random.randint(0, self.h)
-        else:
-            self.y = random.randint(self.h, self.h + 100)
-        
-        self.speed = random.uniform(0.5, 2.5)
-        # Removida rotação contínua (pesada na web) para apenas visual estático ou leve
-        # Para performance máxima, não rotacionamos a cada frame.
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+def make_money_particles(w, h, font):
+    """Cifrões financeiros subindo no fundo (emissor vetorizado, sprites criados uma vez)."""
+    colors = [(255, 215, 0), (0, 255, 0), (0, 255, 255), (180, 180, 180)]
+    bases = [font.render("$", True, c) for c in colors]
+    return ParticleEmitter(
+        w, h, 25, scaled_sprites(bases, (0.5, 0.75, 1.0, 1.2), (50, 100, 150)),
+        vy=(-2.5, -0.5), flow="up", respawn=(0, 100), margin=50, x_pad=20,
+    )
 
-    def update(self, dt):
-        self.y -= self.speed * dt
-        if self.y < -50:
-            self.reset()
-        self.rect.center = (int(self.x), int(self.y))
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
-
-
-class ExplosionParticle:
-    """Partículas simples de explosão"""
-    __slots__ = ('x', 'y', 'vx', 'vy', 'life', 'decay', 'image')
-    
-    def __init__(self, x, y, font):
-        self.x, self.y = x, y
-        
-        # Física
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(3, 9)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        
-        self.life = 255
-        self.decay = random.uniform(8, 15) # Decaimento mais rápido para limpar memória
-        
-        # Renderiza uma vez
-        color = random.choice([(255, 215, 0), (50, 255, 50), (255, 255, 200)])
-        base = font.render("$", True, color)
-        size = random.uniform(0.4, 0.7)
-        w = int(base.get_width() * size)
-        h = int(base.get_height() * size)
-        if w > 0 and h > 0:
-            self.image = pygame.transform.scale(base, (w, h))
-        else:
-            self.image = base
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.2 # gravidade
-        self.life -= self.decay
-
-    def draw(self, screen):
-        if self.life > 0:
-            self.image.set_alpha(int(max(0, self.life)))
-            screen.blit(self.image, (int(self.x), int(self.y)))
+def make_explosion_pool(font):
+    """Explosão de cifrões no clique: pool pré-alocado, glifos renderizados uma vez"""
+    bases = [font.render("$", True, c) for c in [(255, 215, 0), (50, 255, 50), (255, 255, 200)]]
+    # Vida em frames: 255 / decaimento (8 a 15 por frame)
+    return BurstEmitter(80, sprites=alpha_sprites(bases, (0.4, 0.55, 0.7)),
+                        speed=(3, 9), gravity=0.2, life=(17, 32))
 
 
 # ===========================================================
@@ -231,56 +167,48 @@ class ExplosionParticle:
 # ===========================================================
 
 class CyberButton:
-    """Botão que renderiza seu estado normal e hover APENAS na criação"""
+    """Botão que renderiza todos os seus estados APENAS na criação"""
+    # estado: (fundo, borda, espessura, cor do texto)
+    STYLES = {
+        "normal": ((30, 30, 60, 180), (100, 100, 140), 2, (200, 200, 220)),
+        "hover": ((255, 215, 0, 80), (255, 255, 100), 3, (255, 255, 255)),
+        "correct": ((0, 180, 0, 180), (255, 255, 255), 2, (255, 255, 255)),
+        "wrong": ((180, 0, 0, 180), (255, 255, 255), 2, (255, 255, 255)),
+    }
+
     def __init__(self, rect, text, font):
         self.rect = rect
         self.text = text
+        self.font = font
         self.is_hover = False
-        
-        # 1. Pré-renderiza estado NORMAL
-        self.surf_normal = self._create_surface((30, 30, 60, 180), (100, 100, 140), (200, 200, 220), font, False)
-        
-        # 2. Pré-renderiza estado HOVER
-        self.surf_hover = self._create_surface((255, 215, 0, 80), (255, 255, 100), (255, 255, 255), font, True)
-        
-        # 3. Pré-renderiza estados de FEEDBACK (Verde/Vermelho) - Opcional, criado sob demanda ou aqui
-        self.surf_correct = self._create_surface((0, 180, 0, 180), (255, 255, 255), (255, 255, 255), font, False)
-        self.surf_wrong = self._create_surface((180, 0, 0, 180), (255, 255, 255), (255, 255, 255), font, False)
+        self.skin = ButtonSkin(rect.size, {k: v[:3] for k, v in self.STYLES.items()},
+                               radius=10, content=self._draw_content)
 
-    def _create_surface(self, bg_color, border_color, text_color, font, is_hover):
-        s = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        
-        # Fundo
-        pygame.draw.rect(s, bg_color, s.get_rect(), border_radius=10)
-        # Borda
-        pygame.draw.rect(s, border_color, s.get_rect(), 2 if not is_hover else 3, border_radius=10)
-        
+    def _draw_content(self, s, r, state):
         # Decor
-        hex_color = (255, 215, 0) if is_hover else (80, 80, 100)
-        pygame.draw.circle(s, hex_color, (25, self.rect.height//2), 6)
+        hex_color = (255, 215, 0) if state == "hover" else (80, 80, 100)
+        pygame.draw.circle(s, hex_color, (25, r.height//2), 6)
         
         # Texto
-        txt = font.render(self.text, True, text_color)
+        txt = self.font.render(self.text, True, self.STYLES[state][3])
         # Ajuste de tamanho se for muito grande
-        max_w = self.rect.width - 60
+        max_w = r.width - 60
         if txt.get_width() > max_w:
             scale = max_w / txt.get_width()
             txt = pygame.transform.smoothscale(txt, (int(txt.get_width()*scale), int(txt.get_height()*scale)))
         
-        text_rect = txt.get_rect(midleft=(50, self.rect.height//2))
+        text_rect = txt.get_rect(midleft=(50, r.height//2))
         s.blit(txt, text_rect)
-        return s
 
     def draw(self, screen, feedback_state=None):
         # 0 = Normal, 1 = Correto, 2 = Errado
         if feedback_state == 1:
-            screen.blit(self.surf_correct, self.rect)
+            state = "correct"
         elif feedback_state == 2:
-            screen.blit(self.surf_wrong, self.rect)
-        elif self.is_hover:
-            screen.blit(self.surf_hover, self.rect)
+            state = "wrong"
         else:
-            screen.blit(self.surf_normal, self.rect)
+            state = "hover" if self.is_hover else "normal"
+        screen.blit(self.skin.get(state), self.rect)
             
     def check_hover(self, pos):
         self.is_hover = self.rect.collidepoint(pos)
@@ -324,9 +252,43 @@ def create_cached_container(rect, question_idx, total, text, font_q):
     
     return s
 
+
+PANEL_KEY = (255, 0, 255)  # Colorkey dos cantos do painel de feedback
+
+
+def create_feedback_panel(screen_size, correto, msg, font_res, font_msg):
+    """
+    Monta o painel de feedback (caixa, título e explicação já quebrada) uma
+    vez por resposta. Surface opaca com colorkey nos cantos arredondados,
+    para o fade ser só set_alpha.
+    """
+    w, h = screen_size
+    rect = pygame.Rect(0, 0, w*0.6, h*0.4)
+    rect.center = (w//2, h//2)
+
+    s = pygame.Surface(rect.size)
+    s.fill(PANEL_KEY)
+    s.set_colorkey(PANEL_KEY, pygame.RLEACCEL)
+    r = s.get_rect()
+
+    color = (50, 255, 50) if correto else (255, 50, 50)
+    pygame.draw.rect(s, (20, 20, 30), r, border_radius=20)
+    pygame.draw.rect(s, color, r, 3, border_radius=20)
+
+    res_txt = "EXCELENTE!" if correto else "ERROU!"
+    t_res = font_res.render(res_txt, True, color)
+    s.blit(t_res, t_res.get_rect(center=(r.centerx, 50)))
+
+    # Texto explicativo
+    reason_area = r.inflate(-40, -100)
+    reason_area.top += 60
+    draw_text_wrapped(s, msg, font_msg, (220, 220, 220), reason_area)
+    return s, rect
+
 # ===========================================================
 #               FUNÇÃO PRINCIPAL DO MINIGAME (ASYNC)
 # ===========================================================
+@particle_budget.scene
 async def run_show_do_bilhao(screen):
     pygame.display.set_caption("Show do Bilhão - Cyber Edition")
     clock = pygame.time.Clock()
@@ -337,18 +299,13 @@ async def run_show_do_bilhao(screen):
     bg_path = os.path.join(assets, "background", "background_show_do_bilhao.jpg") 
     icon_path = os.path.join(assets, "icons", "money.png")
     
-    # Carrega imagens brutas
-    bg_original = None
-    if os.path.exists(bg_path):
-        bg_original = pygame.image.load(bg_path).convert()
-    
-    icon_original = None
-    if os.path.exists(icon_path):
-        icon_original = pygame.image.load(icon_path).convert_alpha()
+    # Carrega imagens brutas (lidas do disco só na primeira partida)
+    bg_original = scene_cache.image(bg_path)
+    icon_original = scene_cache.image(icon_path, alpha=True)
 
     # === RESIZE & CACHE ===
-    def resize_assets(surface):
-        w, h = surface.get_size()
+    def build_layout(layout, size):
+        w, h = size
         
         # Background Cache
         if bg_original:
@@ -381,10 +338,14 @@ async def run_show_do_bilhao(screen):
         else:
             layout['icon'] = None
 
+    def resize_assets(surface):
+        nonlocal layout
+        layout = scene_cache.layout("show_do_bilhao", surface.get_size(), build_layout)
+
     resize_assets(screen)
     
-    bg_particles = [MoneyParticle(screen.get_width(), screen.get_height(), layout['font_particle']) for _ in range(25)]
-    explosion_particles = []
+    bg_particles = make_money_particles(screen.get_width(), screen.get_height(), layout['font_particle'])
+    explosions = make_explosion_pool(layout['font_particle'])
 
     # Configuração de Jogo
     diff_rules = dm.get_rules()
@@ -409,15 +370,20 @@ async def run_show_do_bilhao(screen):
     pergunta_idx = 0
     feedback = None
     FEEDBACK_DURATION = 2500
-    shake_amount = 0
+    FEEDBACK_FADE_MS = 200
+    camera = ScreenShake(edge_color=(10, 10, 20))
 
     # Estado da Interface (Cache da pergunta atual)
     current_container_surf = None
     current_container_rect = None
+    current_header_lbl = None
     current_buttons = []
 
-    def setup_question_ui(idx):
-        nonlocal current_container_surf, current_container_rect, current_buttons
+    # Pré-construção da próxima pergunta durante o feedback
+    prefetcher = UIPrefetcher()
+
+    def build_question_ui(idx):
+        """Gera a UI da pergunta em etapas (cada yield devolve o controle ao frame)."""
         w, h = screen.get_size()
         p = perguntas[idx]
         
@@ -426,25 +392,39 @@ async def run_show_do_bilhao(screen):
         c_height = h * 0.22
         c_x = (w - c_width) // 2
         c_y = (layout['title_rect'].bottom + 60)
-        current_container_rect = pygame.Rect(c_x, c_y, c_width, c_height)
+        container_rect = pygame.Rect(c_x, c_y, c_width, c_height)
         
-        current_container_surf = create_cached_container(
-            current_container_rect, idx + 1, len(perguntas), 
+        container_surf = create_cached_container(
+            container_rect, idx + 1, len(perguntas), 
             p["pergunta"], layout['font_pergunta']
         )
+        header_lbl = layout['font_ui'].render(f"PERGUNTA {idx+1}/{len(perguntas)}", True, (10,10,10))
+        yield
         
         # 2. Botões
-        current_buttons = []
-        btn_start_y = current_container_rect.bottom + int(H * 0.03)
+        buttons = []
+        btn_start_y = container_rect.bottom + int(h * 0.03)
         btn_h = max(50, int(h * 0.10))
-        btn_spacing = max(10, int(H * 0.02))
+        btn_spacing = max(10, int(h * 0.02))
         btn_w = w * 0.7
         btn_x = (w - btn_w) // 2
         
         for i, txt in enumerate(p["opcoes_embaralhadas"]):
             r = pygame.Rect(btn_x, btn_start_y + i * (btn_h + btn_spacing), btn_w, btn_h)
-            btn = CyberButton(r, txt, layout['font_opcao'])
-            current_buttons.append(btn)
+            buttons.append(CyberButton(r, txt, layout['font_opcao']))
+            yield
+
+        return {"container_surf": container_surf, "container_rect": container_rect,
+                "header_lbl": header_lbl, "buttons": buttons}
+
+    def setup_question_ui(idx):
+        nonlocal current_container_surf, current_container_rect, current_header_lbl, current_buttons
+        # Se o prefetch já terminou, trocar de pergunta é só trocar as surfaces
+        ui = prefetcher.take(idx, lambda: build_question_ui(idx))
+        current_container_surf = ui["container_surf"]
+        current_container_rect = ui["container_rect"]
+        current_header_lbl = ui["header_lbl"]
+        current_buttons = ui["buttons"]
 
     # Inicia primeira pergunta
     setup_question_ui(0)
@@ -454,20 +434,15 @@ async def run_show_do_bilhao(screen):
         # WEB: Use dt fixo ou capado para evitar física explodindo
         dt = clock.tick(60) / 16.0
         
-        # Shake Logic
-        shake_x, shake_y = 0, 0
-        if shake_amount > 0:
-            shake_amount -= 0.5
-            shake_x = random.randint(-int(shake_amount), int(shake_amount))
-            shake_y = random.randint(-int(shake_amount), int(shake_amount))
+        # Shake: a cena é desenhada em repouso e deslocada no final
+        camera.update()
 
         # 1. Background (Blit simples é rápido)
-        screen.blit(layout['background'], (shake_x, shake_y))
+        screen.blit(layout['background'], (0, 0))
         
         # 2. Partículas
-        for p in bg_particles:
-            p.update(dt)
-            p.draw(screen)
+        bg_particles.update(dt)
+        bg_particles.draw(screen)
 
         if pergunta_idx >= len(perguntas):
             audio_manager.play_sfx_if_exists("roleta")
@@ -475,13 +450,13 @@ async def run_show_do_bilhao(screen):
             return 0
 
         # 3. UI Estática (Título, Ícones)
-        screen.blit(layout['title_surf'], (layout['title_rect'].x + shake_x, layout['title_rect'].y + shake_y))
+        screen.blit(layout['title_surf'], layout['title_rect'])
         
         if layout['icon']:
             # Desenha ícones ao lado do título
             icon = layout['icon']
-            il_pos = (layout['title_rect'].left - icon.get_width() - 20 + shake_x, layout['title_rect'].centery - icon.get_height()//2 + shake_y)
-            ir_pos = (layout['title_rect'].right + 20 + shake_x, layout['title_rect'].centery - icon.get_height()//2 + shake_y)
+            il_pos = (layout['title_rect'].left - icon.get_width() - 20, layout['title_rect'].centery - icon.get_height()//2)
+            ir_pos = (layout['title_rect'].right + 20, layout['title_rect'].centery - icon.get_height()//2)
             screen.blit(icon, il_pos)
             screen.blit(icon, ir_pos)
 
@@ -490,13 +465,12 @@ async def run_show_do_bilhao(screen):
 
         # 5. Pergunta (Container Cacheado)
         # Header "PERGUNTA X/Y" (desenhado aqui pois precisa de posição absoluta)
-        head_rect = pygame.Rect(current_container_rect.left + shake_x, current_container_rect.top - 30 + shake_y, 160, 30)
+        head_rect = pygame.Rect(current_container_rect.left, current_container_rect.top - 30, 160, 30)
         pygame.draw.rect(screen, (255, 215, 0), head_rect, border_top_left_radius=5, border_top_right_radius=15)
-        lbl = layout['font_ui'].render(f"PERGUNTA {pergunta_idx+1}/{len(perguntas)}", True, (10,10,10))
-        screen.blit(lbl, (head_rect.x + 10, head_rect.y + 5))
+        screen.blit(current_header_lbl, (head_rect.x + 10, head_rect.y + 5))
         
         # Blit Container
-        screen.blit(current_container_surf, (current_container_rect.x + shake_x, current_container_rect.y + shake_y))
+        screen.blit(current_container_surf, current_container_rect)
 
         # 6. Botões
         mouse_pos = pygame.mouse.get_pos()
@@ -516,40 +490,32 @@ async def run_show_do_bilhao(screen):
             btn.draw(screen, fb_state)
 
         # 7. Explosões
-        for ep in explosion_particles[:]:
-            ep.update()
-            ep.draw(screen)
-            if ep.life <= 0:
-                explosion_particles.remove(ep)
+        explosions.update()
+        explosions.draw(screen)
 
         # 8. Feedback Overlay
         if feedback:
-            # Overlay escuro
-            overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0,0))
-            
-            w, h = screen.get_size()
-            msg_rect = pygame.Rect(0, 0, w*0.6, h*0.4)
-            msg_rect.center = (w//2, h//2)
-            
-            color = (50, 255, 50) if feedback["correto"] else (255, 50, 50)
-            pygame.draw.rect(screen, (20, 20, 30), msg_rect, border_radius=20)
-            pygame.draw.rect(screen, color, msg_rect, 3, border_radius=20)
-            
-            res_txt = "EXCELENTE!" if feedback["correto"] else "ERROU!"
-            t_res = layout['font_titulo'].render(res_txt, True, color)
-            screen.blit(t_res, t_res.get_rect(center=(w//2, msg_rect.top + 50)))
-            
-            # Texto explicativo
-            reason_area = msg_rect.inflate(-40, -100)
-            reason_area.top += 60
-            
-            full_msg = feedback["correct_reason"]
-            if not feedback["correto"]:
-                full_msg = f"Resposta certa: {feedback['correct_text']}\n\n{full_msg}"
-                
-            draw_text_wrapped(screen, full_msg, layout['font_opcao'], (220, 220, 220), reason_area)
+            # Painel pronto: só o alpha muda (fade de entrada e saída)
+            elapsed = pygame.time.get_ticks() - feedback["start"]
+            fade = max(0.0, min(1.0, elapsed / FEEDBACK_FADE_MS,
+                                (FEEDBACK_DURATION - elapsed) / FEEDBACK_FADE_MS))
+            blit_overlay(screen, (0, 0, 0), int(180 * fade))
+
+            if feedback["panel"] is None:
+                full_msg = feedback["correct_reason"]
+                if not feedback["correto"]:
+                    full_msg = f"Resposta certa: {feedback['correct_text']}\n\n{full_msg}"
+                feedback["panel"] = create_feedback_panel(screen.get_size(), feedback["correto"], full_msg,
+                                                          layout['font_titulo'], layout['font_opcao'])
+            panel, panel_rect = feedback["panel"]
+            panel.set_alpha(int(255 * fade))
+            screen.blit(panel, panel_rect)
+
+            # Folga do feedback: adianta a próxima pergunta
+            if pergunta_idx + 1 < len(perguntas):
+                next_idx = pergunta_idx + 1
+                prefetcher.request(next_idx, lambda: build_question_ui(next_idx))
+                prefetcher.step()
 
             # Timer Feedback
             if pygame.time.get_ticks() - feedback["start"] > FEEDBACK_DURATION:
@@ -558,6 +524,7 @@ async def run_show_do_bilhao(screen):
                 if pergunta_idx < len(perguntas):
                     setup_question_ui(pergunta_idx)
 
+        camera.apply(screen)
         pygame.display.flip()
         
         # PONTO VITAL
@@ -572,17 +539,19 @@ async def run_show_do_bilhao(screen):
                 if event.key == pygame.K_F11:
                     pygame.display.toggle_fullscreen()
                     resize_assets(screen)
+                    prefetcher.clear()
+                    if feedback:
+                        feedback["panel"] = None
                     if pergunta_idx < len(perguntas):
                         setup_question_ui(pergunta_idx) # Recria layout se mudar tamanho
                 elif event.key == pygame.K_ESCAPE:
                     return 0
 
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not feedback:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not feedback and pergunta_idx < len(perguntas):
                 for btn in current_buttons:
                     if btn.rect.collidepoint(event.pos):
                         # Trigger Explosão
-                        for _ in range(20):
-                            explosion_particles.append(ExplosionParticle(event.pos[0], event.pos[1], layout['font_particle']))
+                        explosions.emit(event.pos[0], event.pos[1], particle_budget.burst("show_explosao", 20))
                         
                         # Lógica
                         acertou = (btn.text == perguntas[pergunta_idx]["texto_correto"])
@@ -592,14 +561,15 @@ async def run_show_do_bilhao(screen):
                         else:
                             ScoreManager.add_points(pontos_erro)
                             audio_manager.play_sfx_if_exists("errado")
-                            shake_amount = 20
+                            camera.shake(20)
                         
                         feedback = {
                             "start": pygame.time.get_ticks(),
                             "correto": acertou,
                             "correct_text": perguntas[pergunta_idx]["texto_correto"],
                             "selected_text": btn.text,
-                            "correct_reason": perguntas[pergunta_idx]["motivo_correto"]
+                            "correct_reason": perguntas[pergunta_idx]["motivo_correto"],
+                            "panel": None  # Montado uma vez, no primeiro frame do feedback
                         }
                         # Renderiza frame de impacto imediato
                         pygame.display.flip()
@@ -9,12 +9,18 @@ import os
 import random
 import math
 import asyncio
+import bisect
 
 from src.utils import show_pause_screen, draw_text_wrapped, draw_question_container, draw_score_display, load_font
 from src.score_manager import ScoreManager
 # Correção do Import
 from src.audio_manager import audio_manager 
 import src.difficulty_manager as dm
+from src.performance import UIPrefetcher, supports_smoothscale, particle_budget
+from src.particles import ParticleEmitter
+from src.render_cache import RotationCache, blit_overlay, ButtonSkin
+from src.scene_cache import scene_cache
+from src.camera import ScreenShake
 
 # ===========================================================
 #            BANCO DE PERGUNTAS (MANTIDO)
@@ -49,78 +55,82 @@ ALL_QUESTIONS = {
 # ===========================================================
 #        PARTÍCULAS OTIMIZADAS (CACHE)
 # ===========================================================
-class StopParticle:
-    __slots__ = ('x', 'y', 'speed', 'base_alpha', 'scale', 'rotation', 'rot_speed', 'image', 'rect', 'w', 'h')
-    
-    # Cache estático de surfaces para não recriar a cada partícula
-    _cached_surfaces = []
-
-    @classmethod
-    def pre_render_surfaces(cls, font):
-        cls._cached_surfaces = []
-        chars = ["S", "T", "O", "P", "?", "!", "$"]
-        colors = [
-            (255, 80, 80), (80, 255, 255), (255, 255, 80), (180, 80, 255)
-        ]
-        for char in chars:
-            for col in colors:
-                surf = font.render(char, True, col)
-                cls._cached_surfaces.append(surf)
-
-    def __init__(self, w, h):
-        self.w, self.h = w, h
-        self.reset(first_time=True)
-
-    def reset(self, first_time=False):
-        self.x = random.randint(20, self.w - 20)
-        if first_time:
-            self.y = random.randint(0, self.h)
-        else:
-            self.y = random.randint(self.h, self.h + 100)
-            
-        self.speed = random.uniform(0.5, 2.0)
-        self.base_alpha = random.randint(40, 100)
-        self.scale = random.uniform(0.6, 1.4)
-        self.rotation = random.uniform(0, 360)
-        self.rot_speed = random.uniform(-1, 1)
-        
-        # Pega uma surface já pronta
-        if not StopParticle._cached_surfaces: return
-        base = random.choice(StopParticle._cached_surfaces)
-        
-        # Escala apenas na criação (não no draw)
-        nw = int(base.get_width() * self.scale)
-        nh = int(base.get_height() * self.scale)
+STOP_CHARS = ["S", "T", "O", "P", "?", "!", "$"]
+STOP_COLORS = [(255, 80, 80), (80, 255, 255), (255, 255, 80), (180, 80, 255)]
+STOP_VARIANTS = 12      # Combinações (letra, cor, escala, alpha) sorteadas por tela
+ROTATION_STEPS = 36     # 10 graus por quadro
+
+
+def make_stop_particles(w, h, font):
+    """Letras subindo e girando: cada variação é pré-rotacionada uma vez (RotationCache)."""
+    sprites = []
+    for _ in range(STOP_VARIANTS):
+        base = font.render(random.choice(STOP_CHARS), True, random.choice(STOP_COLORS))
+        scale = random.uniform(0.6, 1.4)
+        nw, nh = int(base.get_width() * scale), int(base.get_height() * scale)
         if nw > 0 and nh > 0:
-            self.image = pygame.transform.smoothscale(base, (nw, nh))
-        else:
-            self.image = base
-        
-        self.image.set_alpha(self.base_alpha)
-        self.rect = self.image.get_rect()
+            base = pygame.transform.smoothscale(base, (nw, nh))
+        sprites.append(RotationCache(base, ROTATION_STEPS, alpha=random.randint(40, 100)))
+    return ParticleEmitter(w, h, 25, sprites, vy=(-2.0, -0.5), flow="up", respawn=(0, 100),
+                           margin=50, x_pad=20, spin=(-1.0, 1.0))
+
+
+# ===========================================================
+#        ESTADOS DOS BOTÕES DE RESPOSTA
+# ===========================================================
+FEEDBACK_CORES = {"correct": (50, 255, 50), "wrong": (255, 50, 50)}
+
+# Borda de 3px só sob o mouse, como nos botões desenhados a cada frame
+BUTTON_STYLES = {
+    "idle": ((40, 50, 90, 160), (100, 150, 200), 2),
+    "hover": ((100, 120, 220, 200), (255, 255, 255), 3),
+    "correct": (FEEDBACK_CORES["correct"], (255, 255, 255), 2),
+    "correct_hover": (FEEDBACK_CORES["correct"], (255, 255, 255), 3),
+    "wrong": (FEEDBACK_CORES["wrong"], (255, 255, 255), 2),
+    "wrong_hover": (FEEDBACK_CORES["wrong"], (255, 255, 255), 3),
+}
+
+
+# ===========================================================
+#        ATLAS DE LETRAS DA ROLETA (CACHE)
+# ===========================================================
+LETRAS_ROLETA = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+COR_GIRO = (150, 150, 150)
+COR_ALVO = (255, 215, 0)
+PULSO_ALVO = (1.0, 1.2, 1.35, 1.5)  # Escalas da letra sorteada (a última é a pose final)
+
+# Duração de cada passo do giro (ms): 13 rápidos e 7 desacelerando
+GIRO_PASSOS_MS = [50] * 13 + [90 + 40 * k for k in range(7)]
+PULSO_MS = 120
+
 
-    def update(self, dt):
-        self.y -= self.speed * dt
-        self.rotation += self.rot_speed * dt
-        if self.y < -50:
-            self.reset()
+class LetterAtlas:
+    """Letras A-Z renderizadas uma vez no tamanho da fonte da roleta."""
 
-    def draw(self, screen):
-        # Rotação em tempo real ainda é necessária, mas surface base é leve
-        # Para otimização máxima, poderíamos evitar rotate a cada frame se travar
-        rot_img = pygame.transform.rotate(self.image, self.rotation)
-        screen.blit(rot_img, (int(self.x) - rot_img.get_width()//2, int(self.y) - rot_img.get_height()//2))
+    def __init__(self, font):
+        self.font = font
+        self.spin = {c: font.render(c, True, COR_GIRO) for c in LETRAS_ROLETA}
+        self._pulse = {}
+
+    def pulse_frames(self, char):
+        # Passos de escala da letra sorteada (lazy, uma vez por letra)
+        frames = self._pulse.get(char)
+        if frames is None:
+            base = self.font.render(char, True, COR_ALVO)
+            bw, bh = base.get_size()
+            scale = pygame.transform.smoothscale if supports_smoothscale() else pygame.transform.scale
+            frames = [base if sc == 1.0 else scale(base, (int(bw * sc), int(bh * sc)))
+                      for sc in PULSO_ALVO]
+            self._pulse[char] = frames
+        return frames
 
 
 # ===========================================================
 #        ANIMAÇÃO DE ROLETA (ASYNC)
 # ===========================================================
 async def animar_roleta(screen, letra_alvo, layout, clock):
-    letras_random = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
     w, h = screen.get_size()
-    
-    velocidade = 50 
-    total_giros = 20
+    atlas = layout['letter_atlas']
     
     # Pre-render grid (uma vez)
     grid_surf = pygame.Surface((w, h), pygame.SRCALPHA)
@@ -130,42 +140,44 @@ async def animar_roleta(screen, letra_alvo, layout, clock):
     txt_sorteio = layout['font_text'].render("Sorteando Letra...", True, (200, 200, 200))
     txt_rect = txt_sorteio.get_rect(center=(w//2, h*0.3))
 
-    for i in range(total_giros):
-        screen.fill((15, 15, 30))
-        screen.blit(grid_surf, (0,0))
-        screen.blit(txt_sorteio, txt_rect)
-        
-        if i < total_giros - 1:
-            char_atual = random.choice(letras_random)
-            cor = (150, 150, 150)
-            scale = 1.0
+    # Sequência sorteada antes: o loop só escolhe o passo pelo relógio
+    ultimo_passo = len(GIRO_PASSOS_MS) - 1
+    sequencia = [random.choice(LETRAS_ROLETA) for _ in range(ultimo_passo)]
+    limites = []
+    acumulado = 0
+    for dur in GIRO_PASSOS_MS:
+        acumulado += dur
+        limites.append(acumulado)
+    pulso = atlas.pulse_frames(letra_alvo)
+
+    inicio = time.perf_counter()
+    desenhado = None
+    while True:
+        decorrido = (time.perf_counter() - inicio) * 1000
+        if decorrido >= acumulado:
+            break
+
+        passo = bisect.bisect_right(limites, decorrido)
+        if passo < ultimo_passo:
+            letra_surf = atlas.spin[sequencia[passo]]
         else:
-            char_atual = letra_alvo
-            cor = (255, 215, 0)
-            scale = 1.5
+            t = (decorrido - limites[passo - 1]) / PULSO_MS
+            letra_surf = pulso[min(len(pulso) - 1, int(t * (len(pulso) - 1)))]
+
+        # Só recompõe a tela quando a imagem muda
+        if letra_surf is not desenhado:
+            desenhado = letra_surf
+            screen.fill((15, 15, 30))
+            screen.blit(grid_surf, (0,0))
+            screen.blit(txt_sorteio, txt_rect)
+            screen.blit(letra_surf, letra_surf.get_rect(center=(w//2, h//2)))
+            pygame.display.flip()
 
-        # Usa cache de letras grandes se possível, ou renderiza aqui (poucas vezes)
-        letra_surf = layout['font_letra'].render(char_atual, True, cor)
-        
-        if scale != 1.0:
-            nw = int(letra_surf.get_width() * scale)
-            nh = int(letra_surf.get_height() * scale)
-            letra_surf = pygame.transform.scale(letra_surf, (nw, nh))
-
-        rect = letra_surf.get_rect(center=(w//2, h//2))
-        screen.blit(letra_surf, rect)
-        
-        pygame.display.flip()
-        
-        if i > total_giros - 8:
-            velocidade += 40 
-        
-        await asyncio.sleep(velocidade / 1000.0)
+        clock.tick(60)
+        await asyncio.sleep(0)
 
     # Flash
-    flash = pygame.Surface((w, h))
-    flash.fill((255, 255, 255))
-    screen.blit(flash, (0,0))
+    blit_overlay(screen, (255, 255, 255))
     pygame.display.flip()
     
     await asyncio.sleep(0.05)
@@ -175,6 +187,7 @@ async def animar_roleta(screen, letra_alvo, layout, clock):
 # ===========================================================
 #             FUNÇÃO PRINCIPAL (ASYNC)
 # ===========================================================
+@particle_budget.scene
 async def run_stop(screen):
     pygame.display.set_caption("STOP - Governança de TI")
     clock = pygame.time.Clock()
@@ -184,11 +197,12 @@ async def run_stop(screen):
     assets_dir = os.path.join(base_dir, "assets")
     bg_path = os.path.join(assets_dir, "background", "background_stop.png")
     
-    bg_original = pygame.image.load(bg_path).convert() if os.path.exists(bg_path) else None
+    # Lido do disco só na primeira partida (cache de cenas)
+    bg_original = scene_cache.image(bg_path)
 
     # === RESIZE & CACHE ===
-    def resize_assets(surface):
-        w, h = surface.get_size()
+    def build_layout(layout, size):
+        w, h = size
         
         if bg_original:
             layout['background'] = pygame.transform.scale(bg_original, (w, h))
@@ -200,17 +214,20 @@ async def run_stop(screen):
         layout['font_small'] = load_font(max(20, int(h * 0.04)))
         layout['font_letra'] = load_font(max(180, int(h * 0.35))) 
         layout['font_particle'] = load_font(max(40, int(h * 0.08)))
+        layout['letter_atlas'] = LetterAtlas(layout['font_letra'])
         
-        # Pre-render particles
-        StopParticle.pre_render_surfaces(layout['font_particle'])
         
         # Cache Titulo
         layout['title_surf'] = layout['font_title'].render("STOP - Governança de TI", True, (255, 215, 0))
         layout['title_rect'] = layout['title_surf'].get_rect(center=(w // 2, int(h * 0.07)))
 
+    def resize_assets(surface):
+        nonlocal layout
+        layout = scene_cache.layout("stop", surface.get_size(), build_layout)
+
     resize_assets(screen)
 
-    particles = [StopParticle(screen.get_width(), screen.get_height()) for _ in range(25)]
+    particles = make_stop_particles(screen.get_width(), screen.get_height(), layout['font_particle'])
 
     diff_rules = dm.get_rules()
     q_type = dm.get_question_set_type()
@@ -221,14 +238,17 @@ async def run_stop(screen):
     pontos_acerto = 10 + diff_rules["bonus_acerto"]
     pontos_erro = -diff_rules["perda_pontos"]
     pontos_desta_fase = 0
-    shake_amount = 0
+    camera = ScreenShake(edge_color=(15, 15, 35))
 
     # === CACHE DE UI ATUAL ===
     current_ui_surf = None
     current_buttons = [] # Lista de (rect, texto, surface_texto)
 
-    def cache_ui(pergunta):
-        nonlocal current_ui_surf, current_buttons
+    # Pré-construção da próxima pergunta durante a tela de feedback
+    prefetcher = UIPrefetcher()
+
+    def build_ui(pergunta):
+        """Gera a UI da pergunta em etapas (cada yield devolve o controle ao frame)."""
         w, h = screen.get_size()
         
         # 1. Container Flutuante
@@ -253,10 +273,10 @@ async def run_stop(screen):
         dica_rect = pygame.Rect(cx + 60, cy + 20, cont_w - 140, cont_h - 70)
         draw_text_wrapped(s, f"Dica: {pergunta['dica']}", layout['font_small'], (180, 200, 220), dica_rect, align="left")
         
-        current_ui_surf = s
+        yield
         
         # 2. Botões
-        current_buttons = []
+        buttons = []
         opcoes = pergunta['opcoes']
         
         btn_w = int(min(w * 0.25, 340))
@@ -282,96 +302,100 @@ async def run_stop(screen):
             rel_x = start_x + coluna * (btn_w + spacing)
             rel_y_offset = linha * (btn_h + spacing)
             
-            current_buttons.append({
+            def draw_label(surf, r, state, ts=txt_surf):
+                surf.blit(ts, ts.get_rect(center=r.center))
+
+            buttons.append({
                 "text": txt,
-                "surf": txt_surf,
+                "skin": ButtonSkin((btn_w, btn_h), BUTTON_STYLES, radius=12,
+                                   shadow=((0, 0, 0, 100), (4, 6)), content=draw_label),
                 "rel_x": rel_x,
                 "rel_y_offset": rel_y_offset,
                 "w": btn_w, "h": btn_h,
                 "rect": pygame.Rect(0,0,0,0) # Será atualizado no loop
             })
+            yield
 
-    # === LOOP DE PERGUNTAS ===
+        return s, buttons
+
+    def cache_ui(idx):
+        nonlocal current_ui_surf, current_buttons
+        current_ui_surf, current_buttons = prefetcher.take(idx, lambda: build_ui(perguntas[idx]))
+
+    # Embaralha tudo antes: a UI da próxima pergunta pode ser montada adiantada
     for pergunta in perguntas:
         random.shuffle(pergunta["opcoes"])
+
+    def prefetch_next(idx):
+        """Hook de frame ocioso: monta a pergunta idx+1 dentro do orçamento."""
+        if idx + 1 < len(perguntas):
+            prefetcher.request(idx + 1, lambda: build_ui(perguntas[idx + 1]))
+            prefetcher.step()
+
+    def compor_frame(dt):
+        """Desenha a pergunta em repouso e aplica o tremor no frame composto."""
+        w, h = screen.get_size()
+        
+        # Shake aplicado no frame composto (cena desenhada em repouso)
+        camera.update()
+
+        screen.blit(layout['background'], (0, 0))
+        particles.update(dt)
+        particles.draw(screen)
+
+        # Overlay
+        blit_overlay(screen, (10, 10, 20, 140))
+        
+        # Título
+        screen.blit(layout['title_surf'], layout['title_rect'])
+        draw_score_display(screen, ScoreManager.get_score(), layout['font_text'], position="topright")
+
+        # UI Flutuante
+        float_val = math.sin(pygame.time.get_ticks() * 0.003) * 6
+        cont_y = int(h * 0.16) + float_val
+        cont_x = int(w * 0.1)
+        screen.blit(current_ui_surf, (cont_x, cont_y))
         
+        # Botões
+        mouse_pos = pygame.mouse.get_pos()
+        base_btn_y = int(h * 0.50) + float_val
+        
+        for i, btn in enumerate(current_buttons):
+            rx = btn["rel_x"]
+            ry = base_btn_y + btn["rel_y_offset"]
+            r = pygame.Rect(rx, ry, btn["w"], btn["h"])
+            btn["rect"] = r # Atualiza para clique
+            
+            is_hover = r.collidepoint(mouse_pos)
+            
+            # Estado pré-renderizado: um blit por botão
+            if feedback and selected_btn_idx == i:
+                state = feedback + "_hover" if is_hover else feedback
+            elif is_hover:
+                state = "hover"
+            else:
+                state = "idle"
+            screen.blit(btn["skin"].get(state), r)
+
+        if feedback:
+            blit_overlay(screen, FEEDBACK_CORES[feedback], 50)
+
+        camera.apply(screen)
+
+    # === LOOP DE PERGUNTAS ===
+    for p_idx, pergunta in enumerate(perguntas):
         await animar_roleta(screen, pergunta["letra"], layout, clock)
         
-        cache_ui(pergunta)
+        cache_ui(p_idx)
         
         rodada_ativa = True
         start_time = time.time()
-        feedback_color = None
+        feedback = None  # "correct" / "wrong" depois da resposta
         selected_btn_idx = -1
 
         while rodada_ativa:
             dt = clock.tick(60) / 16.0
-            w, h = screen.get_size()
-            
-            if shake_amount > 0:
-                shake_amount -= 0.5
-                if shake_amount < 0: shake_amount = 0
-            shake_x = random.randint(-int(shake_amount), int(shake_amount))
-            shake_y = random.randint(-int(shake_amount), int(shake_amount))
-
-            screen.blit(layout['background'], (0, 0))
-            for p in particles:
-                p.update(dt)
-                p.draw(screen)
-
-            # Overlay
-            overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-            overlay.fill((10, 10, 20, 140))
-            screen.blit(overlay, (0, 0))
-            
-            # Título
-            t_rect = layout['title_rect'].move(shake_x, shake_y)
-            screen.blit(layout['title_surf'], t_rect)
-            draw_score_display(screen, ScoreManager.get_score(), layout['font_text'], position="topright")
-
-            # UI Flutuante
-            float_val = math.sin(pygame.time.get_ticks() * 0.003) * 6
-            cont_y = int(h * 0.16) + float_val + shake_y
-            cont_x = int(w * 0.1) + shake_x
-            screen.blit(current_ui_surf, (cont_x, cont_y))
-            
-            # Botões
-            mouse_pos = pygame.mouse.get_pos()
-            base_btn_y = int(h * 0.50) + float_val + shake_y
-            
-            for i, btn in enumerate(current_buttons):
-                rx = btn["rel_x"] + shake_x
-                ry = base_btn_y + btn["rel_y_offset"]
-                r = pygame.Rect(rx, ry, btn["w"], btn["h"])
-                btn["rect"] = r # Atualiza para clique
-                
-                is_hover = r.collidepoint(mouse_pos)
-                
-                # Cores
-                if feedback_color and selected_btn_idx == i:
-                    bg = feedback_color
-                    border = (255, 255, 255)
-                elif is_hover:
-                    bg = (100, 120, 220, 200)
-                    border = (255, 255, 255)
-                else:
-                    bg = (40, 50, 90, 160)
-                    border = (100, 150, 200)
-                
-                # Desenha direto na tela (rápido)
-                pygame.draw.rect(screen, (0,0,0,100), r.move(4,6), border_radius=12)
-                pygame.draw.rect(screen, bg, r, border_radius=12)
-                pygame.draw.rect(screen, border, r, 2 if not is_hover else 3, border_radius=12)
-                
-                # Texto cacheado
-                ts = btn["surf"]
-                screen.blit(ts, ts.get_rect(center=r.center))
-
-            if feedback_color:
-                flash = pygame.Surface((w, h), pygame.SRCALPHA)
-                flash.fill(feedback_color + (50,))
-                screen.blit(flash, (0,0))
-
+            compor_frame(dt)
             pygame.display.flip()
             await asyncio.sleep(0)
 
@@ -382,8 +406,10 @@ async def run_stop(screen):
                     pygame.display.toggle_fullscreen()
                     screen = pygame.display.get_surface()
                     resize_assets(screen)
-                    particles = [StopParticle(screen.get_width(), screen.get_height()) for _ in range(25)]
-                    cache_ui(pergunta)
+                    particles.close()
+                    particles = make_stop_particles(screen.get_width(), screen.get_height(), layout['font_particle'])
+                    prefetcher.clear()
+                    cache_ui(p_idx)
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     return pontos_desta_fase
 
@@ -399,17 +425,18 @@ async def run_stop(screen):
                                 pontos_desta_fase += pontos_acerto
                                 ScoreManager.add_points(pontos_acerto)
                                 feedback_msg = "Correto!"
-                                feedback_color = (50, 255, 50)
+                                feedback = "correct"
                                 audio_manager.play_sfx_if_exists("correto")
                             else:
                                 pontos_desta_fase += pontos_erro
                                 ScoreManager.add_points(pontos_erro)
                                 feedback_msg = "Incorreto!"
-                                feedback_color = (255, 50, 50)
+                                feedback = "wrong"
                                 audio_manager.play_sfx_if_exists("errado")
-                                shake_amount = 15
+                                camera.shake(15)
                             
-                            # Renderiza feedback visual (1 frame)
+                            # Renderiza feedback visual (1 frame, pela mesma composição)
+                            compor_frame(dt)
                             pygame.display.flip()
                             await asyncio.sleep(0.5)
                             
@@ -418,7 +445,8 @@ async def run_stop(screen):
                                 feedback_msg,
                                 f"Pontos: {ScoreManager.get_score()} | Tempo: {tempo_total}s",
                                 f"Categoria: {pergunta['categoria']}",
-                                theme="STOP"
+                                theme="STOP",
+                                on_idle=lambda: prefetch_next(p_idx)
                             )
                             rodada_ativa = False
                             break
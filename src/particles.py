@@ -0,0 +1,523 @@
+# ===========================================================
+#        MOTOR DE PARTÍCULAS EM ARRAYS (WEB OPTIMIZED)
+# ===========================================================
+"""
+Partículas de fundo guardadas como "estrutura de arrays" (NumPy):
+posição, velocidade, fase e alpha ficam em vetores e o emissor inteiro é
+atualizado com operações vetorizadas. Quem sai da tela renasce em lote e o
+desenho é um único Surface.blits() por emissor.
+
+Sem NumPy (dependência opcional) o mesmo emissor roda num laço Python simples.
+"""
+
+import math
+import random
+
+import pygame
+
+from src.render_cache import ALPHA_LEVELS, alpha_level, alpha_copies, soft_circle
+from src.performance import governor, particle_budget
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TAU = math.pi * 2
+
+
+# ===========================================================
+#        VARIAÇÕES DE SPRITES (CRIADAS UMA VEZ)
+# ===========================================================
+def circle_sprites(radii, colors, alphas):
+    """Círculos do banco compartilhado para cada combinação (raio, cor, alpha)."""
+    return [soft_circle(r, color, a) for r in radii for color in colors for a in alphas]
+
+
+def scaled_sprites(bases, scales, alphas):
+    """Cópias de cada surface base em várias escalas e transparências."""
+    sprites = []
+    for base in bases:
+        bw, bh = base.get_size()
+        for sc in scales:
+            size = (max(1, int(bw * sc)), max(1, int(bh * sc)))
+            img = base if size == (bw, bh) else pygame.transform.smoothscale(base, size)
+            for a in alphas:
+                s = img.copy()
+                s.set_alpha(int(a))
+                sprites.append(s)
+    return sprites
+
+
+# ===========================================================
+#        EMISSOR AMBIENTE (SUBINDO / CAINDO / FLUTUANDO)
+# ===========================================================
+class ParticleEmitter:
+    """
+    Partículas de fundo que atravessam a tela.
+
+    flow="up"   sobem e renascem abaixo da tela
+    flow="down" caem e renascem acima da tela
+    flow="wrap" flutuam e dão a volta nas bordas
+
+    vx / vy são faixas sorteadas por partícula, na mesma unidade de dt que a
+    cena já usa. O balanço lateral soma wobble * sin(fase + y * wobble_freq)
+    a cada update, com a fase andando wobble_speed por update.
+
+    Com fade > 0 o alpha cai a cada update e `sprites` passa a ser uma lista
+    de níveis de alpha por variação (ex.: ThemeSpriteBank.sprites).
+
+    Com spin=(min, max) (graus por dt) cada sprite é um RotationCache e a
+    partícula gira, desenhada centralizada pelo quadro pré-rotacionado.
+
+    `count` é o pedido no preset de referência; a quantidade real vem do
+    orçamento global (performance.particle_budget), que corta primeiro os
+    emissores de menor `priority`. priority=None deixa o emissor fora dele.
+    """
+    _ARRAYS = ("x", "y", "vx", "vy", "amp", "phase", "alpha", "idx", "rot", "spin")
+
+    def __init__(self, w, h, count, sprites, vx=(0.0, 0.0), vy=(-1.0, -0.5),
+                 flow="up", respawn=(10, 80), margin=10, x_pad=0,
+                 wobble=0.0, wobble_freq=0.0, wobble_speed=0.0,
+                 fade=0.0, alpha=(150, 255), spin=None, priority=1):
+        self.sprites = list(sprites)
+        self.vx_range, self.vy_range = vx, vy
+        self.flow = flow
+        self.respawn_range = respawn
+        self.margin = margin
+        self.x_pad = x_pad
+        self.wobble, self.wobble_freq, self.wobble_speed = wobble, wobble_freq, wobble_speed
+        self.fade = fade
+        self.alpha_range = alpha
+        self.spin_range = spin
+        self.count = 0
+        self.resize(w, h, count)
+        if priority is not None:
+            particle_budget.register(self, count, priority)
+
+    # ---------- Ciclo de vida ----------
+    def close(self):
+        """Sai do orçamento de partículas (cena trocada antes de terminar)."""
+        particle_budget.unregister(self)
+
+    def resize(self, w, h, count=None):
+        """Novo tamanho de tela (e opcionalmente nova quantidade): espalha tudo de novo."""
+        self.w, self.h = max(1, w), max(1, h)
+        if count is not None: self.count = max(0, int(count))
+        n = self.count
+        if np is not None:
+            for name in self._ARRAYS:
+                setattr(self, name, np.zeros(n, dtype=np.int32 if name == "idx" else float))
+            self._spawn(np.ones(n, dtype=bool), first=True)
+        else:
+            self.parts = [[0.0] * 10 for _ in range(n)]
+            for p in self.parts: self._spawn_one(p, first=True)
+
+    def set_count(self, n):
+        """Ajusta a quantidade mantendo as partículas vivas (corta do fim / espalha novas)."""
+        n, old = max(0, int(n)), self.count
+        if n == old: return
+        if np is not None:
+            if n < old:
+                for name in self._ARRAYS: setattr(self, name, getattr(self, name)[:n])
+            else:
+                for name in self._ARRAYS:
+                    arr = getattr(self, name)
+                    setattr(self, name, np.concatenate((arr, np.zeros(n - old, dtype=arr.dtype))))
+                fresh = np.zeros(n, dtype=bool)
+                fresh[old:] = True
+                self._spawn(fresh, first=True)
+        else:
+            del self.parts[n:]
+            for _ in range(n - old):
+                p = [0.0] * 10
+                self._spawn_one(p, first=True)
+                self.parts.append(p)
+        self.count = n
+
+    def _spawn(self, mask, first=False):
+        k = int(mask.sum())
+        if k == 0: return
+        rnd = np.random.random
+        self.x[mask] = self.x_pad + rnd(k) * (self.w - 2 * self.x_pad)
+        if first or self.flow == "wrap":
+            self.y[mask] = rnd(k) * self.h
+        else:
+            lo, hi = self.respawn_range
+            off = lo + rnd(k) * (hi - lo)
+            self.y[mask] = (self.h + off) if self.flow == "up" else -off
+        self.vx[mask] = np.random.uniform(*self.vx_range, k)
+        self.vy[mask] = np.random.uniform(*self.vy_range, k)
+        self.amp[mask] = self.wobble * np.where(rnd(k) < 0.5, -1.0, 1.0)
+        self.phase[mask] = rnd(k) * TAU
+        self.alpha[mask] = np.random.uniform(*self.alpha_range, k)
+        self.idx[mask] = np.random.randint(0, len(self.sprites), k)
+        if self.spin_range:
+            self.rot[mask] = rnd(k) * 360.0
+            self.spin[mask] = np.random.uniform(*self.spin_range, k)
+
+    def _spawn_one(self, p, first=False):
+        # Layout: x, y, vx, vy, amp, fase, alpha, sprite, rotação, giro
+        p[0] = random.uniform(self.x_pad, self.w - self.x_pad)
+        if first or self.flow == "wrap":
+            p[1] = random.uniform(0, self.h)
+        else:
+            off = random.uniform(*self.respawn_range)
+            p[1] = (self.h + off) if self.flow == "up" else -off
+        p[2] = random.uniform(*self.vx_range)
+        p[3] = random.uniform(*self.vy_range)
+        p[4] = random.choice((-self.wobble, self.wobble))
+        p[5] = random.uniform(0, TAU)
+        p[6] = random.uniform(*self.alpha_range)
+        p[7] = random.randrange(len(self.sprites))
+        if self.spin_range:
+            p[8] = random.uniform(0, 360)
+            p[9] = random.uniform(*self.spin_range)
+
+    # ---------- Simulação ----------
+    def update(self, dt=1.0):
+        governor.sample()
+        if self.count == 0: return
+        if np is None:
+            self._update_py(dt)
+            return
+
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        if self.wobble:
+            self.x += self.amp * np.sin(self.phase + self.y * self.wobble_freq)
+            self.phase += self.wobble_speed
+        if self.fade:
+            self.alpha -= self.fade
+        if self.spin_range:
+            self.rot += self.spin * dt
+
+        m = self.margin
+        if self.flow == "wrap":
+            self.x[self.x < -m] = self.w + m
+            self.x[self.x > self.w + m] = -m
+            self.y[self.y < -m] = self.h + m
+            self.y[self.y > self.h + m] = -m
+            gone = self.alpha <= 0 if self.fade else None
+        else:
+            gone = (self.y < -m) if self.flow == "up" else (self.y > self.h + m)
+            gone |= (self.x < -50) | (self.x > self.w + 50)
+            if self.fade: gone |= self.alpha <= 0
+        if gone is not None and gone.any():
+            self._spawn(gone)
+
+    def _update_py(self, dt):
+        m, w, h = self.margin, self.w, self.h
+        for p in self.parts:
+            p[0] += p[2] * dt
+            p[1] += p[3] * dt
+            if self.wobble:
+                p[0] += p[4] * math.sin(p[5] + p[1] * self.wobble_freq)
+                p[5] += self.wobble_speed
+            p[6] -= self.fade
+            p[8] += p[9] * dt
+            if self.flow == "wrap":
+                if p[0] < -m: p[0] = w + m
+                elif p[0] > w + m: p[0] = -m
+                if p[1] < -m: p[1] = h + m
+                elif p[1] > h + m: p[1] = -m
+                if self.fade and p[6] <= 0: self._spawn_one(p)
+            else:
+                out = p[1] < -m if self.flow == "up" else p[1] > h + m
+                if out or p[0] < -50 or p[0] > w + 50 or (self.fade and p[6] <= 0):
+                    self._spawn_one(p)
+
+    # ---------- Desenho ----------
+    def draw(self, surface):
+        if self.count == 0: return
+        sprites = self.sprites
+        if self.spin_range:
+            self._draw_spin(surface)
+            return
+        if np is None:
+            if self.fade:
+                seq = [(sprites[int(p[7])][alpha_level(p[6])], (int(p[0]), int(p[1]))) for p in self.parts]
+            else:
+                seq = [(sprites[int(p[7])], (int(p[0]), int(p[1]))) for p in self.parts]
+        else:
+            pos = np.stack((self.x, self.y), axis=1).astype(np.int32).tolist()
+            if self.fade:
+                levels = _levels(self.alpha)
+                seq = [(sprites[i][lv], xy) for i, lv, xy in zip(self.idx.tolist(), levels.tolist(), pos)]
+            else:
+                seq = [(sprites[i], xy) for i, xy in zip(self.idx.tolist(), pos)]
+        surface.blits(seq, doreturn=False)
+
+    def _draw_spin(self, surface):
+        # Quadro pré-rotacionado mais próximo, centralizado na partícula
+        if np is not None:
+            xs, ys = self.x.astype(np.int32).tolist(), self.y.astype(np.int32).tolist()
+            idx, rots = self.idx.tolist(), self.rot.tolist()
+        else:
+            xs = [int(p[0]) for p in self.parts]
+            ys = [int(p[1]) for p in self.parts]
+            idx = [int(p[7]) for p in self.parts]
+            rots = [p[8] for p in self.parts]
+        seq = []
+        for i, a, x, y in zip(idx, rots, xs, ys):
+            rc = self.sprites[i]
+            k = rc.index(a)
+            ox, oy = rc.offsets[k]
+            seq.append((rc.frames[k], (x - ox, y - oy)))
+        surface.blits(seq, doreturn=False)
+
+
+# ===========================================================
+#        EMISSOR ORBITAL (FAGULHAS AO REDOR DE UM CENTRO)
+# ===========================================================
+class OrbitEmitter:
+    """Partículas girando em volta de um ponto (raio base +/- jitter)."""
+
+    def __init__(self, center, radius, count, sprites, vel=(0.015, 0.025), jitter=5, priority=2):
+        self.sprites = list(sprites)
+        self.vel_range = vel
+        self.jitter = jitter
+        self.count = max(0, int(count))
+        self.set_center(center, radius)
+        if priority is not None:
+            particle_budget.register(self, count, priority)
+
+    def _new(self, n):
+        lo, hi = self.vel_range
+        if np is not None:
+            return (np.random.random(n) * TAU,
+                    np.random.uniform(lo, hi, n) * np.where(np.random.random(n) > 0.5, 1.0, -1.0),
+                    self.radius + np.random.uniform(-self.jitter, self.jitter, n),
+                    np.random.randint(0, len(self.sprites), n))
+        return ([random.uniform(0, TAU) for _ in range(n)],
+                [random.uniform(lo, hi) * random.choice((-1, 1)) for _ in range(n)],
+                [self.radius + random.uniform(-self.jitter, self.jitter) for _ in range(n)],
+                [random.randrange(len(self.sprites)) for _ in range(n)])
+
+    def close(self):
+        """Sai do orçamento de partículas."""
+        particle_budget.unregister(self)
+
+    def set_center(self, center, radius):
+        """Nova roleta/tela: recria as órbitas."""
+        self.cx, self.cy = center
+        self.radius = radius
+        self.ang, self.vel, self.r, self.idx = self._new(self.count)
+
+    def set_count(self, n):
+        n, old = max(0, int(n)), self.count
+        if n == old: return
+        names = ("ang", "vel", "r", "idx")
+        if n < old:
+            for name in names: setattr(self, name, getattr(self, name)[:n])
+        else:
+            for name, extra in zip(names, self._new(n - old)):
+                arr = getattr(self, name)
+                setattr(self, name, np.concatenate((arr, extra)) if np is not None else arr + extra)
+        self.count = n
+
+    def update(self, dt=1.0):
+        governor.sample()
+        if np is not None:
+            self.ang += self.vel * dt
+            np.mod(self.ang, TAU, out=self.ang)
+        else:
+            self.ang = [(a + v * dt) % TAU for a, v in zip(self.ang, self.vel)]
+
+    def draw(self, surface):
+        if self.count == 0: return
+        sprites = self.sprites
+        if np is not None:
+            xs = (self.cx + np.cos(self.ang) * self.r).astype(np.int32).tolist()
+            ys = (self.cy + np.sin(self.ang) * self.r).astype(np.int32).tolist()
+            idx = self.idx.tolist()
+        else:
+            xs = [int(self.cx + math.cos(a) * r) for a, r in zip(self.ang, self.r)]
+            ys = [int(self.cy + math.sin(a) * r) for a, r in zip(self.ang, self.r)]
+            idx = self.idx
+        surface.blits([(sprites[i], (x, y)) for i, x, y in zip(idx, xs, ys)], doreturn=False)
+
+
+# ===========================================================
+#        POOL DE BURSTS (EXPLOSÕES, FAÍSCAS, SPLASHES)
+# ===========================================================
+class BurstEmitter:
+    """
+    Pool pré-alocado para efeitos de impacto. As partículas vivas ficam
+    compactadas no início dos arrays: emit() escreve nas vagas do fim e as
+    mortas são removidas em lote no update (sem list.remove).
+
+    Aparência:
+      sprites=[[nível0..nível15], ...]  variações com níveis de alpha
+                                         (ex.: alpha_sprites(...)), ou
+      color=(r, g, b)                   círculos do banco (raio sorteado em
+                                         `radius`, crescendo `grow`/update;
+                                         ring > 0 desenha só o anel)
+
+    Velocidade polar (speed + angle) ou cartesiana (vx + vy). A vida é
+    sorteada em `life` (mesma unidade do dt passado ao update) e o alpha cai
+    proporcionalmente a ela. Posições são o centro da partícula.
+    """
+    _ARRAYS = ("x", "y", "vx", "vy", "life", "life0", "size", "idx")
+
+    def __init__(self, capacity, sprites=None, color=None, radius=(2, 4), ring=0, grow=0.0,
+                 speed=(1.0, 3.0), angle=(0.0, TAU), vx=None, vy=None, squash_y=1.0,
+                 jitter=0.0, gravity=0.0, drag=1.0, life=(20, 30), alpha=255):
+        self.capacity = max(1, int(capacity))
+        self.sprites = list(sprites) if sprites else None
+        self.color = color
+        self.radius_range, self.ring, self.grow = radius, ring, grow
+        self.speed_range, self.angle_range = speed, angle
+        self.vx_range, self.vy_range = vx, vy
+        self.squash_y, self.jitter = squash_y, jitter
+        self.gravity, self.drag = gravity, drag
+        self.life_range = life
+        self.alpha0 = alpha
+        self.alive = 0
+        n = self.capacity
+        if np is not None:
+            for name in self._ARRAYS:
+                setattr(self, name, np.zeros(n, dtype=np.int32 if name == "idx" else float))
+        else:
+            self.parts = [[0.0] * 8 for _ in range(n)]
+        # As vivas contam no total de partículas da cena (particle_budget.burst)
+        particle_budget.register_pool(self)
+
+    # ---------- Pool ----------
+    def emit(self, x, y, n):
+        """Dispara até n partículas em (x, y); devolve quantas couberam no pool."""
+        k = min(int(n), self.capacity - self.alive)
+        if k <= 0: return 0
+        if np is not None:
+            sl = slice(self.alive, self.alive + k)
+            j = self.jitter
+            self.x[sl] = x + (np.random.uniform(-j, j, k) if j else 0.0)
+            self.y[sl] = y + (np.random.uniform(-j, j, k) if j else 0.0)
+            if self.vx_range is not None:
+                self.vx[sl] = np.random.uniform(*self.vx_range, k)
+                self.vy[sl] = np.random.uniform(*self.vy_range, k)
+            else:
+                ang = np.random.uniform(*self.angle_range, k)
+                spd = np.random.uniform(*self.speed_range, k)
+                self.vx[sl] = np.cos(ang) * spd
+                self.vy[sl] = np.sin(ang) * spd * self.squash_y
+            self.life[sl] = np.random.uniform(*self.life_range, k)
+            self.life0[sl] = self.life[sl]
+            self.size[sl] = np.random.uniform(*self.radius_range, k)
+            if self.sprites:
+                self.idx[sl] = np.random.randint(0, len(self.sprites), k)
+        else:
+            for p in self.parts[self.alive:self.alive + k]:
+                self._emit_one(p, x, y)
+        self.alive += k
+        return k
+
+    def _emit_one(self, p, x, y):
+        # Layout: x, y, vx, vy, vida, vida inicial, raio, sprite
+        j = self.jitter
+        p[0] = x + random.uniform(-j, j)
+        p[1] = y + random.uniform(-j, j)
+        if self.vx_range is not None:
+            p[2] = random.uniform(*self.vx_range)
+            p[3] = random.uniform(*self.vy_range)
+        else:
+            ang = random.uniform(*self.angle_range)
+            spd = random.uniform(*self.speed_range)
+            p[2] = math.cos(ang) * spd
+            p[3] = math.sin(ang) * spd * self.squash_y
+        p[4] = p[5] = random.uniform(*self.life_range)
+        p[6] = random.uniform(*self.radius_range)
+        p[7] = random.randrange(len(self.sprites)) if self.sprites else 0
+
+    def clear(self):
+        self.alive = 0
+
+    # ---------- Simulação ----------
+    def update(self, dt=1.0):
+        n = self.alive
+        if n == 0: return
+        if np is None:
+            self._update_py(dt)
+            return
+
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        x += vx * dt
+        y += vy * dt
+        if self.gravity: vy += self.gravity * dt
+        if self.drag != 1.0:
+            vx *= self.drag
+            vy *= self.drag
+        if self.grow: self.size[:n] += self.grow * dt
+        life = self.life[:n]
+        life -= dt
+
+        # Compacta as vivas no início (uma passada vetorizada)
+        keep = life > 0
+        m = int(keep.sum())
+        if m < n:
+            for name in self._ARRAYS:
+                arr = getattr(self, name)
+                arr[:m] = arr[:n][keep]
+            self.alive = m
+
+    def _update_py(self, dt):
+        parts, i = self.parts, 0
+        while i < self.alive:
+            p = parts[i]
+            p[0] += p[2] * dt
+            p[1] += p[3] * dt
+            p[3] += self.gravity * dt
+            p[2] *= self.drag
+            p[3] *= self.drag
+            p[6] += self.grow * dt
+            p[4] -= dt
+            if p[4] <= 0:
+                # Troca com a última viva: remoção O(1)
+                self.alive -= 1
+                parts[i], parts[self.alive] = parts[self.alive], p
+            else:
+                i += 1
+
+    # ---------- Desenho ----------
+    def draw(self, surface):
+        n = self.alive
+        if n == 0: return
+        if np is not None:
+            alpha = (self.alpha0 * self.life[:n] / self.life0[:n]).tolist()
+            xs, ys, size = self.x[:n].tolist(), self.y[:n].tolist(), self.size[:n].tolist()
+            idx = self.idx[:n].tolist()
+        else:
+            live = self.parts[:n]
+            alpha = [self.alpha0 * p[4] / p[5] for p in live]
+            xs, ys, size = [p[0] for p in live], [p[1] for p in live], [p[6] for p in live]
+            idx = [int(p[7]) for p in live]
+
+        seq = []
+        if self.sprites:
+            sprites = self.sprites
+            for i, a, px, py in zip(idx, alpha, xs, ys):
+                img = sprites[i][alpha_level(a)]
+                seq.append((img, (int(px) - img.get_width() // 2, int(py) - img.get_height() // 2)))
+        else:
+            color, ring = self.color, self.ring
+            for r, a, px, py in zip(size, alpha, xs, ys):
+                r = max(1, int(r))
+                seq.append((soft_circle(r, color, a, ring), (int(px) - r, int(py) - r)))
+        surface.blits(seq, doreturn=False)
+
+
+def alpha_sprites(bases, scales=(1.0,)):
+    """Variações (surface base x escala), cada uma com todos os níveis de alpha."""
+    variants = []
+    for base in bases:
+        bw, bh = base.get_size()
+        for sc in scales:
+            size = (max(1, int(bw * sc)), max(1, int(bh * sc)))
+            img = base if size == (bw, bh) else pygame.transform.smoothscale(base, size)
+            variants.append(alpha_copies(img))
+    return variants
+
+
+# ---------- Níveis de alpha (mesma quantização do render_cache) ----------
+def _levels(alpha):
+    return np.clip(alpha, 0, 255).astype(np.int32) // (256 // ALPHA_LEVELS)
@@ -9,6 +9,9 @@ para performance mobile em Party Pascal.
 
 import pygame
 import sys
+import time
+import weakref
+import functools
 
 # ---------------------------------------------------------
 # DETECTAR SE É UM DISPOSITIVO MOBILE-LIKE
@@ -39,6 +42,8 @@ PRESETS = {
         "use_smoothscale": True,
         "use_rotozoom": True,
         "preload_sfx": True,
+        "rotation_cache_mb": 96,
+        "scene_cache_mb": 160,
     },
     "medium": {
         "fps": 45,
@@ -47,6 +52,8 @@ PRESETS = {
         "use_smoothscale": True,
         "use_rotozoom": False,
         "preload_sfx": False,
+        "rotation_cache_mb": 64,
+        "scene_cache_mb": 96,
     },
     "low": {
         "fps": 30,
@@ -55,6 +62,8 @@ PRESETS = {
         "use_smoothscale": False,
         "use_rotozoom": False,
         "preload_sfx": False,
+        "rotation_cache_mb": 32,
+        "scene_cache_mb": 48,
     }
 }
 
@@ -107,6 +116,16 @@ def supports_rotozoom():
     return ensure_preset()["use_rotozoom"]
 
 
+def rotation_cache_budget():
+    """Memória (bytes) que um cache de rotação grande pode ocupar."""
+    return ensure_preset()["rotation_cache_mb"] * 1024 * 1024
+
+
+def scene_cache_budget():
+    """Memória (bytes) que as cenas mantidas aquecidas podem ocupar."""
+    return ensure_preset()["scene_cache_mb"] * 1024 * 1024
+
+
 # ---------------------------------------------------------
 # CACHE PARA SUPERFÍCIES ESCALADAS
 # ---------------------------------------------------------
@@ -130,8 +149,276 @@ def adapt_surface(surface, new_size):
     return scaled
 
 
+# ---------------------------------------------------------
+# PRÉ-CONSTRUÇÃO DE UI EM FRAMES OCIOSOS
+# ---------------------------------------------------------
+def run_to_end(job):
+    """Executa um builder (generator) até o fim e devolve o resultado."""
+    while True:
+        try:
+            next(job)
+        except StopIteration as done:
+            return done.value
+
+
+class UIPrefetcher:
+    """
+    Constrói a UI da próxima pergunta em etapas durante a folga dos frames
+    (feedback, transições), respeitando um orçamento de tempo por frame.
+
+    Os builders são generators: cada `yield` marca um ponto onde o trabalho
+    pode ser pausado, e o `return` entrega o resultado pronto.
+    """
+    def __init__(self, budget_ms=4.0):
+        self.budget_ms = budget_ms
+        self._jobs = {}
+        self._ready = {}
+
+    def request(self, key, factory):
+        """Agenda a construção de `key`; `factory()` cria o generator."""
+        if key in self._ready or key in self._jobs:
+            return
+        self._jobs[key] = factory()
+
+    def step(self, budget_ms=None):
+        """Avança os builders pendentes até estourar o orçamento do frame."""
+        budget = self.budget_ms if budget_ms is None else budget_ms
+        deadline = time.perf_counter() + budget / 1000.0
+        while self._jobs and time.perf_counter() < deadline:
+            key = next(iter(self._jobs))
+            try:
+                next(self._jobs[key])
+            except StopIteration as done:
+                self._ready[key] = done.value
+                del self._jobs[key]
+        return not self._jobs
+
+    def is_ready(self, key):
+        return key in self._ready
+
+    def take(self, key, factory):
+        """Entrega a UI pronta; se ainda não terminou, conclui na hora."""
+        if key in self._ready:
+            return self._ready.pop(key)
+        job = self._jobs.pop(key, None)
+        return run_to_end(job if job is not None else factory())
+
+    def clear(self):
+        """Descarta tudo (ex.: mudou o tamanho da tela)."""
+        self._jobs.clear()
+        self._ready.clear()
+
+
+# ---------------------------------------------------------
+# MUDANÇA DE NÍVEL (LISTENERS)
+# ---------------------------------------------------------
+TIER_ORDER = ("high", "medium", "low")
+_tier_listeners = []
+
+
+def preset_name():
+    p = ensure_preset()
+    for name, preset in PRESETS.items():
+        if preset is p:
+            return name
+    return "medium"
+
+
+def on_tier_change(callback):
+    """Registra callback(nome) chamado sempre que o preset muda."""
+    _tier_listeners.append(callback)
+
+
+def set_preset(name):
+    global PRESET
+    if name not in PRESETS or PRESETS[name] is PRESET:
+        return
+    PRESET = PRESETS[name]
+    for cb in list(_tier_listeners):
+        cb(name)
+
+
 # Para testes
 def force_preset(name):
-    global PRESET
-    if name in PRESETS:
-        PRESET = PRESETS[name]
\ No newline at end of file
+    set_preset(name)
+
+
+# ---------------------------------------------------------
+# GOVERNADOR ADAPTATIVO (REBAIXA O PRESET SE O FPS CAIR)
+# ---------------------------------------------------------
+class FrameGovernor:
+    """
+    Mede o tempo real entre frames e desce um nível de preset quando a média
+    fica acima do orçamento do FPS alvo por HOLD_MS seguidos.
+    Com folga grande por FAST_HOLD_MS sobe um nível (janelas pequenas caem no
+    preset "low" pelo is_mobile_like), mas depois de um rebaixamento não sobe
+    mais: evita ficar oscilando entre dois níveis.
+    Vários emissores no mesmo frame chamam sample(); os repetidos são ignorados.
+    """
+    SLOW_FACTOR = 1.25
+    HOLD_MS = 2000
+    FAST_FACTOR = 0.6
+    FAST_HOLD_MS = 5000
+    MIN_GAP_MS = 4      # Chamadas mais próximas = mesmo frame
+    MAX_GAP_MS = 250    # Pausas longas (carregamento, troca de cena) não contam
+
+    def __init__(self):
+        self.enabled = True
+        self._last = None
+        self._avg = None
+        self._slow_ms = 0.0
+        self._fast_ms = 0.0
+        self._lowered = False
+
+    def sample(self):
+        now = time.perf_counter()
+        if self._last is None:
+            self._last = now
+            return
+        dt = (now - self._last) * 1000.0
+        if dt < self.MIN_GAP_MS:
+            return
+        self._last = now
+        if dt > self.MAX_GAP_MS:
+            self._slow_ms = self._fast_ms = 0.0
+            return
+
+        self._avg = dt if self._avg is None else self._avg * 0.9 + dt * 0.1
+        frame_budget = 1000.0 / target_fps()
+        self._slow_ms = self._slow_ms + dt if self._avg > frame_budget * self.SLOW_FACTOR else 0.0
+        self._fast_ms = self._fast_ms + dt if self._avg < frame_budget * self.FAST_FACTOR else 0.0
+        if not self.enabled:
+            return
+
+        tier = TIER_ORDER.index(preset_name())
+        if self._slow_ms >= self.HOLD_MS and tier + 1 < len(TIER_ORDER):
+            self._lowered = True
+            self._change(TIER_ORDER[tier + 1])
+        elif self._fast_ms >= self.FAST_HOLD_MS and tier > 0 and not self._lowered:
+            self._change(TIER_ORDER[tier - 1])
+
+    def _change(self, name):
+        self._slow_ms = self._fast_ms = 0.0
+        self._avg = None
+        set_preset(name)
+
+
+governor = FrameGovernor()
+
+
+# ---------------------------------------------------------
+# ORÇAMENTO GLOBAL DE PARTÍCULAS
+# ---------------------------------------------------------
+class ParticleBudget:
+    """
+    Reparte o orçamento "particles" do preset (64/36/18) entre os emissores
+    da cena ativa: a soma das partículas vivas nunca passa dele.
+
+    Cada cena (`run_*`, menus, pausa) abre um escopo com o decorator `scene`:
+    os emissores criados nela só dividem o orçamento entre si. Uma cena
+    suspensa (ex.: o menu enquanto o jogo roda) sai da conta até voltar ao
+    topo, e os emissores de uma cena encerrada são descartados.
+
+    Os pedidos das cenas foram ajustados no preset de referência ("medium")
+    e são escalados pelo preset atual. Se a soma não cabe, o corte começa
+    pelos emissores de menor prioridade (cada um até o seu piso); se nem os
+    pisos cabem, todos encolhem na mesma proporção. Cenas com pools de burst
+    deixam BURST_SHARE do orçamento livre para eles, e cada burst só cria o
+    que ainda cabe no total.
+    """
+    REFERENCE = "medium"
+    BURST_SHARE = 0.25
+
+    def __init__(self):
+        # Pilha de escopos; cada um: emissor -> (pedido, prioridade, piso)
+        self._scenes = [weakref.WeakKeyDictionary()]
+        self._pools = [weakref.WeakSet()]
+        self._last_burst = {}
+        on_tier_change(lambda name: self.rebalance())
+
+    def total(self):
+        return particle_settings()[0]
+
+    def ratio(self):
+        return self.total() / PRESETS[self.REFERENCE]["particles"]
+
+    def register(self, emitter, want, priority=1, floor=0.25):
+        """Emissor com set_count(n); recebe sua fatia agora e a cada mudança de nível."""
+        self._scenes[-1][emitter] = (want, priority, floor)
+        self.rebalance()
+
+    def register_pool(self, pool):
+        """Pool de burst (com `alive`): suas partículas vivas contam no total da cena."""
+        self._pools[-1].add(pool)
+        self.rebalance()
+
+    def unregister(self, emitter):
+        """Emissor que saiu de cena (ou foi substituído): devolve sua fatia."""
+        for scene, pools in zip(self._scenes, self._pools):
+            scene.pop(emitter, None)
+            pools.discard(emitter)
+        self.rebalance()
+
+    def push_scene(self):
+        self._scenes.append(weakref.WeakKeyDictionary())
+        self._pools.append(weakref.WeakSet())
+
+    def pop_scene(self):
+        if len(self._scenes) > 1:
+            self._scenes.pop()
+            self._pools.pop()
+        self.rebalance()  # A cena de baixo volta a ter o orçamento inteiro
+
+    def scene(self, fn):
+        """Decorator de `async def`: a cena tem o próprio escopo de emissores."""
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            self.push_scene()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.pop_scene()
+        return wrapper
+
+    def _allocate(self):
+        items = list(self._scenes[-1].items())
+        cap = self.total()
+        if self._pools[-1]:
+            cap = int(cap * (1 - self.BURST_SHARE))
+        r = self.ratio()
+        alloc = {em: int(round(want * r)) for em, (want, _, _) in items}
+        excess = sum(alloc.values()) - cap
+        for em, (_, _, floor) in sorted(items, key=lambda it: it[1][1]):
+            if excess <= 0:
+                break
+            cut = min(excess, alloc[em] - int(alloc[em] * floor))
+            alloc[em] -= cut
+            excess -= cut
+        if excess > 0:
+            # Nem os pisos cabem: encolhe todos na mesma proporção
+            total = sum(alloc.values())
+            alloc = {em: n * cap // total for em, n in alloc.items()}
+        return alloc
+
+    def rebalance(self):
+        for em, n in self._allocate().items():
+            em.set_count(n)
+
+    def burst(self, key, n):
+        """
+        Quantas partículas um burst de `n` pode criar agora: escala do preset,
+        limitada ao que sobra do total da cena (emissores + bursts vivos) e no
+        máximo um burst por `particle_spawn_ms` para a mesma chave.
+        """
+        spawn_ms = particle_settings()[1]
+        now = pygame.time.get_ticks()
+        last = self._last_burst.get(key)
+        if last is not None and now - last < spawn_ms:
+            return 0
+        self._last_burst[key] = now
+        live = sum(em.count for em in self._scenes[-1].keys())
+        live += sum(pool.alive for pool in self._pools[-1])
+        return max(0, min(int(round(n * self.ratio())), self.total() - live))
+
+
+particle_budget = ParticleBudget()
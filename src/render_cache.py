@@ -0,0 +1,419 @@
+# ===========================================================
+#          CACHE DE SPRITES PRÉ-RENDERIZADOS (WEB SAFE)
+# ===========================================================
+"""
+Bancos de sprites construídos uma única vez e reaproveitados entre frames.
+Evita font.render / pygame.Surface dentro dos loops de desenho (o maior custo
+no navegador), deixando o frame estável sem alocações.
+"""
+
+import math
+import time
+
+import pygame
+
+from src.performance import supports_rotozoom, supports_smoothscale, rotation_cache_budget
+
+# Níveis de transparência pré-calculados (alpha é quantizado para o mais próximo)
+ALPHA_LEVELS = 16
+_ALPHA_STEP = 256 // ALPHA_LEVELS
+
+
+def alpha_level(alpha):
+    """Converte alpha 0-255 no índice do nível pré-renderizado."""
+    a = int(alpha)
+    if a <= 0: return 0
+    if a >= 255: return ALPHA_LEVELS - 1
+    return a // _ALPHA_STEP
+
+
+def level_alpha(level):
+    """Alpha representativo de um nível (o topo da faixa; o último é 255)."""
+    return min(255, (level + 1) * _ALPHA_STEP - 1)
+
+
+def alpha_copies(base):
+    """Uma cópia da surface por nível de alpha (ALPHA_LEVELS cópias)."""
+    # Uma cópia por nível; set_alpha combina com o alpha por pixel (pygame 2)
+    copies = []
+    for i in range(ALPHA_LEVELS):
+        s = base.copy()
+        s.set_alpha(level_alpha(i))
+        copies.append(s)
+    return copies
+
+
+# ===========================================================
+#        BANCO DE PARTÍCULAS POR TEMA (PAUSA / TRANSIÇÃO)
+# ===========================================================
+class ThemeSpriteBank:
+    """Glifos ("char") ou círculos ("circle") de um tema em vários níveis de alpha."""
+
+    CIRCLE_RADII = (2, 3, 4, 5, 6)
+
+    def __init__(self, style, font):
+        self.type = style.get("type", "circle")
+        color = style["color"][:3]
+        self.sprites = {}
+
+        if self.type == "char":
+            for char in style.get("content", ["*"]):
+                base = font.render(char, True, color).convert_alpha()
+                self.sprites[char] = alpha_copies(base)
+        else:
+            for r in self.CIRCLE_RADII:
+                self.sprites[r] = [soft_circle(r, color, level_alpha(i)) for i in range(ALPHA_LEVELS)]
+
+    def get(self, key, alpha):
+        """key = caractere (tema "char") ou raio (tema "circle")."""
+        return self.sprites[key][alpha_level(alpha)]
+
+
+_theme_banks = {}
+
+def theme_sprite_bank(style, font):
+    """Banco do estilo, criado na primeira chamada para cada (estilo, fonte)."""
+    key = (style["type"], tuple(style["color"][:3]), tuple(style.get("content", ())), font)
+    bank = _theme_banks.get(key)
+    if bank is None:
+        bank = ThemeSpriteBank(style, font)
+        _theme_banks[key] = bank
+    return bank
+
+
+# ===========================================================
+#        BANCO DE CÍRCULOS SUAVES (PARTÍCULAS CIRCULARES)
+# ===========================================================
+_SUPERSAMPLE = 4
+_circle_bases = {}
+_circle_bank = {}
+
+
+def _circle_base(radius, color, width):
+    # Desenha em 4x e reduz com smoothscale: borda anti-aliased sem gfxdraw
+    key = (radius, color, width)
+    base = _circle_bases.get(key)
+    if base is None:
+        ss = _SUPERSAMPLE
+        big = pygame.Surface((radius * 2 * ss, radius * 2 * ss), pygame.SRCALPHA)
+        pygame.draw.circle(big, color, (radius * ss, radius * ss), radius * ss, width * ss)
+        base = pygame.transform.smoothscale(big, (radius * 2, radius * 2))
+        _circle_bases[key] = base
+    return base
+
+
+def soft_circle(radius, color, alpha=255, width=0):
+    """
+    Círculo anti-aliased pronto para blit (tamanho 2r x 2r; centralize com -r).
+    Cacheado por (raio, cor, faixa de alpha, espessura): criado uma vez e
+    reaproveitado por todas as partículas iguais. width > 0 desenha um anel.
+    """
+    r = max(1, int(radius))
+    color = tuple(color[:3])
+    level = alpha_level(alpha)
+    key = (r, color, level, width)
+    surf = _circle_bank.get(key)
+    if surf is None:
+        surf = _circle_base(r, color, width).copy()
+        surf.set_alpha(level_alpha(level))
+        _circle_bank[key] = surf
+    return surf
+
+
+# ===========================================================
+#        CACHE DE ROTAÇÃO (SPRITES QUE GIRAM)
+# ===========================================================
+class RotationCache:
+    """
+    Imagem pré-rotacionada em `steps` ângulos quantizados (criada uma vez).
+    get(ângulo) devolve o quadro mais próximo; offsets guarda a metade do
+    tamanho de cada quadro para desenhar centralizado sem get_rect().
+    """
+
+    def __init__(self, image, steps=36, alpha=None):
+        self.steps = max(1, int(steps))
+        self.step_deg = 360.0 / self.steps
+        self.frames = []
+        self.offsets = []
+        for i in range(self.steps):
+            frame = pygame.transform.rotate(image, i * self.step_deg)
+            if alpha is not None:
+                frame.set_alpha(alpha)
+            self.frames.append(frame)
+            self.offsets.append((frame.get_width() // 2, frame.get_height() // 2))
+
+    def index(self, angle):
+        return int(round(angle / self.step_deg)) % self.steps
+
+    def get(self, angle):
+        return self.frames[self.index(angle)]
+
+    def blit_centered(self, dest, center, angle):
+        i = self.index(angle)
+        ox, oy = self.offsets[i]
+        return dest.blit(self.frames[i], (int(center[0]) - ox, int(center[1]) - oy))
+
+
+class LazyRotationCache:
+    """
+    Rotações de uma imagem grande (ex.: a roleta), criadas sob demanda e
+    recortadas no tamanho original (a imagem deve caber no círculo inscrito).
+    Os quadros são opacos com colorkey RLE (blit bem mais barato que alpha
+    por pixel), então a imagem não pode usar a cor `key`.
+    O número de ângulos cabe no orçamento de memória do preset (até 1° por
+    passo); warm() adianta quadros na folga dos frames. get_exact() gira no
+    ângulo pedido e guarda só o último (giro lento / roleta parada).
+    """
+
+    def __init__(self, image, max_steps=360, key=(255, 0, 255)):
+        self.image = image
+        self.key = key
+        w, h = image.get_size()
+        self.size = (w, h)
+        self.half = (w // 2, h // 2)
+        frame_bytes = max(1, w * h * image.get_bytesize())
+        self.steps = max(8, min(max_steps, rotation_cache_budget() // frame_bytes))
+        self.step_deg = 360.0 / self.steps
+        self.frames = [None] * self.steps
+        self._next_warm = 0
+        self._exact_angle = None
+        self._exact = None
+
+    def _rotate(self, angle):
+        rotated = pygame.transform.rotate(self.image, angle)
+        rw, rh = rotated.get_size()
+        w, h = self.size
+        frame = pygame.Surface((w, h))
+        frame.fill(self.key)
+        frame.blit(rotated, ((w - rw) // 2, (h - rh) // 2))
+        frame.set_colorkey(self.key, pygame.RLEACCEL)
+        return frame
+
+    def get(self, angle):
+        i = int(round(angle / self.step_deg)) % self.steps
+        frame = self.frames[i]
+        if frame is None:
+            frame = self.frames[i] = self._rotate(i * self.step_deg)
+        return frame
+
+    def get_exact(self, angle):
+        if angle != self._exact_angle:
+            self._exact = self._rotate(angle)
+            self._exact_angle = angle
+        return self._exact
+
+    def warm(self, budget_ms=3.0):
+        """Cria quadros ainda ausentes até estourar o orçamento; True quando completo."""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while self._next_warm < self.steps and time.perf_counter() < deadline:
+            if self.frames[self._next_warm] is None:
+                self.frames[self._next_warm] = self._rotate(self._next_warm * self.step_deg)
+            self._next_warm += 1
+        return self._next_warm >= self.steps
+
+    def blit_centered(self, dest, center, angle, exact=False):
+        frame = self.get_exact(angle) if exact else self.get(angle)
+        return dest.blit(frame, (int(center[0]) - self.half[0], int(center[1]) - self.half[1]))
+
+
+# ===========================================================
+#     FAIXA DE QUADROS (ANIMAÇÕES PERIÓDICAS: PULSO/RESPIRAÇÃO)
+# ===========================================================
+class FrameStrip:
+    """
+    Um período de uma curva de escala/rotação renderizado em `frames` quadros.
+    scale(fase) e angle(fase) recebem a fase 0..1 do período. Quadros de mesmo
+    tamanho e ângulo são compartilhados (curvas senoidais repetem tamanhos).
+    Com rotozoom desligado no preset usa scale/rotate simples na construção.
+    """
+
+    def __init__(self, image, period_ms, frames=24, scale=None, angle=None):
+        self.period = max(1, int(period_ms))
+        self.count = max(1, int(frames))
+        self.frames = []
+        self.offsets = []
+
+        smooth_rot = supports_rotozoom()
+        smooth_scale = supports_smoothscale()
+        w, h = image.get_size()
+        baked = {}
+        for k in range(self.count):
+            phase = k / self.count
+            s = scale(phase) if scale else 1.0
+            a = round(angle(phase), 1) if angle else 0.0
+            size = (max(1, int(round(w * s))), max(1, int(round(h * s))))
+            key = (size, a)
+            frame = baked.get(key)
+            if frame is None:
+                if smooth_rot:
+                    frame = pygame.transform.rotozoom(image, a, s)
+                else:
+                    frame = image if size == (w, h) else (
+                        pygame.transform.smoothscale(image, size) if smooth_scale
+                        else pygame.transform.scale(image, size))
+                    if a:
+                        frame = pygame.transform.rotate(frame, a)
+                baked[key] = frame
+            self.frames.append(frame)
+            self.offsets.append((frame.get_width() // 2, frame.get_height() // 2))
+
+    def index(self, ms):
+        return int((ms % self.period) * self.count // self.period)
+
+    def get(self, ms):
+        """Quadro do instante `ms` (ex.: pygame.time.get_ticks())."""
+        return self.frames[self.index(ms)]
+
+    def blit_centered(self, dest, center, ms):
+        i = self.index(ms)
+        ox, oy = self.offsets[i]
+        return dest.blit(self.frames[i], (int(center[0]) - ox, int(center[1]) - oy))
+
+
+def pulse_strip(image, amplitude, period_ms, frames=24):
+    """Faixa de 'respiração': escala 1 + amplitude * sin(2π fase)."""
+    return FrameStrip(image, period_ms, frames,
+                      scale=lambda ph: 1.0 + amplitude * math.sin(ph * math.tau))
+
+
+# ===========================================================
+#      CAMADAS TRANSLÚCIDAS COMPARTILHADAS (OVERLAY / FLASH)
+# ===========================================================
+_overlays = {}
+_OVERLAY_MAX = 48
+
+
+def overlay_surface(size, color, alpha=None):
+    """
+    Surface sólida reaproveitada por (tamanho, cor RGB); o alpha vem de
+    color[3] ou do parâmetro e é aplicado com set_alpha (sem SRCALPHA).
+    Substitui pygame.Surface + fill a cada frame em overlays e flashes.
+    """
+    size = (int(size[0]), int(size[1]))
+    rgb = tuple(color[:3])
+    if alpha is None:
+        alpha = color[3] if len(color) > 3 else 255
+    key = (size, rgb)
+    surf = _overlays.get(key)
+    if surf is None:
+        if len(_overlays) >= _OVERLAY_MAX:
+            _overlays.clear()
+        surf = pygame.Surface(size)
+        surf.fill(rgb)
+        _overlays[key] = surf
+    surf.set_alpha(max(0, min(255, int(alpha))))
+    return surf
+
+
+def blit_overlay(dest, color, alpha=None, rect=None):
+    """Cobre `dest` (ou só `rect`) com a camada translúcida compartilhada."""
+    if rect is None:
+        return dest.blit(overlay_surface(dest.get_size(), color, alpha), (0, 0))
+    return dest.blit(overlay_surface((rect[2], rect[3]), color, alpha), (rect[0], rect[1]))
+
+
+# ===========================================================
+#        BRILHO PULSANTE PRÉ-CALCULADO (BLIT ADITIVO)
+# ===========================================================
+class GlowLevels:
+    """
+    Brilho (surface com alpha por pixel) pré-multiplicado em ALPHA_LEVELS
+    intensidades opacas. BLEND_RGB_ADD ignora o alpha da surface, então a
+    intensidade precisa estar nas cores; o pulso só escolhe o nível.
+    """
+
+    def __init__(self, image):
+        w, h = image.get_size()
+        # Blit normal sobre preto = cor * alpha (pré-multiplicada)
+        base = pygame.Surface((w, h))
+        base.fill((0, 0, 0))
+        base.blit(image, (0, 0))
+        self.levels = []
+        for i in range(ALPHA_LEVELS):
+            v = level_alpha(i)
+            surf = base.copy()
+            surf.fill((v, v, v), special_flags=pygame.BLEND_RGB_MULT)
+            self.levels.append(surf)
+        self.half = (w // 2, h // 2)
+
+    def get(self, alpha):
+        return self.levels[alpha_level(alpha)]
+
+    def blit_centered(self, dest, center, alpha):
+        return dest.blit(self.get(alpha), (int(center[0]) - self.half[0], int(center[1]) - self.half[1]),
+                         special_flags=pygame.BLEND_RGB_ADD)
+
+
+def glow_fill(dest, color, alpha, rect=None):
+    """Brilho uniforme aditivo (color * alpha) direto no destino, sem surface."""
+    v = level_alpha(alpha_level(alpha))
+    add = (color[0] * v // 255, color[1] * v // 255, color[2] * v // 255)
+    return dest.fill(add, rect, special_flags=pygame.BLEND_RGB_ADD)
+
+
+# ===========================================================
+#          BOTÕES: TODOS OS ESTADOS PRÉ-RENDERIZADOS
+# ===========================================================
+def tween_scales(peak, steps=4):
+    """Passos de escala de 1.0 até `peak` (ex.: 1.06) para o tween de hover."""
+    return tuple(1.0 + (peak - 1.0) * i / steps for i in range(steps + 1))
+
+
+class ButtonSkin:
+    """
+    Botão retangular com cada estado (idle, hover, pressed, correct, wrong...)
+    montado uma vez por tamanho e por passo de escala: sombra, corpo, borda e
+    o conteúdo (texto/ícone) desenhado por `content(surf, body_rect, state)`.
+    Desenhar o botão no frame vira um único blit.
+
+    styles: {estado: (cor_fundo, cor_borda, espessura_borda)}
+    shadow: (cor, (dx, dy)) ou None
+    """
+
+    def __init__(self, size, styles, radius=12, shadow=None, content=None, scales=(1.0,)):
+        self.size = (int(size[0]), int(size[1]))
+        self.styles = styles
+        self.radius = radius
+        self.shadow = shadow
+        self.content = content
+        self.scales = tuple(scales)
+        self.frames = {}
+        for state in styles:
+            for sc in self.scales:
+                self.frames[(state, sc)] = self._build(state, sc)
+
+    def _dims(self, sc):
+        return int(self.size[0] * sc), int(self.size[1] * sc)
+
+    def _build(self, state, sc):
+        bg, border, border_w = self.styles[state]
+        w, h = self._dims(sc)
+        dx, dy = self.shadow[1] if self.shadow else (0, 0)
+        surf = pygame.Surface((w + max(dx, 0), h + max(dy, 0)), pygame.SRCALPHA)
+        if self.shadow:
+            pygame.draw.rect(surf, self.shadow[0], (dx, dy, w, h), border_radius=self.radius)
+
+        # Corpo numa camada própria para misturar com a sombra como na tela
+        body = pygame.Surface((w, h), pygame.SRCALPHA)
+        body_rect = body.get_rect()
+        pygame.draw.rect(body, bg, body_rect, border_radius=self.radius)
+        if border_w:
+            pygame.draw.rect(body, border, body_rect, border_w, border_radius=self.radius)
+        if self.content:
+            self.content(body, body_rect, state)
+        surf.blit(body, (0, 0))
+        return surf
+
+    def nearest_scale(self, scale):
+        return min(self.scales, key=lambda s: abs(s - scale))
+
+    def get(self, state, scale=1.0):
+        return self.frames[(state, self.nearest_scale(scale))]
+
+    def blit(self, dest, center, state, scale=1.0):
+        """Um blit com o corpo centrado em `center`; retorna o rect do corpo."""
+        sc = self.nearest_scale(scale)
+        w, h = self._dims(sc)
+        x, y = int(center[0]) - w // 2, int(center[1]) - h // 2
+        dest.blit(self.frames[(state, sc)], (x, y))
+        return pygame.Rect(x, y, w, h)
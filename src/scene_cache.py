@@ -0,0 +1,114 @@
+# ===========================================================
+#        CACHE DE CENAS (MODO LIVRE / REPLAYS)
+# ===========================================================
+"""
+Mantém vivo, entre uma partida e outra, o que cada cena já preparou:
+imagens originais lidas do disco e o dict de layout (fundos escalados,
+fontes, títulos renderizados...) de cada resolução. Voltar a um minigame
+no modo livre reaproveita tudo isso.
+
+Só entra aqui o que é imutável e não tem estado de partida. Emissores de
+partículas ficam de fora: são por partida e se registram no orçamento de
+partículas da cena ativa.
+
+As entradas formam um LRU com teto de memória (soma dos pixels das
+surfaces alcançáveis); as menos usadas recentemente saem primeiro.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from src.performance import scene_cache_budget
+
+
+def surface_bytes(obj, _seen=None, _depth=0):
+    """Estimativa da memória de surfaces alcançáveis a partir de `obj`."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen or _depth > 5:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, pygame.Surface):
+        w, h = obj.get_size()
+        return w * h * obj.get_bytesize()
+    if isinstance(obj, dict):
+        items = obj.values()
+    elif isinstance(obj, (list, tuple, set)):
+        items = obj
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        items = vars(obj).values()
+    else:
+        return 0
+    return sum(surface_bytes(v, _seen, _depth + 1) for v in items)
+
+
+class SceneCache:
+    """LRU de imagens brutas e layouts por (cena, tamanho da janela)."""
+
+    def __init__(self, budget=None):
+        self._budget = budget
+        self._entries = OrderedDict()
+
+    @property
+    def budget(self):
+        return scene_cache_budget() if self._budget is None else self._budget
+
+    def image(self, path, alpha=False):
+        """
+        Imagem original lida do disco uma vez só (None se não existir).
+        Originais enormes (mais de 1/4 do orçamento) não ficam retidos: só
+        servem para montar layouts novos, que já ficam no cache.
+        """
+        key = ("image", path, alpha)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        try:
+            img = pygame.image.load(path)
+            img = img.convert_alpha() if alpha else img.convert()
+        except Exception:
+            img = None
+        if img is None or surface_bytes(img) <= self.budget // 4:
+            self._entries[key] = img
+        return img
+
+    def layout(self, scene, size, build):
+        """
+        Dict de layout da cena para este tamanho de janela. Na primeira vez
+        `build(layout, size)` monta os assets num dict novo, que só entra no
+        cache (e conta no orçamento) se o build terminar sem erro.
+        """
+        size = tuple(size)
+        key = ("layout", scene, size)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        layout = {}
+        build(layout, size)
+        self._entries[key] = layout
+        self.trim(keep=key)
+        return layout
+
+    def trim(self, keep=None):
+        """
+        Descarta as entradas menos usadas até caber no orçamento. Imagens
+        originais saem antes dos layouts (só servem para montar layouts novos).
+        """
+        sizes = {k: surface_bytes(v) for k, v in self._entries.items()}
+        total = sum(sizes.values())
+        budget = self.budget
+        for key in sorted(self._entries, key=lambda k: k[0] != "image"):
+            if total <= budget:
+                break
+            if key == keep:
+                continue
+            total -= sizes[key]
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+scene_cache = SceneCache()
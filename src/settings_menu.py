@@ -10,6 +10,10 @@ import sys
 import json
 import asyncio  # <--- Importante
 from src.utils import load_font, draw_text
+from src.particles import ParticleEmitter, circle_sprites
+from src.performance import particle_budget
+from src.render_cache import blit_overlay
+from src.scene_cache import scene_cache
 from src.audio_manager import audio_manager
 
 # ---------- Config paths ----------
@@ -65,31 +69,14 @@ def save_settings(s):
 
 
 # ---------- Partículas (Bolinhas coloridas de fundo) ----------
-class Particle:
-    def __init__(self, w, h):
-        self.w, self.h = max(1, w), max(1, h)
-        self.reset()
-
-    def reset(self):
-        self.x = random.uniform(0, self.w)
-        self.y = random.uniform(0, self.h)
-        self.r = random.uniform(2, 5)
-        self.speed = random.uniform(0.2, 0.6)
-        self.alpha = random.randint(50, 150)
-        self.color = random.choice([(255, 255, 255), (100, 200, 255), (255, 100, 150)])
-
-    def update(self, dt):
-        self.y -= self.speed * dt * 0.06
-        self.x += math.sin(self.y * 0.01) * 0.2
-        if self.y < -10:
-            self.reset()
-            self.y = self.h + 10
-
-    def draw(self, surf):
-        s = pygame.Surface((int(self.r*2), int(self.r*2)), pygame.SRCALPHA)
-        c = (*self.color, int(self.alpha))
-        pygame.draw.circle(s, c, (int(self.r), int(self.r)), int(self.r))
-        surf.blit(s, (int(self.x), int(self.y)))
+def make_particles(w, h):
+    """Bolinhas coloridas subindo devagar (emissor vetorizado)."""
+    return ParticleEmitter(
+        w, h, 25,
+        circle_sprites((2, 3, 4), [(255, 255, 255), (100, 200, 255), (255, 100, 150)], (50, 100, 150)),
+        vy=(-0.6 * 0.06, -0.2 * 0.06), flow="up", respawn=(10, 10),
+        wobble=0.2, wobble_freq=0.01,
+    )
 
 
 # ---------- Slider (Controle de Volume) ----------
@@ -219,26 +206,49 @@ class SettingsUI:
         self.settings = settings
         self.w, self.h = screen.get_size()
         
-        self.particles = [Particle(self.w, self.h) for _ in range(25)]
+        self.particles = make_particles(self.w, self.h)
         
+        self._load_layout()
+        self._init_elements()
+
+    def _load_layout(self):
+        """Fundo, fontes e textos fixos desta resolução (memo por tamanho de janela)."""
+        self.layout = scene_cache.layout("settings", (self.w, self.h), self._build_layout)
+        self.bg = self.layout['bg']
+        self.font_title = self.layout['font_title']
+        self.font_label = self.layout['font_label']
+        self.font_btn = self.layout['font_btn']
+
+    def _build_layout(self, layout, size):
+        w, h = size
+
         # Background
-        try:
-            raw_bg = pygame.image.load(BG_PATH_DEFAULT).convert()
-            self.bg = pygame.transform.smoothscale(raw_bg, (self.w, self.h))
-        except:
-            self.bg = pygame.Surface((self.w, self.h))
-            self.bg.fill((30, 30, 45))
+        raw_bg = scene_cache.image(BG_PATH_DEFAULT)
+        if raw_bg:
+            layout['bg'] = pygame.transform.smoothscale(raw_bg, (w, h))
+        else:
+            layout['bg'] = pygame.Surface((w, h))
+            layout['bg'].fill((30, 30, 45))
 
-        self._init_elements()
+        # Fontes via utils
+        layout['font_title'] = load_font(int(h * 0.08))
+        layout['font_label'] = load_font(int(h * 0.04))
+        layout['font_btn'] = load_font(int(h * 0.035))
+
+        # Textos fixos
+        title = layout['font_title'].render("CONFIGURAÇÕES", True, (255, 255, 255))
+        layout['title'] = title
+        layout['title_shad'] = layout['font_title'].render("CONFIGURAÇÕES", True, (0,0,0))
+        layout['title_rect'] = title.get_rect(center=(w//2, int(h * 0.10)))
+        layout['label_music'] = layout['font_label'].render("Música", True, (200, 200, 200))
+        layout['label_fx'] = layout['font_label'].render("Efeitos Sonoros", True, (200, 200, 200))
+        ld = layout['font_label'].render("Dificuldade", True, (255, 255, 255))
+        layout['label_diff'] = ld
+        layout['label_diff_rect'] = ld.get_rect(center=(w//2, int(h * 0.60)))
 
     def _init_elements(self):
         h = self.h
         cx = self.w // 2
-        
-        # Fontes via utils
-        self.font_title = load_font(int(h * 0.08))
-        self.font_label = load_font(int(h * 0.04))
-        self.font_btn = load_font(int(h * 0.035))
 
         # Sliders
         slider_w = int(self.w * 0.5)
@@ -265,43 +275,32 @@ class SettingsUI:
     def resize(self, screen):
         self.screen = screen
         self.w, self.h = screen.get_size()
-        try:
-            raw_bg = pygame.image.load(BG_PATH_DEFAULT).convert()
-            self.bg = pygame.transform.smoothscale(raw_bg, (self.w, self.h))
-        except: pass
+        self._load_layout()
         self._init_elements()
 
     def draw(self):
         # BG e Overlay
         self.screen.blit(self.bg, (0, 0))
-        overlay = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
-        overlay.fill(COLORS["panel_bg"])
-        self.screen.blit(overlay, (0, 0))
+        blit_overlay(self.screen, COLORS["panel_bg"])
 
         # Partículas
-        for p in self.particles:
-            p.update(16)
-            p.draw(self.screen)
+        self.particles.update(16)
+        self.particles.draw(self.screen)
 
         # Título
-        title = self.font_title.render("CONFIGURAÇÕES", True, (255, 255, 255))
-        shad = self.font_title.render("CONFIGURAÇÕES", True, (0,0,0))
-        tr = title.get_rect(center=(self.w//2, int(self.h * 0.10)))
-        self.screen.blit(shad, (tr.x+4, tr.y+4))
-        self.screen.blit(title, tr)
+        tr = self.layout['title_rect']
+        self.screen.blit(self.layout['title_shad'], (tr.x+4, tr.y+4))
+        self.screen.blit(self.layout['title'], tr)
 
         # Labels
-        l1 = self.font_label.render("Música", True, (200, 200, 200))
-        self.screen.blit(l1, (self.slider_music.rect.x, self.slider_music.rect.y - 45))
+        self.screen.blit(self.layout['label_music'], (self.slider_music.rect.x, self.slider_music.rect.y - 45))
         self.slider_music.draw(self.screen)
 
-        l2 = self.font_label.render("Efeitos Sonoros", True, (200, 200, 200))
-        self.screen.blit(l2, (self.slider_fx.rect.x, self.slider_fx.rect.y - 45))
+        self.screen.blit(self.layout['label_fx'], (self.slider_fx.rect.x, self.slider_fx.rect.y - 45))
         self.slider_fx.draw(self.screen)
 
         # Dificuldade Label
-        ld = self.font_label.render("Dificuldade", True, (255, 255, 255))
-        self.screen.blit(ld, ld.get_rect(center=(self.w//2, int(self.h * 0.60))))
+        self.screen.blit(self.layout['label_diff'], self.layout['label_diff_rect'])
 
         # Botões
         curr_diff = self.settings.get("difficulty", "normal")
@@ -314,6 +313,7 @@ class SettingsUI:
 
 
 # ---------- Loop Principal (ASYNC) ----------
+@particle_budget.scene
 async def run_settings_menu(screen):
     clock = pygame.time.Clock()
     
@@ -8,6 +8,10 @@ import os
 import random
 from math import sin
 
+from src.render_cache import theme_sprite_bank, blit_overlay
+from src.particles import ParticleEmitter
+from src.performance import particle_budget
+
 # ... (MANTENHA AS FUNÇÕES DE FONTE, DRAW_TEXT e CONTAINERS IGUAIS) ...
 # ... (NÃO ALTERE load_font, draw_text, draw_question_container, draw_modern_container, draw_score_display) ...
 # ... (Cole aqui o código original dessas funções que não têm loop) ...
@@ -17,52 +21,190 @@ from math import sin
 # ============================================================
 # GERENCIAMENTO DE FONTES E TEXTO (MANTIDO IGUAL)
 # ============================================================
+try:
+    import pygame.freetype as _freetype
+except ImportError:  # Build sem freetype: tudo cai no font.render
+    _freetype = None
+
+
+class TextFont(pygame.font.Font):
+    """
+    pygame.font.Font com um caminho direto via freetype.render_to:
+    o texto é rasterizado na surface de destino, sem surface intermediária.
+    Todo o resto (render, size, get_linesize...) continua igual ao Font.
+    """
+    def __init__(self, path, size):
+        super().__init__(path, size)
+        self.ft = None
+        if _freetype is None: return
+        try:
+            if not _freetype.get_init(): _freetype.init()
+            self.ft = _freetype.Font(path, size)
+            self.ft.origin = True  # y = linha de base
+        except Exception:
+            self.ft = None
+
+    def render_to(self, dest, pos, text, color):
+        """Desenha com o topo-esquerdo em pos (mesma caixa do render). Retorna o Rect."""
+        w, h = self.size(text)
+        rect = pygame.Rect(int(pos[0]), int(pos[1]), w, h)
+        if not text: return rect
+        if self.ft is None:
+            dest.blit(self.render(text, True, color), rect)
+        else:
+            self.ft.render_to(dest, (rect.x, rect.y + self.get_ascent()), text, color)
+        return rect
+
+
 _font_cache = {}
 def load_font(size):
     size = int(size)
     if size in _font_cache: return _font_cache[size]
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     font_path = os.path.join(base_dir, "assets", "fonts", "NotoSans-Regular.ttf")
-    try: font = pygame.font.Font(font_path, size)
-    except: font = pygame.font.Font(None, size)
+    try: font = TextFont(font_path, size)
+    except: font = TextFont(None, size)
     _font_cache[size] = font
     return font
 
+def blit_text(dest, text, font, color, pos):
+    """Texto avulso em dest (topo-esquerdo em pos); aceita qualquer Font."""
+    if isinstance(font, TextFont):
+        return font.render_to(dest, pos, text, color)
+    surf = font.render(text, True, color)
+    return dest.blit(surf, pos)
+
 def draw_text(screen, text, font, color, center_pos, shadow=False):
+    rect = pygame.Rect((0, 0), font.size(text))
     if shadow:
-        sh = font.render(text, True, (0, 0, 0))
-        rect = sh.get_rect(center=(center_pos[0] + 2, center_pos[1] + 2))
-        screen.blit(sh, rect)
-    surf = font.render(text, True, color)
-    rect = surf.get_rect(center=center_pos)
-    screen.blit(surf, rect)
+        rect.center = (center_pos[0] + 2, center_pos[1] + 2)
+        blit_text(screen, text, font, (0, 0, 0), rect.topleft)
+    rect.center = center_pos
+    blit_text(screen, text, font, color, rect.topleft)
     return rect
 
 def draw_text_animated(screen, text, font, color, rect, align="center"):
     return draw_text_wrapped(screen, text, font, color, rect, align=align)
 
-def draw_text_wrapped(screen, text, font, color, rect, shadow_color=None, align="center"):
+def wrap_text_lines(text, font, width):
+    """Quebra o texto em linhas que cabem na largura informada."""
     words = text.split()
     lines, current_line = [], ""
     for word in words:
         test_line = f"{current_line}{word} "
-        if font.size(test_line)[0] <= rect.width: current_line = test_line
+        if font.size(test_line)[0] <= width: current_line = test_line
         else: lines.append(current_line.strip()); current_line = word + " "
     if current_line: lines.append(current_line.strip())
+    return lines
+
+def draw_text_wrapped(screen, text, font, color, rect, shadow_color=None, align="center"):
+    lines = wrap_text_lines(text, font, rect.width)
     line_height = font.get_linesize()
     total_height = len(lines) * line_height
     y_start = rect.centery - (total_height / 2)
     for i, line in enumerate(lines):
-        text_surface = font.render(line, True, color)
-        text_rect = text_surface.get_rect()
+        text_rect = pygame.Rect((0, 0), font.size(line))
         if align == "left": text_rect.left = rect.left
         elif align == "right": text_rect.right = rect.right
         else: text_rect.centerx = rect.centerx
         text_rect.y = y_start + i * line_height
         if shadow_color:
-            shadow_surface = font.render(line, True, shadow_color)
-            screen.blit(shadow_surface, (text_rect.x + 2, text_rect.y + 2))
-        screen.blit(text_surface, text_rect)
+            blit_text(screen, line, font, shadow_color, (text_rect.x + 2, text_rect.y + 2))
+        blit_text(screen, line, font, color, text_rect.topleft)
+
+# ============================================================
+# MÁQUINA DE ESCREVER INCREMENTAL (CUTSCENES)
+# ============================================================
+class TypewriterText:
+    """
+    Revela um parágrafo letra a letra com custo constante por frame.
+    O texto é quebrado UMA vez; as linhas já reveladas ficam numa única
+    surface cacheada e a cada frame só os glifos novos são rasterizados.
+    """
+    def __init__(self, font, color, rect, align="center", char_speed=18):
+        self.font = font
+        self.color = color
+        self.rect = pygame.Rect(rect)
+        self.align = align
+        self.char_speed = char_speed
+        self.text = ""
+        self.lines = []
+        self.canvas = None
+        self.canvas_pos = (0, 0)
+        self.total_chars = 0
+        self.shown = 0
+        self.last_char = 0
+
+    def set_text(self, text, now=None):
+        self.text = text
+        self.last_char = pygame.time.get_ticks() if now is None else now
+        self._layout()
+
+    def set_rect(self, rect):
+        rect = pygame.Rect(rect)
+        if rect == self.rect: return
+        shown = self.shown
+        self.rect = rect
+        self._layout()
+        self._reveal_to(shown)
+
+    def _layout(self):
+        # Mesma quebra e centralização vertical do draw_text_wrapped,
+        # mas calculada para o parágrafo inteiro (o bloco não "pula" ao crescer)
+        font, rect = self.font, self.rect
+        wrapped = wrap_text_lines(self.text, font, rect.width)
+        line_h = font.get_linesize()
+        widths = [font.size(line)[0] for line in wrapped]
+        canvas_w = max([rect.width] + widths)
+        canvas_h = max(1, len(wrapped) * line_h)
+
+        if self.align == "left": left = rect.left
+        elif self.align == "right": left = rect.right - canvas_w
+        else: left = rect.centerx - canvas_w // 2
+        self.canvas_pos = (left, int(rect.centery - canvas_h / 2))
+        self.canvas = pygame.Surface((canvas_w, canvas_h), pygame.SRCALPHA)
+
+        self.lines = []
+        start = 0
+        for i, (line, lw) in enumerate(zip(wrapped, widths)):
+            if self.align == "left": x = 0
+            elif self.align == "right": x = canvas_w - lw
+            else: x = (canvas_w - lw) // 2
+            self.lines.append((line, start, x, i * line_h))
+            start += len(line)
+        self.total_chars = start
+        self.shown = 0
+
+    def _reveal_to(self, n):
+        n = min(n, self.total_chars)
+        for line, start, x, y in self.lines:
+            if self.shown >= n: break
+            end = start + len(line)
+            if self.shown >= end: continue
+            col = self.shown - start
+            upto = min(end, n) - start
+            # Só os glifos novos desta linha, direto no canvas (o prefixo já está lá)
+            blit_text(self.canvas, line[col:upto], self.font, self.color, (x + self.font.size(line[:col])[0], y))
+            self.shown = start + upto
+
+    @property
+    def done(self):
+        return self.shown >= self.total_chars
+
+    def reveal_all(self):
+        self._reveal_to(self.total_chars)
+
+    def update(self, now=None):
+        if self.done: return
+        now = pygame.time.get_ticks() if now is None else now
+        steps = (now - self.last_char) // self.char_speed
+        if steps > 0:
+            self.last_char += steps * self.char_speed
+            self._reveal_to(self.shown + steps)
+
+    def draw(self, screen):
+        if self.canvas and self.shown:
+            screen.blit(self.canvas, self.canvas_pos)
 
 def draw_question_container(screen, rect, title_text=None, font_title=None, bg_color=(15, 15, 35, 180), border_color=(255, 255, 255), border_radius=16, padding=20):
     shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
@@ -112,42 +254,54 @@ def draw_score(screen, score, font):
 # EFEITOS DE TRANSIÇÃO (AGORA ASYNC)
 # ============================================================
 
-async def fade_in(screen, duration=350):
-    overlay = pygame.Surface(screen.get_size())
-    overlay.fill((0,0,0))
-    steps = 18
-    delta = 255 // steps
-    clock = pygame.time.Clock()
+_fade_snapshot = None
 
-    for a in range(255, -1, -delta):
-        overlay.set_alpha(a)
-        screen.blit(overlay, (0,0))
-        pygame.display.flip()
-        # await essencial no loop
-        await asyncio.sleep(0) 
-        clock.tick(60)
+def _snapshot(source):
+    """Copia `source` para uma surface reaproveitada entre transições."""
+    global _fade_snapshot
+    if _fade_snapshot is None or _fade_snapshot.get_size() != source.get_size():
+        _fade_snapshot = pygame.Surface(source.get_size())
+    _fade_snapshot.blit(source, (0, 0))
+    return _fade_snapshot
 
-async def fade_out(screen, duration=350):
-    overlay = pygame.Surface(screen.get_size())
-    overlay.fill((0,0,0))
-    steps = 18
-    delta = 255 // steps
+
+async def fade_transition(screen, start, end, duration=350, frame=None, color=(0, 0, 0), present=None):
+    """
+    Fade guiado pelo tempo: cada frame recompõe o snapshot (de `frame` ou da
+    tela atual) + camada `color` com alpha interpolado de start a end.
+    Frames lentos apenas avançam mais o alpha (350 ms duram 350 ms a 30 ou 60 FPS).
+    """
+    snap = _snapshot(frame if frame is not None else screen)
+    present = present or pygame.display.flip
     clock = pygame.time.Clock()
+    t0 = pygame.time.get_ticks()
 
-    for a in range(0, 255, delta):
-        overlay.set_alpha(a)
-        screen.blit(overlay, (0,0))
-        pygame.display.flip()
+    while True:
+        elapsed = pygame.time.get_ticks() - t0
+        p = 1.0 if duration <= 0 else min(1.0, elapsed / duration)
+        screen.blit(snap, (0, 0))
+        blit_overlay(screen, color, start + (end - start) * p)
+        present()
         # await essencial no loop
         await asyncio.sleep(0)
+        if p >= 1.0:
+            break
         clock.tick(60)
 
 
+async def fade_in(screen, duration=350, frame=None, present=None):
+    await fade_transition(screen, 255, 0, duration, frame, present=present)
+
+async def fade_out(screen, duration=350, frame=None, present=None):
+    await fade_transition(screen, 0, 255, duration, frame, present=present)
+
+
 # ============================================================
 # TELA DE PAUSA / FINAL (AGORA ASYNC)
 # ============================================================
 
-async def show_pause_screen(screen, clock, title, score_text, subtitle="Toque para continuar", theme="default", background=None):
+@particle_budget.scene
+async def show_pause_screen(screen, clock, title, score_text, subtitle="Toque para continuar", theme="default", background=None, on_idle=None):
     w, h = screen.get_size()
     font_title = load_font(int(h * 0.12))
     font_score = load_font(int(h * 0.07))
@@ -165,14 +319,20 @@ async def show_pause_screen(screen, clock, title, score_text, subtitle="Toque pa
     }
     style = themes.get(theme, themes["default"])
 
-    particles = []
-    for _ in range(30):
-        p = {"x": random.randint(0, w), "y": random.randint(0, h), "r": random.randint(2, 6), "alpha": random.randint(100, 255), "speed": random.uniform(0.5, 2)}
-        if style.get("type") == "char": p["char"] = random.choice(style.get("content", ["*"]))
-        particles.append(p)
+    bank = theme_sprite_bank(style, font_particle)
+    particles = ParticleEmitter(w, h, 30, bank.sprites.values(), vy=(-2, -0.5), flow="up",
+                                respawn=(0, 50), fade=2, alpha=(150, 255))
 
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 40, 200))
+    # Textos fixos renderizados uma vez (o loop só faz blit)
+    title_sh = font_title.render(title, True, (0, 0, 0))
+    title_surf = font_title.render(title, True, style["accent"])
+    score_surf = font_score.render(score_text, True, (255,255,255))
+    sub_surf = font_sub.render(subtitle, True, (200,200,200))
+    title_pos = (w//2, h*0.35)
+    title_sh_rect = title_sh.get_rect(center=(title_pos[0] + 2, title_pos[1] + 2))
+    title_rect = title_surf.get_rect(center=title_pos)
+    score_rect = score_surf.get_rect(center=(w//2, h*0.50))
+    sub_rect = sub_surf.get_rect(center=(w//2, h*0.70))
     
     running = True
     t = 0
@@ -183,34 +343,20 @@ async def show_pause_screen(screen, clock, title, score_text, subtitle="Toque pa
         
         if background:
             screen.blit(background, (0, 0))
-            screen.blit(overlay, (0, 0))
+            blit_overlay(screen, (0, 0, 40), 200)
         else:
             screen.fill((15, 15, 30))
 
-        for p in particles:
-            p["y"] -= p["speed"]
-            p["alpha"] -= 2
-            if p["y"] < -10 or p["alpha"] <= 0:
-                p["x"] = random.randint(0, w); p["y"] = random.randint(h, h + 50); p["alpha"] = random.randint(150, 255)
-
-            base = style["color"]
-            col = (base[0], base[1], base[2], int(p["alpha"]))
-            
-            if style.get("type") == "char":
-                ps = font_particle.render(p["char"], True, col)
-                ps.set_alpha(int(p["alpha"]))
-                screen.blit(ps, (int(p["x"]), int(p["y"])))
-            else:
-                surf = pygame.Surface((p["r"]*2, p["r"]*2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, col, (p["r"], p["r"]), p["r"])
-                screen.blit(surf, (int(p["x"]), int(p["y"])))
-
-        draw_text(screen, title, font_title, style["accent"], (w//2, h*0.35), shadow=True)
-        draw_text(screen, score_text, font_score, (255,255,255), (w//2, h*0.50))
+        particles.update()
+        particles.draw(screen)
+
+        screen.blit(title_sh, title_sh_rect)
+        screen.blit(title_surf, title_rect)
+        screen.blit(score_surf, score_rect)
         
         blink_timer += 1
         if int(sin(blink_timer * 0.1) * 255) > 0:
-            draw_text(screen, subtitle, font_sub, (200,200,200), (w//2, h*0.70))
+            screen.blit(sub_surf, sub_rect)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
@@ -220,6 +366,8 @@ async def show_pause_screen(screen, clock, title, score_text, subtitle="Toque pa
             if event.type == pygame.MOUSEBUTTONDOWN: running = False
 
         pygame.display.flip()
+        # Folga do frame: trabalho adiantado (ex.: prefetch da próxima pergunta)
+        if on_idle: on_idle()
         # OBRIGATÓRIO NA WEB
         await asyncio.sleep(0) 
         clock.tick(60)
\ No newline at end of file